@@ -12,10 +12,12 @@ from pathlib import Path
 from typing import Optional
 
 import click
-from rich.console import Console
+from rich.console import Console, Group
+from rich.live import Live
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.table import Table
+from rich.text import Text
 
 from .config import config_manager, get_config
 from .core.analyzer import DependencyAnalyzer
@@ -23,6 +25,7 @@ from .core.cleaner import DependencyCleaner
 from .core.dependency_manager import DependencyManager
 from .core.exporter import AnalysisExporter
 from .core.global_scanner import GlobalScanner
+from .core.scan_index import ScanIndex
 from .core.scanner import ProjectScanner
 from .core.package_managers import SearchResult, OutdatedPackage
 from .i18n import (
@@ -32,7 +35,8 @@ from .i18n import (
     set_language,
 )
 from .parsers.base import PackageManagerType, ProjectType
-from .utils.file_utils import format_size
+from .utils.file_utils import format_size, format_size_with_error
+from .utils.size_cache import configure_size_cache
 
 # 导入版本号
 try:
@@ -57,6 +61,9 @@ console = Console(
     width=120,
 )
 
+# Number of most recent projects shown while a scan is streaming
+SCAN_PROGRESS_ROWS = 10
+
 # Auto-detect and set language
 auto_detect_and_set_language()
 
@@ -171,7 +178,64 @@ def cli(verbose: bool, lang: Optional[str]):
     default=True,
     help="Enable/disable parallel processing for better performance",
 )
-def scan(path: Path, depth: int, project_types: tuple, parallel: bool):
+@click.option(
+    "--order",
+    type=click.Choice(["depth", "breadth", "size"]),
+    default=None,
+    help="Directory traversal order (breadth/size list shallow projects first)",
+)
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=True,
+    help="Reuse the incremental scan index for unchanged directories and projects",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Number of parsing workers (0 = adaptive, default from config)",
+)
+@click.option(
+    "--executor",
+    type=click.Choice(["thread", "process", "auto"]),
+    default=None,
+    help="Parallel parsing backend (auto uses processes for large trees)",
+)
+@click.option(
+    "--one-file-system",
+    "-x",
+    "one_file_system",
+    is_flag=True,
+    default=None,
+    help="Do not cross filesystem boundaries (like du -x)",
+)
+@click.option(
+    "--estimate",
+    is_flag=True,
+    default=False,
+    help="Estimate directory sizes by sampling (reports ± 95% error bounds)",
+)
+@click.option(
+    "--exact-top",
+    type=click.IntRange(min=0),
+    default=10,
+    help="With --estimate, measure the N largest projects exactly (default: 10)",
+)
+def scan(
+    path: Path,
+    depth: int,
+    project_types: tuple,
+    parallel: bool,
+    order: Optional[str],
+    use_cache: bool,
+    workers: Optional[int],
+    executor: Optional[str],
+    one_file_system: Optional[bool],
+    estimate: bool,
+    exact_top: int,
+):
     """Scan specified directory to discover projects and dependencies"""
 
     console.print(f"\n{get_text('messages.scanning', path=path.absolute())}")
@@ -187,35 +251,77 @@ def scan(path: Path, depth: int, project_types: tuple, parallel: bool):
             get_text("messages.project_types", types=", ".join(project_types))
         )
 
-    scanner = ProjectScanner()
+    scanner = _create_scanner(use_cache)
+    filtered_types = [ProjectType(pt) for pt in project_types]
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        task = progress.add_task(get_text("status.scanning_projects"), total=None)
+    if estimate:
+        # The exact top-N pass needs the full list up front
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress:
+            task = progress.add_task(get_text("status.scanning_projects"), total=None)
 
-        try:
-            projects = scanner.scan_directory(path, depth, parallel)
-        except Exception as e:
-            console.print(f"[red]{get_text('messages.scan_failed', error=e)}[/red]")
-            sys.exit(1)
+            try:
+                projects = scanner.scan_directory(
+                    path,
+                    depth,
+                    parallel,
+                    order=order,
+                    workers=workers,
+                    executor=executor,
+                    one_file_system=one_file_system,
+                    estimate_top=exact_top if estimate else None,
+                )
+            except Exception as e:
+                console.print(f"[red]{get_text('messages.scan_failed', error=e)}[/red]")
+                sys.exit(1)
+
+            progress.update(task, description=get_text("success.scan_completed"))
 
-        progress.update(task, description=get_text("success.scan_completed"))
+        if filtered_types:
+            projects = [p for p in projects if p.project_type in filtered_types]
+
+        if not projects:
+            console.print(f"\n[yellow]{get_text('messages.no_projects')}[/yellow]")
+            return
+
+        console.print(f"\n{get_text('messages.found_projects', count=len(projects))}")
+        _display_projects_table(projects)
+        return
+
+    # Show a running count and the latest rows while streaming; Live redraws
+    # at its own rate, and the full table is printed once at the end
+    projects = []
+
+    try:
+        with Live(
+            console=console,
+            transient=True,
+            get_renderable=lambda: _render_scan_progress(projects),
+        ):
+            for project in scanner.iter_scan(
+                path,
+                depth,
+                parallel,
+                order=order,
+                workers=workers,
+                one_file_system=one_file_system,
+                executor=executor,
+            ):
+                if filtered_types and project.project_type not in filtered_types:
+                    continue
+                projects.append(project)
+    except Exception as e:
+        console.print(f"[red]{get_text('messages.scan_failed', error=e)}[/red]")
+        sys.exit(1)
 
     if not projects:
         console.print(f"\n[yellow]{get_text('messages.no_projects')}[/yellow]")
         return
 
-    # Filter project types
-    if project_types:
-        filtered_types = [ProjectType(pt) for pt in project_types]
-        projects = [p for p in projects if p.project_type in filtered_types]
-
     console.print(f"\n{get_text('messages.found_projects', count=len(projects))}")
-
-    # Display project list
     _display_projects_table(projects)
 
 
@@ -232,12 +338,62 @@ def scan(path: Path, depth: int, project_types: tuple, parallel: bool):
     help="Sort results by specified criteria",
 )
 @click.option("--limit", "-l", default=20, help="Limit number of results to display")
-def analyze(path: Path, depth: int, sort_by: str, limit: int):
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=True,
+    help="Reuse the incremental scan index for unchanged directories and projects",
+)
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Number of parsing workers (0 = adaptive, default from config)",
+)
+@click.option(
+    "--executor",
+    type=click.Choice(["thread", "process", "auto"]),
+    default=None,
+    help="Parallel parsing backend (auto uses processes for large trees)",
+)
+@click.option(
+    "--one-file-system",
+    "-x",
+    "one_file_system",
+    is_flag=True,
+    default=None,
+    help="Do not cross filesystem boundaries (like du -x)",
+)
+@click.option(
+    "--estimate",
+    is_flag=True,
+    default=False,
+    help="Estimate directory sizes by sampling (reports ± 95% error bounds)",
+)
+@click.option(
+    "--exact-top",
+    type=click.IntRange(min=0),
+    default=10,
+    help="With --estimate, measure the N largest projects exactly (default: 10)",
+)
+def analyze(
+    path: Path,
+    depth: int,
+    sort_by: str,
+    limit: int,
+    use_cache: bool,
+    workers: Optional[int],
+    executor: Optional[str],
+    one_file_system: Optional[bool],
+    estimate: bool,
+    exact_top: int,
+):
     """Analyze project dependencies and generate detailed report"""
 
     console.print(f"\n{get_text('messages.analyzing', path=path.absolute())}")
 
-    scanner = ProjectScanner()
+    scanner = _create_scanner(use_cache)
     analyzer = DependencyAnalyzer()
 
     with Progress(
@@ -247,7 +403,14 @@ def analyze(path: Path, depth: int, sort_by: str, limit: int):
     ) as progress:
         # Scan projects
         scan_task = progress.add_task(get_text("status.scanning_projects"), total=None)
-        projects = scanner.scan_directory(path, depth)
+        projects = scanner.scan_directory(
+            path,
+            depth,
+            workers=workers,
+            executor=executor,
+            one_file_system=one_file_system,
+            estimate_top=exact_top if estimate else None,
+        )
         progress.update(scan_task, description=get_text("success.scan_completed"))
 
         if not projects:
@@ -353,8 +516,28 @@ def global_deps(manager_type: Optional[str], sort_by: str, limit: int):
     _display_global_dependencies_table(dependencies[:limit])
 
 
+def _create_scanner(use_cache: bool) -> ProjectScanner:
+    """Create a project scanner, attaching the incremental scan index if enabled"""
+    config = get_config()
+    index = None
+    if use_cache:
+        index = ScanIndex.from_config(config)
+        configure_size_cache(config)
+    return ProjectScanner(config, index=index)
+
+
 def _display_projects_table(projects):
     """Display projects table"""
+    table = _create_projects_table()
+
+    for project in projects:
+        _add_project_row(table, project)
+
+    console.print(table)
+
+
+def _create_projects_table() -> Table:
+    """Create an empty projects table"""
     table = Table(title=get_text("tables.projects.title"))
 
     table.add_column(get_text("tables.projects.name"), style="cyan", no_wrap=True)
@@ -365,16 +548,28 @@ def _display_projects_table(projects):
     )
     table.add_column(get_text("tables.projects.size"), justify="right", style="yellow")
 
-    for project in projects:
-        table.add_row(
-            project.name,
-            project.project_type.value,
-            str(project.path),
-            str(len(project.dependencies)),
-            format_size(project.total_size_bytes),
-        )
+    return table
 
-    console.print(table)
+
+def _render_scan_progress(projects) -> Group:
+    """Render the project count and the most recently found projects"""
+    table = _create_projects_table()
+    for project in projects[-SCAN_PROGRESS_ROWS:]:
+        _add_project_row(table, project)
+
+    status = f"{get_text('status.scanning_projects')} ({len(projects)})"
+    return Group(Text(status), table)
+
+
+def _add_project_row(table: Table, project) -> None:
+    """Append one project row to a projects table"""
+    table.add_row(
+        project.name,
+        project.project_type.value,
+        str(project.path),
+        str(len(project.dependencies)),
+        format_size_with_error(project.total_size_bytes, project.size_error_bytes),
+    )
 
 
 def _display_analysis_report(report, sort_by: str, limit: int):
@@ -510,7 +705,15 @@ def _display_project_info(project):
 @click.option(
     "--confirm/--no-confirm", default=True, help="Ask for confirmation before cleaning"
 )
-def clean(path: Path, cleanup_types: tuple, dry_run: bool, confirm: bool):
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=False,
+    help="Reuse the incremental scan index (off by default so sizes are re-measured)",
+)
+def clean(
+    path: Path, cleanup_types: tuple, dry_run: bool, confirm: bool, use_cache: bool
+):
     """Clean dependencies and caches to free up space"""
 
     console.print(
@@ -523,7 +726,7 @@ def clean(path: Path, cleanup_types: tuple, dry_run: bool, confirm: bool):
     config = get_config()
 
     # Scan projects first
-    scanner = ProjectScanner()
+    scanner = _create_scanner(use_cache)
     cleaner = DependencyCleaner(dry_run=dry_run)
 
     with Progress(
@@ -634,8 +837,18 @@ def clean(path: Path, cleanup_types: tuple, dry_run: bool, confirm: bool):
     default="projects",
     help="What to export",
 )
+@click.option(
+    "--cache/--no-cache",
+    "use_cache",
+    default=True,
+    help="Reuse the incremental scan index for unchanged directories and projects",
+)
 def export(
-    path: Path, export_format: str, output_path: Optional[Path], export_type: str
+    path: Path,
+    export_format: str,
+    output_path: Optional[Path],
+    export_type: str,
+    use_cache: bool,
 ):
     """Export analysis results to various formats"""
 
@@ -650,7 +863,7 @@ def export(
         filename = f"depx_{export_type}_{timestamp}.{export_format}"
         output_path = Path(filename)
 
-    scanner = ProjectScanner()
+    scanner = _create_scanner(use_cache)
     exporter = AnalysisExporter()
 
     with Progress(
@@ -1294,6 +1507,10 @@ def config(create: bool, config_path: Optional[Path], show: bool, lang_info: boo
             "Project Types", ", ".join(current_config.scan.project_types) or "All"
         )
         scan_table.add_row("Follow Symlinks", str(current_config.scan.follow_symlinks))
+        scan_table.add_row("One File System", str(current_config.scan.one_file_system))
+        scan_table.add_row("Traversal Order", current_config.scan.traversal_order)
+        scan_table.add_row("Workers", str(current_config.scan.workers or "adaptive"))
+        scan_table.add_row("Executor", current_config.scan.executor)
 
         console.print(scan_table)
 
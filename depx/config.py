@@ -9,6 +9,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
+from .utils.toml_utils import safe_load_toml
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,6 +24,10 @@ class ScanConfig:
     exclude_patterns: List[str] = field(default_factory=list)
     project_types: List[str] = field(default_factory=list)
     follow_symlinks: bool = False
+    one_file_system: bool = False  # do not cross filesystem boundaries (du -x)
+    traversal_order: str = "depth"  # depth / breadth / size
+    workers: int = 0  # parser threads, 0 = adaptive
+    executor: str = "auto"  # thread / process / auto
 
 
 @dataclass
@@ -57,6 +63,8 @@ class DepxConfig:
     log_level: str = "INFO"
     cache_enabled: bool = True
     cache_directory: str = "~/.depx/cache"
+    size_cache_ttl: int = 0  # seconds to keep directory sizes on disk, 0 = memory only
+    scan_index_ttl: int = 0  # seconds to reuse indexed projects, 0 = re-parse
 
     # Custom rules
     custom_parsers: Dict[str, Any] = field(default_factory=dict)
@@ -243,6 +251,8 @@ class ConfigManager:
             "log_level",
             "cache_enabled",
             "cache_directory",
+            "size_cache_ttl",
+            "scan_index_ttl",
             "ignore_directories",
         ]:
             if key in data:
@@ -252,17 +262,9 @@ class ConfigManager:
 
     def _load_toml_config(self, config_file: Path) -> None:
         """Load configuration from pyproject.toml [tool.depx] section"""
-        try:
-            import tomllib
-        except ImportError:
-            try:
-                import tomli as tomllib
-            except ImportError:
-                logger.error("tomllib/tomli not available, cannot load TOML config")
-                return
-
-        with open(config_file, "rb") as f:
-            data = tomllib.load(f)
+        data = safe_load_toml(config_file)
+        if not data:
+            return
 
         depx_config = data.get("tool", {}).get("depx", {})
         if not depx_config:
@@ -289,6 +291,10 @@ class ConfigManager:
                 "exclude_patterns": self.config.scan.exclude_patterns,
                 "project_types": self.config.scan.project_types,
                 "follow_symlinks": self.config.scan.follow_symlinks,
+                "one_file_system": self.config.scan.one_file_system,
+                "traversal_order": self.config.scan.traversal_order,
+                "workers": self.config.scan.workers,
+                "executor": self.config.scan.executor,
             },
             "cleanup": {
                 "dry_run": self.config.cleanup.dry_run,
@@ -306,6 +312,8 @@ class ConfigManager:
             "log_level": self.config.log_level,
             "cache_enabled": self.config.cache_enabled,
             "cache_directory": self.config.cache_directory,
+            "size_cache_ttl": self.config.size_cache_ttl,
+            "scan_index_ttl": self.config.scan_index_ttl,
             "ignore_directories": self.config.ignore_directories,
         }
 
@@ -346,6 +354,8 @@ class ConfigManager:
             "log_level",
             "cache_enabled",
             "cache_directory",
+            "size_cache_ttl",
+            "scan_index_ttl",
             "ignore_directories",
         ]:
             if key in data:
@@ -5,22 +5,29 @@
 """
 
 import logging
+import math
 from collections import Counter, defaultdict
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 
 from ..parsers.base import DependencyType, ProjectInfo, ProjectType
-from ..utils.file_utils import format_size
+from ..utils.file_utils import format_size, format_size_with_error
 
 logger = logging.getLogger(__name__)
 
 
+def _combine_errors(errors: Iterable[int]) -> int:
+    """合并相互独立的估计误差（平方和开方）"""
+    return int(round(math.sqrt(sum(error * error for error in errors))))
+
+
 @dataclass
 class DependencyStats:
     """依赖统计信息"""
 
     total_dependencies: int = 0
     total_size_bytes: int = 0
+    total_size_error_bytes: int = 0  # 估计模式下的 95% 置信误差
     by_type: Dict[DependencyType, int] = None
     by_project_type: Dict[ProjectType, int] = None
     largest_dependencies: List[Tuple[str, int]] = None  # (name, size)
@@ -41,6 +48,7 @@ class ProjectStats:
     total_projects: int = 0
     by_type: Dict[ProjectType, int] = None
     total_size_bytes: int = 0
+    total_size_error_bytes: int = 0  # 估计模式下的 95% 置信误差
     largest_projects: List[Tuple[str, int]] = None  # (name, size)
 
     def __post_init__(self):
@@ -88,7 +96,14 @@ class DependencyAnalyzer:
                 "total_projects": len(projects),
                 "total_dependencies": dependency_stats.total_dependencies,
                 "total_size": dependency_stats.total_size_bytes,
-                "total_size_formatted": format_size(dependency_stats.total_size_bytes),
+                "total_size_error": dependency_stats.total_size_error_bytes,
+                "total_size_formatted": format_size_with_error(
+                    dependency_stats.total_size_bytes,
+                    dependency_stats.total_size_error_bytes,
+                ),
+                "size_estimated": any(
+                    project.size_error_bytes > 0 for project in projects
+                ),
             },
             "project_stats": project_stats,
             "dependency_stats": dependency_stats,
@@ -118,6 +133,9 @@ class DependencyAnalyzer:
             project_sizes.append((project.name, size))
 
         stats.total_size_bytes = total_size
+        stats.total_size_error_bytes = _combine_errors(
+            project.size_error_bytes for project in projects
+        )
 
         # 排序获取最大的项目
         project_sizes.sort(key=lambda x: x[1], reverse=True)
@@ -156,6 +174,9 @@ class DependencyAnalyzer:
                 dep_sizes.append((dep.name, size))
 
         stats.total_size_bytes = total_size
+        stats.total_size_error_bytes = _combine_errors(
+            dep.size_error_bytes for dep in all_dependencies
+        )
 
         # 排序获取最大的依赖
         dep_sizes.sort(key=lambda x: x[1], reverse=True)
@@ -279,7 +300,9 @@ class DependencyAnalyzer:
                 "total_projects": 0,
                 "total_dependencies": 0,
                 "total_size": 0,
+                "total_size_error": 0,
                 "total_size_formatted": "0 B",
+                "size_estimated": False,
             },
             "project_stats": ProjectStats(),
             "dependency_stats": DependencyStats(),
@@ -12,7 +12,8 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from ..parsers.base import PackageManagerType, ProjectInfo, ProjectType
-from ..utils.file_utils import format_size
+from ..utils.file_utils import InodeLedger, format_size, get_disk_usage
+from ..utils.size_cache import get_cached_disk_usage
 
 logger = logging.getLogger(__name__)
 
@@ -96,6 +97,15 @@ class DependencyCleaner:
         if "cache" in cleanup_types:
             plan.global_caches.extend(self._find_global_caches())
 
+        # Measure allocated space; hardlinks shared between items count once
+        ledger = InodeLedger()
+        for item in plan.project_dependencies:
+            self._measure_item(item, ledger)
+        for item in plan.global_caches:
+            usage = get_cached_disk_usage(item["path"])
+            item["size"] = usage.allocated_bytes
+            item["apparent_size"] = usage.apparent_bytes
+
         # Calculate total size
         plan.total_size = sum(
             item["size"] for item in plan.project_dependencies + plan.global_caches
@@ -260,20 +270,17 @@ class DependencyCleaner:
         return unused_deps
 
     def _find_global_caches(self) -> List[Dict[str, Any]]:
-        """Find global package manager caches"""
+        """Find global package manager caches (sizes are filled in by the plan)"""
         caches = []
 
         # NPM cache
         npm_cache = self._get_npm_cache_path()
         if npm_cache and npm_cache.exists():
-            from ..utils.file_utils import get_directory_size
-
-            size = get_directory_size(npm_cache)
             caches.append(
                 {
                     "name": "npm cache",
                     "path": npm_cache,
-                    "size": size,
+                    "size": 0,
                     "type": "npm_cache",
                 }
             )
@@ -281,20 +288,34 @@ class DependencyCleaner:
         # Pip cache
         pip_cache = self._get_pip_cache_path()
         if pip_cache and pip_cache.exists():
-            from ..utils.file_utils import get_directory_size
-
-            size = get_directory_size(pip_cache)
             caches.append(
                 {
                     "name": "pip cache",
                     "path": pip_cache,
-                    "size": size,
+                    "size": 0,
                     "type": "pip_cache",
                 }
             )
 
         return caches
 
+    def _measure_item(self, item: Dict[str, Any], ledger: InodeLedger) -> None:
+        """
+        Replace an item's size with the disk space its removal would free
+
+        "size" becomes allocated bytes (st_blocks * 512) and "apparent_size"
+        keeps the content size. Items without an existing directory keep
+        their reported size.
+        """
+        path = item.get("path")
+        if not path or not Path(path).is_dir():
+            item.setdefault("apparent_size", item["size"])
+            return
+
+        usage = get_disk_usage(Path(path), ledger)
+        item["size"] = usage.allocated_bytes
+        item["apparent_size"] = usage.apparent_bytes
+
     def _clean_project_dependency(self, item: Dict[str, Any]) -> bool:
         """Clean a single project dependency"""
         if self.dry_run:
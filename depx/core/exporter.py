@@ -12,7 +12,7 @@ from pathlib import Path
 from typing import Any, Dict, List
 
 from ..parsers.base import GlobalDependencyInfo, ProjectInfo
-from ..utils.file_utils import format_size
+from ..utils.file_utils import format_size, format_size_with_error
 
 logger = logging.getLogger(__name__)
 
@@ -131,7 +131,10 @@ class AnalysisExporter:
                     str(project.config_file) if project.config_file else None
                 ),
                 "total_size_bytes": project.total_size_bytes,
-                "total_size_formatted": format_size(project.total_size_bytes),
+                "size_error_bytes": project.size_error_bytes,
+                "total_size_formatted": format_size_with_error(
+                    project.total_size_bytes, project.size_error_bytes
+                ),
                 "metadata": project.metadata,
                 "dependencies": [],
             }
@@ -143,7 +146,10 @@ class AnalysisExporter:
                     "installed_version": dep.installed_version,
                     "dependency_type": dep.dependency_type.value,
                     "size_bytes": dep.size_bytes,
-                    "size_formatted": format_size(dep.size_bytes),
+                    "size_error_bytes": dep.size_error_bytes,
+                    "size_formatted": format_size_with_error(
+                        dep.size_bytes, dep.size_error_bytes
+                    ),
                     "install_path": str(dep.install_path) if dep.install_path else None,
                 }
                 project_data["dependencies"].append(dep_data)
@@ -172,6 +178,7 @@ class AnalysisExporter:
                     "Config File",
                     "Total Dependencies",
                     "Total Size (Bytes)",
+                    "Size Error (Bytes)",
                     "Total Size (Formatted)",
                 ]
             )
@@ -186,7 +193,10 @@ class AnalysisExporter:
                         str(project.config_file) if project.config_file else "",
                         len(project.dependencies),
                         project.total_size_bytes,
-                        format_size(project.total_size_bytes),
+                        project.size_error_bytes,
+                        format_size_with_error(
+                            project.total_size_bytes, project.size_error_bytes
+                        ),
                     ]
                 )
 
@@ -365,7 +375,9 @@ class AnalysisExporter:
                 <td>{project.project_type.value}</td>
                 <td>{project.path}</td>
                 <td>{len(project.dependencies)}</td>
-                <td>{format_size(project.total_size_bytes)}</td>
+                <td>{format_size_with_error(
+                    project.total_size_bytes, project.size_error_bytes
+                )}</td>
             </tr>
 """
 
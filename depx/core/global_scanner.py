@@ -11,7 +11,7 @@ from pathlib import Path
 from typing import List, Set
 
 from ..parsers.base import GlobalDependencyInfo, PackageManagerType
-from ..utils.file_utils import get_directory_size
+from ..utils.size_cache import get_cached_directory_size
 
 logger = logging.getLogger(__name__)
 
@@ -140,7 +140,7 @@ class GlobalScanner:
                 dep_path = global_root / name if global_root else None
                 size = 0
                 if dep_path and dep_path.exists():
-                    size = get_directory_size(dep_path)
+                    size = get_cached_directory_size(dep_path)
 
                 dep_info = GlobalDependencyInfo(
                     name=name,
@@ -0,0 +1,317 @@
+"""
+增量扫描索引模块
+
+使用 SQLite 持久化目录列表和项目解析结果，重复扫描时只重新读取
+发生变化的目录、只重新解析配置/锁文件发生变化的项目
+
+项目记录包含依赖大小，而 node_modules、site-packages 或全局缓存中的
+深层修改不会改变项目指纹，因此项目记录只在 project_ttl 秒内有效；
+默认为 0，即只复用目录列表，项目每次都重新解析和统计大小。
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from ..config import DepxConfig
+from ..parsers.base import ProjectInfo
+from ..utils.file_utils import DirectorySnapshot
+
+logger = logging.getLogger(__name__)
+
+# 索引格式版本，ProjectInfo 序列化格式变化时需要递增
+INDEX_FORMAT_VERSION = 3
+
+INDEX_FILE_NAME = "scan_index.sqlite3"
+
+# 文件指纹: ((名称, mtime_ns, size), ...)
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+
+class ScanIndex:
+    """持久化的增量扫描索引"""
+
+    def __init__(self, db_path: Path, project_ttl: int = 0):
+        """
+        打开（或创建）索引数据库
+
+        Args:
+            db_path: SQLite 数据库文件路径
+            project_ttl: 项目记录的有效期（秒），为 0 时不复用项目记录
+
+        Raises:
+            sqlite3.Error, OSError: 数据库无法打开时抛出
+        """
+        self.db_path = db_path
+        self.project_ttl = project_ttl
+        self._lock = threading.Lock()
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), timeout=5, check_same_thread=False)
+        self._init_schema()
+
+    @classmethod
+    def from_config(cls, config: DepxConfig) -> Optional["ScanIndex"]:
+        """
+        根据配置打开默认位置的索引
+
+        Args:
+            config: Depx 配置
+
+        Returns:
+            扫描索引，缓存被禁用或无法打开时返回 None
+        """
+        if not config.cache_enabled:
+            return None
+
+        db_path = Path(config.cache_directory).expanduser() / INDEX_FILE_NAME
+        try:
+            return cls(db_path, project_ttl=config.scan_index_ttl)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"无法打开扫描索引: {db_path}, 错误: {e}")
+            return None
+
+    def _init_schema(self) -> None:
+        """创建数据表，索引格式或 Depx 版本变化时清空旧数据"""
+        from .. import __version__
+
+        format_tag = f"{INDEX_FORMAT_VERSION}:{__version__}"
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'format'"
+            ).fetchone()
+
+            if row is None or row[0] != format_tag:
+                self._conn.execute("DROP TABLE IF EXISTS directories")
+                self._conn.execute("DROP TABLE IF EXISTS projects")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('format', ?)",
+                    (format_tag,),
+                )
+
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS directories (
+                    path TEXT PRIMARY KEY,
+                    device INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    files TEXT NOT NULL,
+                    dirs TEXT NOT NULL,
+                    links TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS projects (
+                    path TEXT PRIMARY KEY,
+                    project_type TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    stored_at REAL NOT NULL
+                )
+                """
+            )
+
+    def lookup_directory(
+        self, path: Path, stat_result: os.stat_result
+    ) -> Optional[DirectorySnapshot]:
+        """
+        查找未变化目录的列表
+
+        Args:
+            path: 目录路径
+            stat_result: 目录当前的 stat 结果
+
+        Returns:
+            目录未变化时返回缓存的快照（不含 DirEntry），否则返回 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT device, inode, mtime_ns, files, dirs, links "
+                "FROM directories WHERE path = ?",
+                (str(path),),
+            ).fetchone()
+
+        if row is None or tuple(row[:3]) != _directory_key(stat_result):
+            return None
+
+        return DirectorySnapshot(
+            path=path,
+            file_names=frozenset(json.loads(row[3])),
+            dir_names=json.loads(row[4]),
+            link_names=frozenset(json.loads(row[5])),
+        )
+
+    def store_directory(
+        self, snapshot: DirectorySnapshot, stat_result: os.stat_result
+    ) -> None:
+        """
+        记录目录列表，并删除已不存在的子目录的旧记录
+
+        Args:
+            snapshot: 目录快照
+            stat_result: 目录的 stat 结果
+        """
+        path = str(snapshot.path)
+        device, inode, mtime_ns = _directory_key(stat_result)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT dirs FROM directories WHERE path = ?", (path,)
+            ).fetchone()
+            if row is not None:
+                removed = set(json.loads(row[0])) - set(snapshot.dir_names)
+                for name in removed:
+                    self._delete_subtree(str(snapshot.path / name))
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO directories "
+                "(path, device, inode, mtime_ns, files, dirs, links) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    path,
+                    device,
+                    inode,
+                    mtime_ns,
+                    json.dumps(sorted(snapshot.file_names)),
+                    json.dumps(snapshot.dir_names),
+                    json.dumps(sorted(snapshot.link_names)),
+                ),
+            )
+
+    def lookup_project(
+        self, path: Path, project_type: str, fingerprint: Fingerprint
+    ) -> Optional[ProjectInfo]:
+        """
+        查找配置和锁文件都未变化的项目
+
+        Args:
+            path: 项目路径
+            project_type: 项目类型
+            fingerprint: 项目文件指纹
+
+        Returns:
+            缓存的项目信息，未命中或记录已超过 project_ttl 时返回 None
+        """
+        if self.project_ttl <= 0:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT project_type, fingerprint, payload, stored_at "
+                "FROM projects WHERE path = ?",
+                (str(path),),
+            ).fetchone()
+
+        if row is None or row[0] != project_type:
+            return None
+        if row[1] != _encode_fingerprint(fingerprint):
+            return None
+        if time.time() - row[3] > self.project_ttl:
+            return None
+
+        try:
+            return ProjectInfo.from_dict(json.loads(row[2]))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.debug(f"索引中的项目记录无效: {path}, 错误: {e}")
+            return None
+
+    def store_project(
+        self, project_info: ProjectInfo, fingerprint: Fingerprint
+    ) -> None:
+        """
+        记录项目解析结果
+
+        Args:
+            project_info: 项目信息
+            fingerprint: 项目文件指纹
+        """
+        if self.project_ttl <= 0:
+            return
+
+        payload = json.dumps(project_info.to_dict(), default=str, ensure_ascii=False)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO projects "
+                "(path, project_type, fingerprint, payload, stored_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    str(project_info.path),
+                    project_info.project_type.value,
+                    _encode_fingerprint(fingerprint),
+                    payload,
+                    time.time(),
+                ),
+            )
+
+    def flush(self) -> None:
+        """提交未写入的修改"""
+        with self._lock:
+            try:
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"写入扫描索引失败: {self.db_path}, 错误: {e}")
+
+    def close(self) -> None:
+        """提交修改并关闭数据库"""
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def _delete_subtree(self, path: str) -> None:
+        """删除某个目录及其所有子目录的记录（调用方需持有锁）"""
+        # 按字符串范围匹配前缀: "a/b/" <= path < "a/b0"（"0" 紧随 "/" 之后），
+        # 与 LIKE 不同，大小写敏感且 _ 和 % 没有特殊含义
+        prefix = path.rstrip(os.sep) + os.sep
+        upper = prefix[:-1] + chr(ord(os.sep) + 1)
+        for table in ("directories", "projects"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE path = ? OR (path >= ? AND path < ?)",
+                (path, prefix, upper),
+            )
+
+
+def _directory_key(stat_result: os.stat_result) -> Tuple[int, int, int]:
+    """目录变化判断依据: (设备号, inode, mtime_ns)"""
+    return (stat_result.st_dev, stat_result.st_ino, stat_result.st_mtime_ns)
+
+
+def _encode_fingerprint(fingerprint: Fingerprint) -> str:
+    """将文件指纹编码为字符串"""
+    return json.dumps([list(item) for item in fingerprint])
+
+
+def build_fingerprint(snapshot: DirectorySnapshot, names: Iterable[str]) -> Fingerprint:
+    """
+    计算项目文件指纹
+
+    Args:
+        snapshot: 项目目录快照
+        names: 参与指纹计算的文件/目录名
+
+    Returns:
+        按名称排序的 (名称, mtime_ns, size) 元组
+    """
+    fingerprint = []
+
+    for name in sorted(set(names)):
+        entry = snapshot.entries.get(name)
+        try:
+            stat_result = entry.stat() if entry else os.stat(snapshot.path / name)
+        except OSError:
+            continue
+        fingerprint.append((name, stat_result.st_mtime_ns, stat_result.st_size))
+
+    return tuple(fingerprint)
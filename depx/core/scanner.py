@@ -5,30 +5,100 @@
 """
 
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import Dict, Generator, List, Optional
-
+from typing import (
+    Dict,
+    FrozenSet,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ..config import DepxConfig, get_config
 from ..parsers.base import BaseParser, ProjectInfo, ProjectType
+from ..parsers.cargo_registry import clear_cargo_registry_index
 from ..parsers.csharp import CSharpParser
 from ..parsers.go import GoParser
+from ..parsers.go_modcache import clear_go_module_cache
 from ..parsers.java import JavaParser
+from ..parsers.maven_repository import clear_maven_repository
 from ..parsers.nodejs import NodeJSParser
+from ..parsers.nuget_packages import clear_nuget_package_indexes
 from ..parsers.php import PHPParser
 from ..parsers.python import PythonParser
+from ..parsers.python_envs import clear_python_environments
 from ..parsers.rust import RustParser
-from ..utils.file_utils import is_hidden_directory
+from ..parsers.site_packages import clear_site_packages_indexes
+from ..utils.file_utils import DirectorySnapshot, read_directory_snapshot
+from ..utils.path_matcher import PathMatcher
+from ..utils.performance import AdaptiveConcurrency
+from ..utils.size_cache import (
+    clear_size_cache,
+    configure_size_cache,
+    get_size_cache,
+)
+from ..utils.toml_utils import clear_toml_cache
+from .scan_index import Fingerprint, ScanIndex, build_fingerprint
+from .walker import DirectoryWalker, TraversalOrder
 
 logger = logging.getLogger(__name__)
 
+# 自动模式下切换到进程池的候选项目数量阈值
+PROCESS_POOL_THRESHOLD = 256
+
+# 进程池中每个任务包含的最大项目数
+MAX_PROCESS_CHUNK_SIZE = 32
+
+# 流式扫描时进程池每个任务包含的项目数（项目总数未知）
+STREAM_PROCESS_CHUNK_SIZE = 8
+
+# 流式扫描中已发现、待解析的项目目录队列长度上限
+DEFAULT_QUEUE_SIZE = 256
+
+# 流式扫描等待发现线程时的轮询间隔（秒）
+DISCOVERY_POLL_INTERVAL = 0.05
+
+# 发现线程结束标记
+_DISCOVERY_DONE = object()
+
+# 进程池工作进程内的扫描器实例（由 _init_process_worker 创建）
+_worker_scanner: Optional["ProjectScanner"] = None
+
 
 class ProjectScanner:
     """项目扫描器"""
 
-    def __init__(self):
-        """初始化扫描器，注册所有支持的解析器"""
+    def __init__(
+        self, config: Optional[DepxConfig] = None, index: Optional[ScanIndex] = None
+    ):
+        """
+        初始化扫描器，注册所有支持的解析器
+
+        Args:
+            config: Depx 配置，默认使用全局配置
+            index: 增量扫描索引，为 None 时每次都完整扫描
+        """
+        self.config = config or get_config()
+        self.index = index
         self._parsers: Dict[ProjectType, BaseParser] = {}
         self._register_parsers()
+        self._marker_files, self._marker_extensions = self._build_marker_index()
 
     def _register_parsers(self) -> None:
         """注册所有支持的解析器"""
@@ -46,8 +116,27 @@ class ProjectScanner:
             self._parsers[parser.project_type] = parser
             logger.debug(f"注册解析器: {parser.project_type.value}")
 
+    def _build_marker_index(self) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+        """汇总所有解析器的标识文件名和扩展名，用于内存中快速匹配"""
+        marker_files = set()
+        marker_extensions = set()
+
+        for parser in self._parsers.values():
+            marker_files.update(parser.marker_files)
+            marker_extensions.update(parser.marker_extensions)
+
+        return frozenset(marker_files), tuple(sorted(marker_extensions))
+
     def scan_directory(
-        self, root_path: Path, max_depth: int = 5, parallel: bool = True
+        self,
+        root_path: Path,
+        max_depth: int = 5,
+        parallel: bool = True,
+        order: Optional[str] = None,
+        workers: Optional[int] = None,
+        executor: Optional[str] = None,
+        one_file_system: Optional[bool] = None,
+        estimate_top: Optional[int] = None,
     ) -> List[ProjectInfo]:
         """
         扫描指定目录，发现所有项目
@@ -56,6 +145,12 @@ class ProjectScanner:
             root_path: 根目录路径
             max_depth: 最大扫描深度
             parallel: 是否使用并行处理
+            order: 遍历顺序（depth/breadth/size），默认使用配置中的值
+            workers: 并行解析线程数，0 表示自适应，默认使用配置中的值
+            executor: 并行后端（thread/process/auto），默认使用配置中的值
+            one_file_system: 是否不跨越文件系统边界，默认使用配置中的值
+            estimate_top: 不为 None 时启用估计模式：先抽样估计所有目录大小，
+                再对估计值最大的 estimate_top 个项目精确统计
 
         Returns:
             发现的项目信息列表
@@ -64,150 +159,724 @@ class ProjectScanner:
             logger.error(f"无效的扫描路径: {root_path}")
             return []
 
+        if self.index is not None:
+            # 索引以绝对路径为键
+            root_path = root_path.absolute()
+
         logger.info(f"开始扫描目录: {root_path}")
+        clear_toml_cache()
+        clear_cargo_registry_index()
+        clear_maven_repository()
+        clear_go_module_cache()
+        clear_nuget_package_indexes()
+        clear_site_packages_indexes()
+        clear_python_environments()
+        clear_size_cache()
 
         # 发现潜在的项目目录
-        project_candidates = list(self._find_project_candidates(root_path, max_depth))
+        project_candidates = list(
+            self._find_project_candidates(root_path, max_depth, order, one_file_system)
+        )
         logger.info(f"发现 {len(project_candidates)} 个潜在项目目录")
 
         if not project_candidates:
+            self._flush_index()
             return []
 
-        # 解析项目信息
-        if parallel and len(project_candidates) > 1:
-            projects = self._parse_projects_parallel(project_candidates)
+        if estimate_top is None:
+            projects = self._parse_projects(
+                project_candidates, parallel, workers, executor
+            )
         else:
-            projects = self._parse_projects_sequential(project_candidates)
+            # 估计模式只在当前进程内生效，固定使用线程池
+            with get_size_cache().estimate_mode():
+                projects = self._parse_projects(
+                    project_candidates, parallel, workers, "thread"
+                )
+            projects = self._refine_estimates(
+                projects, project_candidates, estimate_top
+            )
 
+        self._flush_index()
         logger.info(f"成功解析 {len(projects)} 个项目")
         return projects
 
-    def _find_project_candidates(
-        self, root_path: Path, max_depth: int
-    ) -> Generator[Path, None, None]:
+    def _parse_projects(
+        self,
+        project_candidates: List[DirectorySnapshot],
+        parallel: bool,
+        workers: Optional[int],
+        executor: Optional[str],
+    ) -> List[ProjectInfo]:
+        """按配置选择串行、线程池或进程池解析项目"""
+        if parallel and len(project_candidates) > 1:
+            backend = self._choose_executor(
+                executor or self.config.scan.executor, len(project_candidates)
+            )
+            if backend == "process":
+                return self._parse_projects_in_processes(project_candidates, workers)
+            return self._parse_projects_parallel(project_candidates, workers)
+
+        return self._parse_projects_sequential(project_candidates)
+
+    def _refine_estimates(
+        self,
+        projects: List[ProjectInfo],
+        project_candidates: List[DirectorySnapshot],
+        top: int,
+    ) -> List[ProjectInfo]:
         """
-        查找潜在的项目目录
+        对估计大小最大的 top 个项目重新精确统计
 
         Args:
-            root_path: 根目录
-            max_depth: 最大深度
+            projects: 估计模式下的解析结果
+            project_candidates: 项目目录快照
+            top: 需要精确统计的项目数量
 
-        Yields:
-            潜在的项目目录路径
+        Returns:
+            项目信息列表，前 top 个项目的大小为精确值
         """
+        snapshots = {snapshot.path: snapshot for snapshot in project_candidates}
+        ranked = sorted(
+            range(len(projects)),
+            key=lambda i: projects[i].total_size_bytes,
+            reverse=True,
+        )
+
+        refined = 0
+        for i in ranked[: max(top, 0)]:
+            snapshot = snapshots.get(projects[i].path)
+            if snapshot is None or not projects[i].size_error_bytes:
+                continue
+            try:
+                exact = {p.path: p for p in self._parse_snapshot(snapshot)}
+            except Exception as e:
+                logger.warning(f"精确统计项目失败: {snapshot.path}, 错误: {e}")
+                continue
+            if projects[i].path in exact:
+                projects[i] = exact[projects[i].path]
+                refined += 1
 
-        def _scan_recursive(
-            current_path: Path, current_depth: int
-        ) -> Generator[Path, None, None]:
-            if current_depth > max_depth:
+        logger.info(f"已精确统计 {refined} 个最大的项目")
+        return projects
+
+    def iter_scan(
+        self,
+        root_path: Path,
+        max_depth: int = 5,
+        parallel: bool = True,
+        order: Optional[str] = None,
+        workers: Optional[int] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        one_file_system: Optional[bool] = None,
+        executor: Optional[str] = None,
+    ) -> Generator[ProjectInfo, None, None]:
+        """
+        流式扫描指定目录，每个项目解析完成后立即产出
+
+        并行模式下目录发现在后台线程中进行，发现的项目目录经有界队列
+        交给解析线程池（或进程池），发现与解析重叠执行；结果按完成顺序
+        产出。auto 后端先用线程池解析，已发现的项目达到
+        PROCESS_POOL_THRESHOLD 后，其余项目交给进程池。
+
+        Args:
+            root_path: 根目录路径
+            max_depth: 最大扫描深度
+            parallel: 是否使用并行处理
+            order: 遍历顺序（depth/breadth/size），默认使用配置中的值
+            workers: 并行解析线程数，0 表示自适应，默认使用配置中的值
+            queue_size: 待解析项目目录队列的长度上限
+            one_file_system: 是否不跨越文件系统边界，默认使用配置中的值
+            executor: 并行后端（thread/process/auto），默认使用配置中的值
+
+        Yields:
+            解析成功的项目信息
+        """
+        if not root_path.exists() or not root_path.is_dir():
+            logger.error(f"无效的扫描路径: {root_path}")
+            return
+
+        if self.index is not None:
+            root_path = root_path.absolute()
+
+        logger.info(f"开始流式扫描目录: {root_path}")
+        clear_toml_cache()
+        clear_cargo_registry_index()
+        clear_maven_repository()
+        clear_go_module_cache()
+        clear_nuget_package_indexes()
+        clear_site_packages_indexes()
+        clear_python_environments()
+        clear_size_cache()
+        count = 0
+
+        try:
+            if not parallel:
+                for snapshot in self._find_project_candidates(
+                    root_path, max_depth, order, one_file_system
+                ):
+                    try:
+                        parsed = self._parse_snapshot(snapshot)
+                    except Exception as e:
+                        logger.error(f"解析项目失败: {snapshot.path}, 错误: {e}")
+                        continue
+                    count += len(parsed)
+                    yield from parsed
                 return
 
+            candidates: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+            stop = threading.Event()
+            discovery = threading.Thread(
+                target=self._discover_into_queue,
+                args=(
+                    root_path,
+                    max_depth,
+                    order,
+                    one_file_system,
+                    candidates,
+                    stop,
+                ),
+                name="depx-discovery",
+                daemon=True,
+            )
+            discovery.start()
+
+            source = _SnapshotSource(candidates)
+            backend = executor or self.config.scan.executor
+            if backend == "auto" and (os.cpu_count() or 1) > 1:
+                source.limit = PROCESS_POOL_THRESHOLD
+
             try:
-                # 检查当前目录是否为项目
-                if self._is_project_directory(current_path):
-                    yield current_path
-                    # 如果是项目目录，通常不需要继续深入扫描
+                if backend != "process":
+                    for snapshot, future in self._run_parse_tasks(source, workers):
+                        try:
+                            parsed = future.result()
+                        except Exception as e:
+                            logger.error(f"解析项目失败: {snapshot.path}, 错误: {e}")
+                            continue
+                        count += len(parsed)
+                        yield from parsed
+                    source.limit = None
+
+                if backend != "thread" and not source.exhausted:
+                    logger.debug("流式扫描改用进程池解析其余项目")
+                    for project_info in self._iter_parse_in_processes(
+                        source, workers, STREAM_PROCESS_CHUNK_SIZE
+                    ):
+                        count += 1
+                        yield project_info
+            finally:
+                stop.set()
+                discovery.join()
+        finally:
+            self._flush_index()
+            logger.info(f"成功解析 {count} 个项目")
+
+    def _discover_into_queue(
+        self,
+        root_path: Path,
+        max_depth: int,
+        order: Optional[str],
+        one_file_system: Optional[bool],
+        candidates: "queue.Queue",
+        stop: threading.Event,
+    ) -> None:
+        """
+        发现线程：将项目目录快照放入有界队列，结束时放入结束标记
+
+        队列已满时阻塞等待解析线程消费，消费方提前退出时通过 stop 结束。
+        """
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    candidates.put(item, timeout=DISCOVERY_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            for snapshot in self._find_project_candidates(
+                root_path, max_depth, order, one_file_system
+            ):
+                if not put(snapshot):
                     return
+        except Exception as e:
+            logger.error(f"发现项目目录失败: {root_path}, 错误: {e}")
+        finally:
+            put(_DISCOVERY_DONE)
 
-                # 扫描子目录
-                for item in current_path.iterdir():
-                    if item.is_dir() and not is_hidden_directory(item):
-                        yield from _scan_recursive(item, current_depth + 1)
+    def _find_project_candidates(
+        self,
+        root_path: Path,
+        max_depth: int,
+        order: Optional[str] = None,
+        one_file_system: Optional[bool] = None,
+    ) -> Generator[DirectorySnapshot, None, None]:
+        """
+        查找潜在的项目目录
 
-            except (OSError, PermissionError) as e:
-                logger.warning(f"无法访问目录: {current_path}, 错误: {e}")
+        每个目录只读取一次（os.scandir），项目识别在内存中完成；
+        遍历使用显式工作队列，不随目录深度嵌套生成器。排除模式和
+        忽略目录在进入子目录前剪枝，include 模式决定哪些项目被报告。
 
-        yield from _scan_recursive(root_path, 0)
+        Args:
+            root_path: 根目录
+            max_depth: 最大深度
+            order: 遍历顺序（depth/breadth/size）
+            one_file_system: 是否不跨越文件系统边界
 
-    def _is_project_directory(self, path: Path) -> bool:
+        Yields:
+            潜在项目目录的快照
         """
-        判断目录是否为项目目录
+        matcher = PathMatcher.from_config(self.config, root_path)
+        walker = DirectoryWalker(
+            max_depth=max_depth,
+            order=TraversalOrder(order or self.config.scan.traversal_order),
+            skip_directory=matcher.is_excluded,
+            reader=self._read_directory,
+            follow_symlinks=self.config.scan.follow_symlinks,
+            one_file_system=(
+                self.config.scan.one_file_system
+                if one_file_system is None
+                else one_file_system
+            ),
+        )
+
+        def is_match(snapshot: DirectorySnapshot) -> bool:
+            return self._is_project_snapshot(snapshot) and matcher.is_included(
+                snapshot.path
+            )
+
+        yield from walker.walk(root_path, is_match)
+
+    def _read_directory(
+        self, path: Path, stat_result: Optional[os.stat_result] = None
+    ) -> DirectorySnapshot:
+        """
+        读取目录快照，目录 mtime/inode 未变化时直接使用索引中的列表
 
         Args:
             path: 目录路径
+            stat_result: 遍历器已获取的目录 stat 结果
+
+        Returns:
+            目录快照
+        """
+        if self.index is None:
+            return read_directory_snapshot(path, stat_result)
+
+        if stat_result is None:
+            stat_result = os.stat(path)
+        snapshot = self.index.lookup_directory(path, stat_result)
+        if snapshot is None:
+            snapshot = read_directory_snapshot(path, stat_result)
+            self.index.store_directory(snapshot, stat_result)
+        else:
+            snapshot.stat = stat_result
+        return snapshot
+
+    def _project_fingerprint(
+        self, parser: BaseParser, snapshot: DirectorySnapshot
+    ) -> Fingerprint:
+        """计算项目配置文件、锁文件和安装目录的指纹"""
+        watched = set(parser.marker_files)
+        watched.update(name for name in parser.config_files if "*" not in name)
+        watched.update(parser.lock_files)
+        watched.update(parser.install_directories)
+
+        present = snapshot.file_names.union(snapshot.dir_names)
+        names = [name for name in present if name in watched]
+        if parser.marker_extensions:
+            extensions = tuple(parser.marker_extensions)
+            names.extend(
+                name for name in snapshot.file_names if name.endswith(extensions)
+            )
+
+        return build_fingerprint(snapshot, names)
+
+    def _flush_index(self) -> None:
+        """将索引的修改写入磁盘"""
+        if self.index is not None:
+            self.index.flush()
+
+    def _is_project_snapshot(self, snapshot: DirectorySnapshot) -> bool:
+        """
+        基于目录快照判断是否为项目目录（纯内存匹配）
+
+        Args:
+            snapshot: 目录快照
 
         Returns:
             是否为项目目录
         """
-        for parser in self._parsers.values():
-            if parser.can_parse(path):
-                return True
+        if not snapshot.file_names.isdisjoint(self._marker_files):
+            return True
+        if self._marker_extensions:
+            return any(
+                name.endswith(self._marker_extensions) for name in snapshot.file_names
+            )
         return False
 
+    def _select_parser(self, snapshot: DirectorySnapshot) -> Optional[BaseParser]:
+        """根据目录快照选择解析器"""
+        for parser in self._parsers.values():
+            if parser.can_parse_snapshot(snapshot):
+                return parser
+        return None
+
     def _parse_projects_sequential(
-        self, project_paths: List[Path]
+        self, snapshots: List[DirectorySnapshot]
     ) -> List[ProjectInfo]:
         """
         顺序解析项目
 
         Args:
-            project_paths: 项目路径列表
+            snapshots: 项目目录快照列表
 
         Returns:
             解析成功的项目信息列表
         """
         projects = []
 
-        for path in project_paths:
+        for snapshot in snapshots:
             try:
-                project_info = self._parse_single_project(path)
-                if project_info:
-                    projects.append(project_info)
+                projects.extend(self._parse_snapshot(snapshot))
             except Exception as e:
-                logger.error(f"解析项目失败: {path}, 错误: {e}")
+                logger.error(f"解析项目失败: {snapshot.path}, 错误: {e}")
 
         return projects
 
-    def _parse_projects_parallel(self, project_paths: List[Path]) -> List[ProjectInfo]:
+    def _parse_projects_parallel(
+        self, snapshots: List[DirectorySnapshot], workers: Optional[int] = None
+    ) -> List[ProjectInfo]:
         """
         并行解析项目
 
         Args:
-            project_paths: 项目路径列表
+            snapshots: 项目目录快照列表
+            workers: 线程数，0 表示根据任务耗时自适应，None 使用配置中的值
 
         Returns:
             解析成功的项目信息列表
         """
         projects = []
 
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            # 提交所有解析任务
-            future_to_path = {
-                executor.submit(self._parse_single_project, path): path
-                for path in project_paths
-            }
+        for snapshot, future in self._run_parse_tasks(snapshots, workers):
+            try:
+                projects.extend(future.result())
+            except Exception as e:
+                logger.error(f"解析项目失败: {snapshot.path}, 错误: {e}")
 
-            # 收集结果
-            for future in as_completed(future_to_path):
-                path = future_to_path[future]
-                try:
-                    project_info = future.result()
-                    if project_info:
-                        projects.append(project_info)
-                except Exception as e:
-                    logger.error(f"解析项目失败: {path}, 错误: {e}")
+        return projects
+
+    def _run_parse_tasks(
+        self,
+        snapshots: Union[Iterable[DirectorySnapshot], "queue.Queue", "_SnapshotSource"],
+        workers: Optional[int] = None,
+    ) -> Generator[Tuple[DirectorySnapshot, Future], None, None]:
+        """
+        在线程池中解析项目，按完成顺序产出结果
+
+        固定线程数时与普通线程池一致；自适应模式下线程池按上限创建，
+        同时在途的任务数由 AdaptiveConcurrency 根据实测的单项目耗时和
+        IO 等待比例动态调整。
+
+        snapshots 为队列时（由发现线程填充），只在没有在途任务时阻塞
+        等待新目录，保证已完成的结果不会被目录发现拖慢。
+
+        Args:
+            snapshots: 项目目录快照、以 _DISCOVERY_DONE 结束的队列，
+                或已包装的 _SnapshotSource
+            workers: 线程数，0 表示自适应，None 使用配置中的值
+
+        Yields:
+            (项目快照, 已完成的 Future)
+        """
+        if workers is None:
+            workers = self.config.scan.workers
+
+        if workers and workers > 0:
+            concurrency = None
+            max_workers = workers
+        else:
+            concurrency = AdaptiveConcurrency()
+            max_workers = concurrency.max_workers
+
+        source = (
+            snapshots
+            if isinstance(snapshots, _SnapshotSource)
+            else _SnapshotSource(snapshots)
+        )
+        in_flight: Dict[Future, DirectorySnapshot] = {}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+
+            def fill() -> None:
+                limit = max_workers if concurrency is None else concurrency.limit
+                while len(in_flight) < limit:
+                    snapshot = source.take(block=not in_flight)
+                    if snapshot is None:
+                        return
+                    if concurrency is None:
+                        future = executor.submit(self._parse_snapshot, snapshot)
+                    else:
+                        future = executor.submit(
+                            concurrency.measure, self._parse_snapshot, snapshot
+                        )
+                    in_flight[future] = snapshot
+
+            fill()
+            while in_flight:
+                done, _ = wait(
+                    list(in_flight),
+                    timeout=None if source.exhausted else DISCOVERY_POLL_INTERVAL,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    yield in_flight.pop(future), future
+                fill()
+
+        if concurrency is not None:
+            logger.debug(f"自适应解析并发数: {concurrency.limit}")
+
+    def _choose_executor(self, executor: str, candidate_count: int) -> str:
+        """
+        选择并行后端
+
+        Args:
+            executor: 配置的后端（thread/process/auto）
+            candidate_count: 候选项目数量
+
+        Returns:
+            实际使用的后端（thread/process）
+        """
+        if executor != "auto":
+            return executor
+
+        if candidate_count >= PROCESS_POOL_THRESHOLD and (os.cpu_count() or 1) > 1:
+            return "process"
+        return "thread"
+
+    def _parse_projects_in_processes(
+        self, snapshots: List[DirectorySnapshot], workers: Optional[int] = None
+    ) -> List[ProjectInfo]:
+        """
+        使用进程池解析项目，绕开 GIL 对 XML/JSON/正则解析的限制
+
+        Args:
+            snapshots: 项目目录快照列表
+            workers: 进程数，0 或 None 表示使用 CPU 核数
 
+        Returns:
+            解析成功的项目信息列表
+        """
+        if workers is None:
+            workers = self.config.scan.workers
+        max_workers = workers if workers and workers > 0 else os.cpu_count() or 1
+        chunk_size = max(
+            1, min(MAX_PROCESS_CHUNK_SIZE, len(snapshots) // (max_workers * 4))
+        )
+        return list(
+            self._iter_parse_in_processes(
+                _SnapshotSource(snapshots), workers, chunk_size
+            )
+        )
+
+    def _iter_parse_in_processes(
+        self,
+        source: "_SnapshotSource",
+        workers: Optional[int],
+        chunk_size: int,
+    ) -> Generator[ProjectInfo, None, None]:
+        """
+        使用进程池解析项目，按完成顺序产出结果
+
+        索引查询和写入在主进程完成，只有未命中索引的项目会被分块提交
+        到工作进程；结果以紧凑元组的形式传回以降低 IPC 开销。同时在途
+        的任务块数不超过进程数的两倍。
+
+        Args:
+            source: 项目目录快照来源
+            workers: 进程数，0 或 None 表示使用 CPU 核数
+            chunk_size: 每个任务块包含的最大项目数
+
+        Yields:
+            解析成功的项目信息
+        """
+        if workers is None:
+            workers = self.config.scan.workers
+        max_workers = workers if workers and workers > 0 else os.cpu_count() or 1
+        in_flight: Dict[Future, List[Tuple[DirectorySnapshot, Optional[Fingerprint]]]]
+        in_flight = {}
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=_process_pool_context(),
+            initializer=_init_process_worker,
+            initargs=(self.config,),
+        ) as executor:
+
+            def fill() -> List[ProjectInfo]:
+                """提交任务块，返回命中索引或在当前进程解析的项目"""
+                ready: List[ProjectInfo] = []
+                while len(in_flight) < max_workers * 2:
+                    chunk: List[Tuple[DirectorySnapshot, Optional[Fingerprint]]] = []
+                    while len(chunk) < chunk_size:
+                        snapshot = source.take(block=not (in_flight or chunk or ready))
+                        if snapshot is None:
+                            break
+                        parser = self._select_parser(snapshot)
+                        if not parser:
+                            logger.warning(f"没有找到合适的解析器: {snapshot.path}")
+                            continue
+                        fingerprint, cached = self._lookup_index(parser, snapshot)
+                        if cached is not None:
+                            ready.append(cached)
+                        else:
+                            chunk.append((snapshot, fingerprint))
+
+                    if not chunk:
+                        return ready
+                    try:
+                        future = executor.submit(
+                            _parse_paths_in_process, [str(s.path) for s, _ in chunk]
+                        )
+                    except BrokenProcessPool as e:
+                        logger.warning(f"进程池不可用，改为在当前进程解析: {e}")
+                        ready.extend(self._parse_chunk_locally(chunk))
+                        continue
+                    in_flight[future] = chunk
+                return ready
+
+            while True:
+                yield from fill()
+                if not in_flight:
+                    if source.exhausted:
+                        return
+                    continue
+
+                done, _ = wait(
+                    list(in_flight),
+                    timeout=None if source.exhausted else DISCOVERY_POLL_INTERVAL,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    chunk = in_flight.pop(future)
+                    try:
+                        results = future.result()
+                    except BrokenProcessPool as e:
+                        logger.warning(f"工作进程异常退出，改为在当前进程解析: {e}")
+                        yield from self._parse_chunk_locally(chunk)
+                        continue
+
+                    for (snapshot, fingerprint), compacts in zip(chunk, results):
+                        parsed = [ProjectInfo.from_compact(c) for c in compacts]
+                        self._store_index(parsed, fingerprint)
+                        yield from parsed
+
+    def _parse_chunk_locally(
+        self, chunk: List[Tuple[DirectorySnapshot, Optional[Fingerprint]]]
+    ) -> List[ProjectInfo]:
+        """进程池不可用时，在当前进程解析一个任务块"""
+        projects = []
+        for snapshot, fingerprint in chunk:
+            try:
+                parsed = self._parse_with_parser(snapshot)
+            except Exception as e:
+                logger.error(f"解析项目失败: {snapshot.path}, 错误: {e}")
+                continue
+            self._store_index(parsed, fingerprint)
+            projects.extend(parsed)
         return projects
 
-    def _parse_single_project(self, project_path: Path) -> Optional[ProjectInfo]:
+    def _lookup_index(
+        self, parser: BaseParser, snapshot: DirectorySnapshot
+    ) -> Tuple[Optional[Fingerprint], Optional[ProjectInfo]]:
         """
-        解析单个项目
+        在索引中查找项目
+
+        Returns:
+            (项目指纹, 缓存的项目信息)，未启用索引时均为 None
+        """
+        if self.index is None:
+            return None, None
+
+        fingerprint = self._project_fingerprint(parser, snapshot)
+        cached = self.index.lookup_project(
+            snapshot.path, parser.project_type.value, fingerprint
+        )
+        if cached is not None:
+            logger.debug(f"使用索引中的项目信息: {snapshot.path}")
+        return fingerprint, cached
+
+    def _store_index(
+        self, projects: List[ProjectInfo], fingerprint: Optional[Fingerprint]
+    ) -> None:
+        """
+        将解析结果写入索引
+
+        估计模式下的结果不写入；工作区等一次解析出多个项目的结果也不写入，
+        因为指纹只覆盖根目录的文件，成员的变化无法检测。
+        """
+        if get_size_cache().estimating or len(projects) != 1:
+            return
+        if self.index is not None and fingerprint:
+            self.index.store_project(projects[0], fingerprint)
+
+    def _parse_with_parser(self, snapshot: DirectorySnapshot) -> List[ProjectInfo]:
+        """不经过索引，直接用匹配的解析器解析项目"""
+        parser = self._select_parser(snapshot)
+        if not parser:
+            logger.warning(f"没有找到合适的解析器: {snapshot.path}")
+            return []
+
+        logger.debug(f"使用 {parser.project_type.value} 解析器解析: {snapshot.path}")
+        return parser.parse_projects(snapshot.path)
+
+    def _parse_snapshot(self, snapshot: DirectorySnapshot) -> List[ProjectInfo]:
+        """
+        根据目录快照解析项目
+
+        Args:
+            snapshot: 项目目录快照
+
+        Returns:
+            项目信息列表（工作区会包含成员项目），解析失败时为空列表
+        """
+        parser = self._select_parser(snapshot)
+        if not parser:
+            logger.warning(f"没有找到合适的解析器: {snapshot.path}")
+            return []
+
+        fingerprint, cached = self._lookup_index(parser, snapshot)
+        if cached is not None:
+            return [cached]
+
+        logger.debug(f"使用 {parser.project_type.value} 解析器解析: {snapshot.path}")
+        projects = parser.parse_projects(snapshot.path)
+        self._store_index(projects, fingerprint)
+
+        return projects
+
+    def _parse_single_project(self, project_path: Path) -> List[ProjectInfo]:
+        """
+        解析单个项目目录
 
         Args:
             project_path: 项目路径
 
         Returns:
-            项目信息，解析失败时返回 None
+            项目信息列表，解析失败时为空列表
         """
-        for parser in self._parsers.values():
-            if parser.can_parse(project_path):
-                logger.debug(
-                    f"使用 {parser.project_type.value} 解析器解析: {project_path}"
-                )
-                return parser.parse_project(project_path)
+        try:
+            snapshot = read_directory_snapshot(project_path)
+        except OSError as e:
+            logger.warning(f"无法访问目录: {project_path}, 错误: {e}")
+            return []
 
-        logger.warning(f"没有找到合适的解析器: {project_path}")
-        return None
+        return self._parse_snapshot(snapshot)
 
     def get_supported_project_types(self) -> List[ProjectType]:
         """
@@ -232,4 +901,91 @@ class ProjectScanner:
             logger.error(f"无效的项目路径: {project_path}")
             return None
 
-        return self._parse_single_project(project_path)
+        if self.index is not None:
+            project_path = project_path.absolute()
+
+        projects = self._parse_single_project(project_path)
+        return projects[0] if projects else None
+
+
+class _SnapshotSource:
+    """统一普通可迭代对象与发现队列的取数接口"""
+
+    def __init__(self, snapshots: Union[Iterable[DirectorySnapshot], "queue.Queue"]):
+        self._queue = snapshots if isinstance(snapshots, queue.Queue) else None
+        self._iterator: Optional[Iterator[DirectorySnapshot]] = (
+            None if self._queue is not None else iter(snapshots)
+        )
+        self.exhausted = False
+        self.taken = 0
+        self.limit: Optional[int] = None  # 取出 limit 个后暂停，直到 limit 被重置
+
+    def take(self, block: bool) -> Optional[DirectorySnapshot]:
+        """
+        取出下一个快照
+
+        Args:
+            block: 队列为空时是否阻塞等待（普通可迭代对象总是阻塞）
+
+        Returns:
+            下一个快照，暂无可用、已达到 limit 或已取完时返回 None
+        """
+        if self.exhausted or (self.limit is not None and self.taken >= self.limit):
+            return None
+
+        if self._iterator is not None:
+            item = next(self._iterator, None)
+        else:
+            try:
+                item = self._queue.get(block=block)
+            except queue.Empty:
+                return None
+
+        if item is None or item is _DISCOVERY_DONE:
+            self.exhausted = True
+            return None
+        self.taken += 1
+        return item
+
+
+def _process_pool_context() -> multiprocessing.context.BaseContext:
+    """
+    进程池的启动方式
+
+    进程池创建时统计线程池、目录发现线程可能已在运行，fork 会把它们
+    持有的锁复制进子进程而线程本身不存在，因此使用 forkserver，不支持
+    时使用 spawn。
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _init_process_worker(config: DepxConfig) -> None:
+    """进程池初始化函数：在工作进程中创建扫描器"""
+    global _worker_scanner
+    configure_size_cache(config)
+    _worker_scanner = ProjectScanner(config)
+
+
+def _parse_paths_in_process(paths: List[str]) -> List[List[Tuple]]:
+    """
+    在工作进程中解析一批项目
+
+    Args:
+        paths: 项目路径列表
+
+    Returns:
+        与 paths 一一对应的紧凑项目信息列表，解析失败时为空列表
+    """
+    results: List[List[Tuple]] = []
+
+    for path in paths:
+        try:
+            projects = _worker_scanner._parse_single_project(Path(path))
+            results.append([project_info.to_compact() for project_info in projects])
+        except Exception as e:
+            logger.error(f"解析项目失败: {path}, 错误: {e}")
+            results.append([])
+
+    return results
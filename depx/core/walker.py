@@ -0,0 +1,270 @@
+"""
+目录遍历引擎模块
+
+使用显式工作队列迭代遍历目录树，替代逐层嵌套的递归生成器
+"""
+
+import heapq
+import itertools
+import logging
+import os
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Deque, Generator, Iterator, List, Optional, Set, Tuple
+
+from ..utils.file_utils import (
+    DirectorySnapshot,
+    is_hidden_directory,
+    read_directory_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+# 待访问目录数量的默认上限
+DEFAULT_MAX_PENDING = 100_000
+
+# 目录身份: (st_dev, st_ino)
+_Identity = Tuple[int, int]
+
+# 待访问条目: (深度, 目录路径, 已知的目录身份或 None)
+_PendingEntry = Tuple[int, Path, Optional[_Identity]]
+
+# 已读取的目录: (快照, 设备号)
+_ReadResult = Tuple[DirectorySnapshot, int]
+
+
+class TraversalOrder(Enum):
+    """目录遍历顺序枚举"""
+
+    DEPTH_FIRST = "depth"  # 深度优先（与旧版递归顺序一致）
+    BREADTH_FIRST = "breadth"  # 广度优先，浅层项目优先出现
+    SIZE_FIRST = "size"  # 小目录优先，条目少的目录先被访问
+
+
+class DirectoryWalker:
+    """基于显式工作队列的目录遍历器"""
+
+    def __init__(
+        self,
+        max_depth: int = 5,
+        order: TraversalOrder = TraversalOrder.DEPTH_FIRST,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        skip_directory: Callable[[Path], bool] = is_hidden_directory,
+        reader: Callable[
+            [Path, Optional[os.stat_result]], DirectorySnapshot
+        ] = read_directory_snapshot,
+        follow_symlinks: bool = False,
+        one_file_system: bool = False,
+    ):
+        """
+        初始化遍历器
+
+        Args:
+            max_depth: 最大遍历深度
+            order: 遍历顺序
+            max_pending: 队列中待访问目录的上限，达到后其余子目录按深度优先处理
+            skip_directory: 判断是否跳过某个子目录的函数
+            reader: 读取目录快照的函数，接收目录路径和已取得的 stat 结果
+            follow_symlinks: 是否进入指向目录的符号链接
+            one_file_system: 是否只遍历根目录所在的文件系统（类似 du -x）
+        """
+        self.max_depth = max_depth
+        self.order = order
+        self.max_pending = max(1, max_pending)
+        self.skip_directory = skip_directory
+        self.reader = reader
+        self.follow_symlinks = follow_symlinks
+        self.one_file_system = one_file_system
+        self.peak_pending = 0  # 最近一次遍历中队列长度的峰值
+
+    def walk(
+        self,
+        root_path: Path,
+        is_match: Callable[[DirectorySnapshot], bool],
+    ) -> Generator[DirectorySnapshot, None, None]:
+        """
+        遍历目录树，产出匹配的目录快照，匹配的目录不再继续深入
+
+        每个目录按 (st_dev, st_ino) 去重，符号链接指向的同一目录只访问
+        一次，也不会因目录环而无限遍历。普通子目录的 inode 取自父目录
+        列表中的 DirEntry，设备号沿用父目录的，不额外 stat；只有根目录、
+        符号链接的目标，以及 one_file_system 需要检查设备号时才 stat。
+
+        跨越挂载点后沿用的设备号并不准确，因此由目录列表得到的身份只与
+        stat 得到的身份比较；不跟随符号链接时，目录树中不会出现重复的
+        目录（one_file_system 时每个目录都 stat，绑定挂载也能去重）。
+
+        Args:
+            root_path: 根目录
+            is_match: 判断目录快照是否匹配的函数
+
+        Yields:
+            匹配的目录快照
+        """
+        stat_visited: Set[_Identity] = set()  # stat 得到的身份
+        listed_visited: Set[_Identity] = set()  # 由父目录列表得到的身份
+        root_device: List[Optional[int]] = [None]
+
+        def read(path: Path, identity: Optional[_Identity]) -> Optional[_ReadResult]:
+            stat_result = None
+            if identity is None or self.one_file_system:
+                stat_result = self._stat(path)
+                if stat_result is None:
+                    return None
+                identity = (stat_result.st_dev, stat_result.st_ino)
+
+                if root_device[0] is None:
+                    root_device[0] = stat_result.st_dev
+                elif self.one_file_system and stat_result.st_dev != root_device[0]:
+                    logger.debug(f"跳过其他文件系统上的目录: {path}")
+                    return None
+
+                seen = identity in stat_visited or identity in listed_visited
+                stat_visited.add(identity)
+            else:
+                seen = identity in stat_visited
+                listed_visited.add(identity)
+
+            if seen:
+                logger.debug(f"跳过已访问的目录: {path}")
+                return None
+
+            snapshot = self._read(path, stat_result)
+            if snapshot is None:
+                return None
+            return snapshot, identity[0]
+
+        yield from self._walk_frontier(root_path, is_match, read)
+
+    def _walk_frontier(
+        self,
+        root_path: Path,
+        is_match: Callable[[DirectorySnapshot], bool],
+        read: Callable[[Path, Optional[_Identity]], Optional[_ReadResult]],
+    ) -> Generator[DirectorySnapshot, None, None]:
+        """
+        使用有界的待访问队列遍历
+
+        深度优先时子目录以迭代器的形式压栈，栈深不超过 max_depth。
+        广度优先和大小优先时子目录放入队列（或堆），达到 max_pending
+        后其余子目录留在迭代器中并优先按深度优先处理，因此队列中的
+        待访问目录数始终不超过 max_pending。
+        """
+        breadth_first = self.order == TraversalOrder.BREADTH_FIRST
+        by_size = self.order == TraversalOrder.SIZE_FIRST
+        counter = itertools.count()
+        fifo: Deque[_PendingEntry] = deque()
+        heap: List[Tuple[int, int, int, Path, DirectorySnapshot, int]] = []
+        # 尚未放入队列的子目录迭代器（溢出栈），栈顶优先
+        spilled: List[Iterator[_PendingEntry]] = [iter([(0, root_path, None)])]
+        self.peak_pending = 0
+
+        def take() -> Optional[Tuple[_PendingEntry, Optional[_ReadResult]]]:
+            while spilled:
+                item = next(spilled[-1], None)
+                if item is not None:
+                    return item, None
+                spilled.pop()
+            if heap:
+                _, depth, _, path, snapshot, device = heapq.heappop(heap)
+                return (depth, path, None), (snapshot, device)
+            if fifo:
+                return fifo.popleft(), None
+            return None
+
+        while True:
+            taken = take()
+            if taken is None:
+                return
+
+            (depth, current_path, identity), result = taken
+            if result is None:
+                result = read(current_path, identity)
+                if result is None:
+                    continue
+
+            snapshot, device = result
+            if is_match(snapshot):
+                yield snapshot
+                continue
+
+            if depth >= self.max_depth:
+                continue
+
+            children = self._child_entries(snapshot, device, depth + 1)
+            if not (breadth_first or by_size):
+                spilled.append(children)
+                continue
+
+            for child in children:
+                if len(fifo) + len(heap) >= self.max_pending:
+                    spilled.append(itertools.chain([child], children))
+                    break
+                if not by_size:
+                    fifo.append(child)
+                    continue
+                # 按子目录自身的条目数排序，需要先读取子目录
+                child_depth, child_path, child_identity = child
+                child_result = read(child_path, child_identity)
+                if child_result is not None:
+                    child_snapshot, child_device = child_result
+                    weight = len(child_snapshot.file_names) + len(
+                        child_snapshot.dir_names
+                    )
+                    heapq.heappush(
+                        heap,
+                        (
+                            weight,
+                            child_depth,
+                            next(counter),
+                            child_path,
+                            child_snapshot,
+                            child_device,
+                        ),
+                    )
+            self.peak_pending = max(self.peak_pending, len(fifo) + len(heap))
+
+    def _stat(self, path: Path) -> Optional[os.stat_result]:
+        """获取目录的 stat 结果（跟随符号链接），失败时记录警告并返回 None"""
+        try:
+            return os.stat(path)
+        except OSError as e:
+            logger.warning(f"无法访问目录: {path}, 错误: {e}")
+            return None
+
+    def _read(
+        self, path: Path, stat_result: Optional[os.stat_result] = None
+    ) -> Optional[DirectorySnapshot]:
+        """读取目录快照，失败时记录警告并返回 None"""
+        try:
+            return self.reader(path, stat_result)
+        except (OSError, PermissionError) as e:
+            logger.warning(f"无法访问目录: {path}, 错误: {e}")
+            return None
+
+    def _child_entries(
+        self, snapshot: DirectorySnapshot, device: int, depth: int
+    ) -> Iterator[_PendingEntry]:
+        """
+        按目录列表顺序产出需要继续遍历的子目录
+
+        普通子目录的身份由父目录的设备号和 DirEntry.inode() 组成；符号
+        链接和没有 DirEntry 的快照（来自扫描索引）身份未知，读取时 stat。
+        """
+        for name in snapshot.dir_names:
+            is_link = name in snapshot.link_names
+            if is_link and not self.follow_symlinks:
+                continue
+            child = snapshot.path / name
+            if self.skip_directory(child):
+                continue
+
+            identity = None
+            entry = snapshot.entries.get(name)
+            if entry is not None and not is_link:
+                try:
+                    identity = (device, entry.inode())
+                except OSError:
+                    pass
+            yield depth, child, identity
@@ -8,7 +8,9 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..utils.file_utils import DirectorySnapshot, SizeEstimate
 
 
 class ProjectType(Enum):
@@ -31,6 +33,7 @@ class DependencyType(Enum):
     DEVELOPMENT = "development"  # 开发依赖
     OPTIONAL = "optional"  # 可选依赖
     PEER = "peer"  # 同级依赖
+    TRANSITIVE = "transitive"  # 间接依赖（来自锁文件）
     GLOBAL = "global"  # 全局依赖
 
 
@@ -61,6 +64,77 @@ class DependencyInfo:
     size_bytes: int = 0  # 占用空间（字节）
     install_path: Optional[Path] = None  # 安装路径
     description: Optional[str] = None  # 描述
+    size_error_bytes: int = 0  # 估计大小的误差（95% 置信区间半宽）
+
+    def apply_size(self, estimate: SizeEstimate) -> None:
+        """设置大小及其误差"""
+        self.size_bytes = estimate.size_bytes
+        self.size_error_bytes = estimate.error_bytes
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可 JSON 序列化的字典"""
+        return {
+            "name": self.name,
+            "version": self.version,
+            "installed_version": self.installed_version,
+            "dependency_type": self.dependency_type.value,
+            "size_bytes": self.size_bytes,
+            "install_path": str(self.install_path) if self.install_path else None,
+            "description": self.description,
+            "size_error_bytes": self.size_error_bytes,
+        }
+
+    def to_compact(self) -> Tuple:
+        """转换为紧凑的可 pickle 元组，用于进程间传输"""
+        return (
+            self.name,
+            self.version,
+            self.installed_version,
+            self.dependency_type.value,
+            self.size_bytes,
+            str(self.install_path) if self.install_path else None,
+            self.description,
+            self.size_error_bytes,
+        )
+
+    @classmethod
+    def from_compact(cls, data: Tuple) -> "DependencyInfo":
+        """从 to_compact() 生成的元组恢复"""
+        (
+            name,
+            version,
+            installed,
+            dep_type,
+            size,
+            install_path,
+            description,
+            size_error,
+        ) = data
+        return cls(
+            name=name,
+            version=version,
+            installed_version=installed,
+            dependency_type=DependencyType(dep_type),
+            size_bytes=size,
+            install_path=Path(install_path) if install_path else None,
+            description=description,
+            size_error_bytes=size_error,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DependencyInfo":
+        """从 to_dict() 生成的字典恢复"""
+        install_path = data.get("install_path")
+        return cls(
+            name=data["name"],
+            version=data.get("version", ""),
+            installed_version=data.get("installed_version"),
+            dependency_type=DependencyType(data.get("dependency_type", "production")),
+            size_bytes=data.get("size_bytes", 0),
+            install_path=Path(install_path) if install_path else None,
+            description=data.get("description"),
+            size_error_bytes=data.get("size_error_bytes", 0),
+        )
 
 
 @dataclass
@@ -87,11 +161,84 @@ class ProjectInfo:
     dependencies: List[DependencyInfo]  # 依赖列表
     total_size_bytes: int = 0  # 总占用空间
     metadata: Dict[str, Any] = None  # 额外元数据
+    size_error_bytes: int = 0  # 估计总大小的误差（95% 置信区间半宽）
 
     def __post_init__(self):
         if self.metadata is None:
             self.metadata = {}
 
+    def apply_size(self, estimate: SizeEstimate) -> None:
+        """设置总大小及其误差"""
+        self.total_size_bytes = estimate.size_bytes
+        self.size_error_bytes = estimate.error_bytes
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可 JSON 序列化的字典"""
+        return {
+            "name": self.name,
+            "path": str(self.path),
+            "project_type": self.project_type.value,
+            "config_file": str(self.config_file) if self.config_file else None,
+            "dependencies": [dep.to_dict() for dep in self.dependencies],
+            "total_size_bytes": self.total_size_bytes,
+            "metadata": self.metadata,
+            "size_error_bytes": self.size_error_bytes,
+        }
+
+    def to_compact(self) -> Tuple:
+        """转换为紧凑的可 pickle 元组，用于进程间传输"""
+        return (
+            self.name,
+            str(self.path),
+            self.project_type.value,
+            str(self.config_file) if self.config_file else None,
+            tuple(dep.to_compact() for dep in self.dependencies),
+            self.total_size_bytes,
+            self.metadata,
+            self.size_error_bytes,
+        )
+
+    @classmethod
+    def from_compact(cls, data: Tuple) -> "ProjectInfo":
+        """从 to_compact() 生成的元组恢复"""
+        (
+            name,
+            path,
+            project_type,
+            config_file,
+            deps,
+            total_size,
+            metadata,
+            size_error,
+        ) = data
+        return cls(
+            name=name,
+            path=Path(path),
+            project_type=ProjectType(project_type),
+            config_file=Path(config_file) if config_file else None,
+            dependencies=[DependencyInfo.from_compact(dep) for dep in deps],
+            total_size_bytes=total_size,
+            metadata=metadata,
+            size_error_bytes=size_error,
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProjectInfo":
+        """从 to_dict() 生成的字典恢复"""
+        config_file = data.get("config_file")
+        return cls(
+            name=data["name"],
+            path=Path(data["path"]),
+            project_type=ProjectType(data["project_type"]),
+            config_file=Path(config_file) if config_file else None,
+            dependencies=[
+                DependencyInfo.from_dict(dep) for dep in data.get("dependencies", [])
+            ],
+            total_size_bytes=data.get("total_size_bytes", 0),
+            metadata=data.get("metadata") or {},
+            size_error_bytes=data.get("size_error_bytes", 0),
+        )
+
 
 class BaseParser(ABC):
     """基础解析器抽象类"""
@@ -106,6 +253,40 @@ class BaseParser(ABC):
     def config_files(self) -> List[str]:
         """返回该类型项目的配置文件名列表"""
 
+    @property
+    def lock_files(self) -> List[str]:
+        """返回锁文件及其他影响解析结果的文件名列表，用于判断项目是否需要重新解析"""
+        return []
+
+    @property
+    def install_directories(self) -> List[str]:
+        """返回项目内依赖安装目录名列表，用于判断项目是否需要重新解析"""
+        return []
+
+    @property
+    def marker_files(self) -> List[str]:
+        """返回用于识别项目的文件名列表，默认与配置文件相同"""
+        return [name for name in self.config_files if "*" not in name]
+
+    @property
+    def marker_extensions(self) -> List[str]:
+        """返回用于识别项目的文件扩展名列表（如 ".go"）"""
+        return [name[1:] for name in self.config_files if name.startswith("*.")]
+
+    def can_parse_snapshot(self, snapshot: DirectorySnapshot) -> bool:
+        """
+        基于目录快照判断是否可以解析，不产生额外的文件系统调用
+
+        Args:
+            snapshot: 目录快照
+
+        Returns:
+            是否可以解析
+        """
+        if any(snapshot.has_file(name) for name in self.marker_files):
+            return True
+        return any(snapshot.has_suffix(ext) for ext in self.marker_extensions)
+
     @abstractmethod
     def can_parse(self, project_path: Path) -> bool:
         """
@@ -130,6 +311,22 @@ class BaseParser(ABC):
             项目信息，解析失败时返回 None
         """
 
+    def parse_projects(self, project_path: Path) -> List[ProjectInfo]:
+        """
+        解析目录中的所有项目
+
+        默认只解析目录本身；工作区类项目可以重写此方法，同时返回
+        根项目和成员项目。
+
+        Args:
+            project_path: 项目路径
+
+        Returns:
+            项目信息列表，解析失败时为空列表
+        """
+        project_info = self.parse_project(project_path)
+        return [project_info] if project_info else []
+
     @abstractmethod
     def get_dependencies(self, project_info: ProjectInfo) -> List[DependencyInfo]:
         """
@@ -0,0 +1,197 @@
+"""
+Cargo registry index
+
+Index the crates unpacked under $CARGO_HOME/registry/src and downloaded
+under $CARGO_HOME/registry/cache once, so that every Rust project in a scan
+can look up the exact crate directory for a Cargo.lock version without
+globbing the registry again.
+"""
+
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# "<name>-<semver>": names may contain dashes, versions start with x.y.z
+_CRATE_DIR = re.compile(r"^(?P<name>.+?)-(?P<version>\d+\.\d+\.\d+(?:[-+].*)?)$")
+_CRATE_ARCHIVE_SUFFIX = ".crate"
+
+
+@dataclass
+class CrateLocation:
+    """Where one version of a crate lives in the Cargo registry"""
+
+    source_dir: Optional[Path] = None  # unpacked sources under registry/src
+    archive: Optional[Path] = None  # downloaded .crate under registry/cache
+    archive_bytes: int = 0
+
+    @property
+    def path(self) -> Optional[Path]:
+        """Preferred install path: the unpacked sources, else the archive"""
+        return self.source_dir or self.archive
+
+
+def get_cargo_home() -> Path:
+    """Return $CARGO_HOME, falling back to ~/.cargo"""
+    cargo_home = os.environ.get("CARGO_HOME")
+    if cargo_home:
+        return Path(cargo_home).expanduser()
+    return Path.home() / ".cargo"
+
+
+def split_crate_dir_name(name: str) -> Optional[Tuple[str, str]]:
+    """Split a registry entry name such as "serde-1.0.190" into (name, version)"""
+    match = _CRATE_DIR.match(name)
+    if match is None:
+        return None
+    return match.group("name"), match.group("version")
+
+
+def _version_key(version: str) -> Tuple:
+    """Sort key for semver strings; pre-releases sort before the release"""
+    core, _, build = version.partition("+")
+    release, dash, pre = core.partition("-")
+    numbers = []
+    for part in release.split("."):
+        numbers.append(int(part) if part.isdigit() else 0)
+    return (tuple(numbers), not dash, pre, build)
+
+
+class CargoRegistryIndex:
+    """
+    Crate name -> version -> location index of one Cargo home
+
+    The registry is listed lazily on the first lookup and the result is
+    shared by every caller until clear() is called.
+    """
+
+    def __init__(self, cargo_home: Optional[Path] = None):
+        self.cargo_home = cargo_home or get_cargo_home()
+        self._crates: Optional[Dict[str, Dict[str, CrateLocation]]] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    @property
+    def registry_dir(self) -> Path:
+        return self.cargo_home / "registry"
+
+    def _ensure_built(self) -> Dict[str, Dict[str, CrateLocation]]:
+        crates = self._crates
+        if crates is None:
+            with self._lock:
+                if self._crates is None:
+                    self._crates = self._build()
+                    self.builds += 1
+                crates = self._crates
+        return crates
+
+    def _build(self) -> Dict[str, Dict[str, CrateLocation]]:
+        """List registry/src and registry/cache once"""
+        crates: Dict[str, Dict[str, CrateLocation]] = {}
+
+        for entry in self._iter_registry_entries("src"):
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            parsed = split_crate_dir_name(entry.name)
+            if parsed is None:
+                continue
+            name, version = parsed
+            location = crates.setdefault(name, {}).setdefault(version, CrateLocation())
+            if location.source_dir is None:
+                location.source_dir = Path(entry.path)
+
+        for entry in self._iter_registry_entries("cache"):
+            if not entry.name.endswith(_CRATE_ARCHIVE_SUFFIX):
+                continue
+            parsed = split_crate_dir_name(entry.name[: -len(_CRATE_ARCHIVE_SUFFIX)])
+            if parsed is None:
+                continue
+            try:
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                archive_bytes = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                continue
+            name, version = parsed
+            location = crates.setdefault(name, {}).setdefault(version, CrateLocation())
+            if location.archive is None:
+                location.archive = Path(entry.path)
+                location.archive_bytes = archive_bytes
+
+        logger.debug(
+            f"Indexed {sum(len(v) for v in crates.values())} crate versions "
+            f"in {self.registry_dir}"
+        )
+        return crates
+
+    def _iter_registry_entries(self, section: str) -> Iterator[os.DirEntry]:
+        """Yield the entries of every registry under registry/<section>"""
+        try:
+            registries = [
+                entry.path
+                for entry in os.scandir(self.registry_dir / section)
+                if entry.is_dir()
+            ]
+        except OSError:
+            return
+
+        for registry in sorted(registries):
+            try:
+                with os.scandir(registry) as entries:
+                    yield from entries
+            except OSError as e:
+                logger.debug(f"Cannot list Cargo registry {registry}: {e}")
+
+    def versions(self, name: str) -> Dict[str, CrateLocation]:
+        """All indexed versions of a crate"""
+        return self._ensure_built().get(name, {})
+
+    def find(self, name: str, version: Optional[str] = None) -> Optional[CrateLocation]:
+        """
+        Look up a crate in the registry
+
+        Args:
+            name: crate name
+            version: exact version, usually from Cargo.lock; when omitted
+                the newest indexed version is returned
+
+        Returns:
+            The crate location, or None if that version is not present
+        """
+        versions = self.versions(name)
+        if not versions:
+            return None
+        if version:
+            return versions.get(version)
+        return versions[max(versions, key=_version_key)]
+
+    def clear(self) -> None:
+        """Drop the index; the next lookup lists the registry again"""
+        with self._lock:
+            self._crates = None
+
+
+_index: Optional[CargoRegistryIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_cargo_registry_index() -> CargoRegistryIndex:
+    """Return the process-wide index of the current Cargo home"""
+    global _index
+    cargo_home = get_cargo_home()
+    with _index_lock:
+        if _index is None or _index.cargo_home != cargo_home:
+            _index = CargoRegistryIndex(cargo_home)
+        return _index
+
+
+def clear_cargo_registry_index() -> None:
+    """Forget the indexed registry, e.g. at the start of a new scan"""
+    with _index_lock:
+        if _index is not None:
+            _index.clear()
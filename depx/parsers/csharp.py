@@ -5,12 +5,14 @@ Parse C# projects with .csproj, packages.config, and PackageReference files
 """
 
 import logging
+import os
 import re
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from xml.etree import ElementTree as ET
 
-from ..utils.file_utils import get_directory_size, safe_read_json
+from ..utils.file_utils import SizeEstimate, safe_read_json
+from ..utils.size_cache import get_cached_size_estimate
 from .base import (
     BaseParser,
     DependencyInfo,
@@ -18,9 +20,13 @@ from .base import (
     ProjectInfo,
     ProjectType,
 )
+from .nuget_packages import get_nuget_package_index, read_project_assets
 
 logger = logging.getLogger(__name__)
 
+# Project file extensions, in priority order
+PROJECT_FILE_EXTENSIONS = (".csproj", ".vbproj", ".fsproj")
+
 
 class CSharpParser(BaseParser):
     """C# project parser"""
@@ -40,35 +46,67 @@ class CSharpParser(BaseParser):
             "*.sln",
         ]
 
+    @property
+    def lock_files(self) -> List[str]:
+        return ["packages.lock.json", "global.json"]
+
+    @property
+    def install_directories(self) -> List[str]:
+        return ["packages", "bin", "obj"]
+
+    @property
+    def marker_files(self) -> List[str]:
+        return ["packages.config", "project.json"]
+
+    @property
+    def marker_extensions(self) -> List[str]:
+        return [".csproj", ".vbproj", ".fsproj", ".cs"]
+
     def can_parse(self, project_path: Path) -> bool:
         """Check if this is a C# project"""
-        # Check for project files
-        project_files = (
-            list(project_path.glob("*.csproj"))
-            + list(project_path.glob("*.vbproj"))
-            + list(project_path.glob("*.fsproj"))
+        project_files, has_sources = self._list_project_directory(project_path)
+        return (
+            bool(project_files) or has_sources or self._has_legacy_config(project_path)
         )
-        if project_files:
-            return True
 
-        # Check for packages.config
-        if (project_path / "packages.config").exists():
-            return True
+    def _has_legacy_config(self, project_path: Path) -> bool:
+        """Check for packages.config or project.json (legacy .NET Core)"""
+        return (project_path / "packages.config").exists() or (
+            project_path / "project.json"
+        ).exists()
 
-        # Check for project.json (legacy .NET Core)
-        if (project_path / "project.json").exists():
-            return True
+    def _list_project_directory(self, project_path: Path) -> Tuple[List[Path], bool]:
+        """
+        List the project directory once
 
-        # Check for C# source files
-        cs_files = list(project_path.glob("*.cs"))
-        if cs_files:
-            return True
+        Returns:
+            (project files ordered by PROJECT_FILE_EXTENSIONS, has .cs sources)
+        """
+        project_files: Dict[str, List[Path]] = {
+            extension: [] for extension in PROJECT_FILE_EXTENSIONS
+        }
+        has_sources = False
 
-        return False
+        try:
+            with os.scandir(project_path) as entries:
+                for entry in entries:
+                    extension = os.path.splitext(entry.name)[1]
+                    if extension in project_files:
+                        project_files[extension].append(Path(entry.path))
+                    elif extension == ".cs":
+                        has_sources = True
+        except OSError as e:
+            logger.debug(f"Cannot list project directory {project_path}: {e}")
+
+        ordered = []
+        for extension in PROJECT_FILE_EXTENSIONS:
+            ordered.extend(sorted(project_files[extension]))
+        return ordered, has_sources
 
     def parse_project(self, project_path: Path) -> Optional[ProjectInfo]:
         """Parse C# project information"""
-        if not self.can_parse(project_path):
+        project_files, has_sources = self._list_project_directory(project_path)
+        if not (project_files or has_sources or self._has_legacy_config(project_path)):
             return None
 
         # Find primary project file
@@ -76,12 +114,6 @@ class CSharpParser(BaseParser):
         config_file = None
 
         # Priority order for config files
-        project_files = (
-            list(project_path.glob("*.csproj"))
-            + list(project_path.glob("*.vbproj"))
-            + list(project_path.glob("*.fsproj"))
-        )
-
         if project_files:
             config_file = project_files[0]
             project_name = self._get_name_from_project_file(config_file) or project_name
@@ -100,9 +132,11 @@ class CSharpParser(BaseParser):
             config_file=config_file,
             dependencies=[],
             metadata={
-                "dotnet_version": self._detect_dotnet_version(project_path),
-                "framework": self._detect_framework(project_path),
-                "project_type": self._detect_project_type(project_path),
+                "dotnet_version": self._detect_dotnet_version(
+                    project_path, project_files
+                ),
+                "framework": self._detect_framework(project_path, project_files),
+                "project_type": self._detect_project_type(project_path, project_files),
                 "has_packages_folder": (project_path / "packages").exists(),
             },
         )
@@ -128,32 +162,120 @@ class CSharpParser(BaseParser):
         elif config_file.name == "project.json":
             dependencies.extend(self._parse_project_json(config_file))
 
+        assets_file = project_info.path / "obj" / "project.assets.json"
+        if assets_file.exists():
+            self._add_restored_packages(project_info, dependencies, assets_file)
+
         return dependencies
 
+    def _add_restored_packages(
+        self,
+        project_info: ProjectInfo,
+        dependencies: List[DependencyInfo],
+        assets_file: Path,
+    ) -> None:
+        """Merge the package graph resolved by restore (obj/project.assets.json)"""
+        assets = read_project_assets(assets_file)
+        if assets is None:
+            return
+
+        known = {dependency.name.lower(): dependency for dependency in dependencies}
+        for package in assets.packages:
+            dependency = known.get(package.name.lower())
+            if dependency is not None:
+                dependency.installed_version = package.version
+                continue
+            dependency = DependencyInfo(
+                name=package.name,
+                version=package.version,
+                installed_version=package.version,
+                dependency_type=(
+                    DependencyType.PRODUCTION
+                    if package.direct
+                    else DependencyType.TRANSITIVE
+                ),
+            )
+            known[package.name.lower()] = dependency
+            dependencies.append(dependency)
+
+        project_info.metadata["restored_packages"] = len(assets.packages)
+        if assets.package_folders:
+            project_info.metadata["package_folders"] = [
+                str(folder) for folder in assets.package_folders
+            ]
+
     def calculate_dependency_sizes(self, project_info: ProjectInfo) -> None:
         """Calculate C# dependency sizes"""
-        total_size = 0
+        total_size = SizeEstimate()
 
-        # Check packages folder (legacy NuGet)
+        # Check packages folder (legacy NuGet), listed once
         packages_dir = project_info.path / "packages"
+        legacy_packages: Dict[str, Path] = {}
         if packages_dir.exists():
-            packages_size = get_directory_size(packages_dir)
-            total_size += packages_size
+            total_size += get_cached_size_estimate(packages_dir)
+            legacy_packages = self._list_legacy_packages(packages_dir)
+
+        # Global packages folders used by restore, default ~/.nuget/packages
+        package_folders = [
+            Path(folder) for folder in project_info.metadata.get("package_folders", [])
+        ]
+        indexes = [get_nuget_package_index(folder) for folder in package_folders]
+        if not indexes:
+            indexes = [get_nuget_package_index()]
+
+        for dependency in project_info.dependencies:
+            version = dependency.installed_version or dependency.version
+            package_path = self._find_legacy_package(
+                legacy_packages, dependency.name, version
+            )
+            for index in indexes:
+                if package_path is not None:
+                    break
+                package_path = index.find(dependency.name, version)
 
-            # Update dependency sizes based on packages directory
-            for dependency in project_info.dependencies:
-                package_dirs = list(packages_dir.glob(f"{dependency.name}.*"))
-                if package_dirs:
-                    dependency.size_bytes = get_directory_size(package_dirs[0])
-                    dependency.install_path = package_dirs[0]
+            if package_path is not None:
+                dependency.apply_size(get_cached_size_estimate(package_path))
+                dependency.install_path = package_path
 
         # Check bin and obj directories
         for build_dir in ["bin", "obj"]:
             build_path = project_info.path / build_dir
             if build_path.exists():
-                total_size += get_directory_size(build_path)
+                total_size += get_cached_size_estimate(build_path)
 
-        project_info.total_size_bytes = total_size
+        project_info.apply_size(total_size)
+
+    def _list_legacy_packages(self, packages_dir: Path) -> Dict[str, Path]:
+        """Map lower-case "<id>.<version>" folder names in packages/ to paths"""
+        try:
+            with os.scandir(packages_dir) as entries:
+                return {
+                    entry.name.lower(): Path(entry.path)
+                    for entry in entries
+                    if entry.is_dir()
+                }
+        except OSError as e:
+            logger.debug(f"Cannot list packages folder {packages_dir}: {e}")
+            return {}
+
+    def _find_legacy_package(
+        self, legacy_packages: Dict[str, Path], name: str, version: str
+    ) -> Optional[Path]:
+        """Find "<id>.<version>" in packages/, or any version when unknown"""
+        if not legacy_packages:
+            return None
+        prefix = f"{name.lower()}."
+        if version:
+            exact = legacy_packages.get(f"{prefix}{version.lower()}")
+            if exact is not None:
+                return exact
+        for folder_name in sorted(legacy_packages):
+            if (
+                folder_name.startswith(prefix)
+                and folder_name[len(prefix) :][:1].isdigit()
+            ):
+                return legacy_packages[folder_name]
+        return None
 
     def _parse_project_file(self, project_file: Path) -> List[DependencyInfo]:
         """Parse .csproj/.vbproj/.fsproj file"""
@@ -277,7 +399,9 @@ class CSharpParser(BaseParser):
         # Fallback to filename without extension
         return project_file.stem
 
-    def _detect_dotnet_version(self, project_path: Path) -> Optional[str]:
+    def _detect_dotnet_version(
+        self, project_path: Path, project_files: Optional[List[Path]] = None
+    ) -> Optional[str]:
         """Detect .NET version"""
         # Check global.json
         global_json = project_path / "global.json"
@@ -290,11 +414,8 @@ class CSharpParser(BaseParser):
                     return version
 
         # Check project files for TargetFramework
-        project_files = (
-            list(project_path.glob("*.csproj"))
-            + list(project_path.glob("*.vbproj"))
-            + list(project_path.glob("*.fsproj"))
-        )
+        if project_files is None:
+            project_files, _ = self._list_project_directory(project_path)
 
         for project_file in project_files:
             try:
@@ -315,13 +436,12 @@ class CSharpParser(BaseParser):
 
         return None
 
-    def _detect_framework(self, project_path: Path) -> Optional[str]:
+    def _detect_framework(
+        self, project_path: Path, project_files: Optional[List[Path]] = None
+    ) -> Optional[str]:
         """Detect .NET framework type"""
-        project_files = (
-            list(project_path.glob("*.csproj"))
-            + list(project_path.glob("*.vbproj"))
-            + list(project_path.glob("*.fsproj"))
-        )
+        if project_files is None:
+            project_files, _ = self._list_project_directory(project_path)
 
         for project_file in project_files:
             try:
@@ -342,13 +462,13 @@ class CSharpParser(BaseParser):
 
         return None
 
-    def _detect_project_type(self, project_path: Path) -> str:
+    def _detect_project_type(
+        self, project_path: Path, project_files: Optional[List[Path]] = None
+    ) -> str:
         """Detect project type"""
-        if list(project_path.glob("*.csproj")):
-            return "C#"
-        elif list(project_path.glob("*.vbproj")):
-            return "VB.NET"
-        elif list(project_path.glob("*.fsproj")):
-            return "F#"
-        else:
-            return "Unknown"
+        if project_files is None:
+            project_files, _ = self._list_project_directory(project_path)
+        languages = {".csproj": "C#", ".vbproj": "VB.NET", ".fsproj": "F#"}
+        if project_files:
+            return languages[project_files[0].suffix]
+        return "Unknown"
@@ -6,11 +6,11 @@ Parse Go projects with go.mod and go.sum files
 
 import logging
 import re
-import subprocess
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from ..utils.file_utils import get_directory_size
+from ..utils.file_utils import SizeEstimate
+from ..utils.size_cache import get_cached_size_estimate
 from ..utils.toml_utils import safe_load_toml
 from .base import (
     BaseParser,
@@ -19,6 +19,7 @@ from .base import (
     ProjectInfo,
     ProjectType,
 )
+from .go_modcache import get_go_module_cache
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +35,18 @@ class GoParser(BaseParser):
     def config_files(self) -> List[str]:
         return ["go.mod", "go.sum", "Gopkg.toml", "vendor.json"]
 
+    @property
+    def install_directories(self) -> List[str]:
+        return ["vendor"]
+
+    @property
+    def marker_files(self) -> List[str]:
+        return ["go.mod", "Gopkg.toml", "vendor.json"]
+
+    @property
+    def marker_extensions(self) -> List[str]:
+        return [".go"]
+
     def can_parse(self, project_path: Path) -> bool:
         """Check if this is a Go project"""
         # Primary check: go.mod file
@@ -111,6 +124,9 @@ class GoParser(BaseParser):
 
         if config_file.name == "go.mod":
             dependencies.extend(self._parse_go_mod(config_file))
+            go_sum = project_info.path / "go.sum"
+            if go_sum.exists():
+                self._add_go_sum_modules(project_info, dependencies, go_sum)
         elif config_file.name == "Gopkg.toml":
             dependencies.extend(self._parse_gopkg_toml(config_file))
 
@@ -118,84 +134,133 @@ class GoParser(BaseParser):
 
     def calculate_dependency_sizes(self, project_info: ProjectInfo) -> None:
         """Calculate Go dependency sizes"""
-        total_size = 0
+        total_size = SizeEstimate()
 
-        # Check vendor directory
+        # Vendored copies take precedence over the module cache
         vendor_dir = project_info.path / "vendor"
         if vendor_dir.exists():
-            vendor_size = get_directory_size(vendor_dir)
-            total_size += vendor_size
-
-            # Update dependency sizes based on vendor directory
-            for dependency in project_info.dependencies:
-                vendor_path = vendor_dir / dependency.name
-                if vendor_path.exists():
-                    dependency.size_bytes = get_directory_size(vendor_path)
-                    dependency.install_path = vendor_path
-
-        # Check Go module cache
-        go_cache = self._get_go_cache_dir()
-        if go_cache and go_cache.exists():
-            for dependency in project_info.dependencies:
-                # Go modules are stored in a specific format in cache
-                cache_path = self._find_module_in_cache(dependency.name, go_cache)
-                if cache_path:
-                    dependency.size_bytes = get_directory_size(cache_path)
-                    dependency.install_path = cache_path
-
-        project_info.total_size_bytes = total_size
+            total_size += get_cached_size_estimate(vendor_dir)
+
+        module_cache = get_go_module_cache()
+        for dependency in project_info.dependencies:
+            vendor_path = vendor_dir / dependency.name
+            if vendor_path.exists():
+                dependency.apply_size(get_cached_size_estimate(vendor_path))
+                dependency.install_path = vendor_path
+                continue
+
+            version = dependency.installed_version or dependency.version
+            cache_path = module_cache.find(dependency.name, version)
+            if cache_path:
+                dependency.apply_size(get_cached_size_estimate(cache_path))
+                dependency.install_path = cache_path
+
+        project_info.apply_size(total_size)
 
     def _parse_go_mod(self, go_mod_file: Path) -> List[DependencyInfo]:
-        """Parse go.mod file"""
+        """Parse the require directives of go.mod, block and single-line forms"""
         dependencies = []
 
         try:
             with open(go_mod_file, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            # Parse require block
-            require_pattern = r"require\s*\(\s*(.*?)\s*\)"
-            require_match = re.search(require_pattern, content, re.DOTALL)
-
-            if require_match:
-                require_block = require_match.group(1)
-                # Parse individual requirements
-                req_pattern = r"([^\s]+)\s+([^\s]+)(?:\s+//\s*indirect)?"
-                for match in re.finditer(req_pattern, require_block):
-                    module_path = match.group(1)
-                    version = match.group(2)
-                    is_indirect = "indirect" in match.group(0)
+                lines = f.readlines()
+        except Exception as e:
+            logger.warning(f"Failed to parse go.mod: {go_mod_file}, error: {e}")
+            return dependencies
 
-                    dep_type = (
+        block = None
+        for line in lines:
+            code, _, comment = line.partition("//")
+            fields = code.split()
+            if not fields:
+                continue
+
+            if block is not None:
+                if fields[0] == ")":
+                    block = None
+                    continue
+                if block != "require":
+                    continue
+            elif fields[0] == "require":
+                if fields[1:] == ["("]:
+                    block = "require"
+                    continue
+                fields = fields[1:]
+            else:
+                if len(fields) > 1 and fields[-1] == "(":
+                    block = fields[0]
+                continue
+
+            if len(fields) < 2:
+                continue
+            is_indirect = comment.strip().startswith("indirect")
+            dependencies.append(
+                DependencyInfo(
+                    name=fields[0].strip('"'),
+                    version=fields[1],
+                    dependency_type=(
                         DependencyType.OPTIONAL
                         if is_indirect
                         else DependencyType.PRODUCTION
-                    )
+                    ),
+                )
+            )
 
-                    dep_info = DependencyInfo(
-                        name=module_path,
-                        version=version,
-                        dependency_type=dep_type,
-                    )
-                    dependencies.append(dep_info)
+        return dependencies
 
-            # Also parse single-line requires
-            single_require_pattern = r"require\s+([^\s]+)\s+([^\s]+)"
-            for match in re.finditer(single_require_pattern, content):
-                module_path = match.group(1)
-                version = match.group(2)
+    def _parse_go_sum(self, go_sum_file: Path) -> Dict[str, List[str]]:
+        """
+        Parse go.sum into module -> versions with extracted sources
 
-                dep_info = DependencyInfo(
-                    name=module_path,
-                    version=version,
-                    dependency_type=DependencyType.PRODUCTION,
-                )
-                dependencies.append(dep_info)
+        Lines ending in "/go.mod" only record a downloaded go.mod used for
+        module graph resolution, so they are skipped.
+        """
+        modules: Dict[str, List[str]] = {}
 
+        try:
+            with open(go_sum_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    fields = line.split()
+                    if len(fields) != 3 or fields[1].endswith("/go.mod"):
+                        continue
+                    versions = modules.setdefault(fields[0], [])
+                    if fields[1] not in versions:
+                        versions.append(fields[1])
         except Exception as e:
-            logger.warning(f"Failed to parse go.mod: {go_mod_file}, error: {e}")
+            logger.warning(f"Failed to parse go.sum: {go_sum_file}, error: {e}")
+
+        return modules
+
+    def _add_go_sum_modules(
+        self,
+        project_info: ProjectInfo,
+        dependencies: List[DependencyInfo],
+        go_sum_file: Path,
+    ) -> None:
+        """Pin go.mod requirements and append the transitive modules of go.sum"""
+        modules = self._parse_go_sum(go_sum_file)
+        required = {dependency.name for dependency in dependencies}
+
+        for dependency in dependencies:
+            if dependency.version in modules.get(dependency.name, []):
+                dependency.installed_version = dependency.version
+
+        for module, versions in modules.items():
+            if module in required:
+                continue
+            # go.sum keeps superseded versions; minimal version selection
+            # picks the highest one
+            version = max(versions, key=_module_version_key)
+            dependencies.append(
+                DependencyInfo(
+                    name=module,
+                    version=version,
+                    installed_version=version,
+                    dependency_type=DependencyType.TRANSITIVE,
+                )
+            )
 
-        return dependencies
+        project_info.metadata["go_sum_modules"] = len(modules)
 
     def _parse_gopkg_toml(self, gopkg_file: Path) -> List[DependencyInfo]:
         """Parse Gopkg.toml file (legacy dep tool)"""
@@ -293,41 +358,10 @@ class GoParser(BaseParser):
         else:
             return "unknown"
 
-    def _get_go_cache_dir(self) -> Optional[Path]:
-        """Get Go module cache directory"""
-        try:
-            result = subprocess.run(
-                ["go", "env", "GOMODCACHE"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            if result.returncode == 0:
-                return Path(result.stdout.strip())
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-
-        # Fallback to default location
-        default_cache = Path.home() / "go" / "pkg" / "mod"
-        if default_cache.exists():
-            return default_cache
-
-        return None
 
-    def _find_module_in_cache(
-        self, module_name: str, cache_dir: Path
-    ) -> Optional[Path]:
-        """Find module in Go cache directory"""
-        # Go modules are stored with encoded names
-        # This is a simplified implementation
-        try:
-            # Convert module name to cache path format
-            parts = module_name.split("/")
-            if len(parts) >= 2:
-                cache_path = cache_dir / parts[0] / "/".join(parts[1:])
-                if cache_path.exists():
-                    return cache_path
-        except Exception:
-            pass
-
-        return None
+def _module_version_key(version: str) -> Tuple:
+    """Sort key for module versions (v1.2.3, v1.2.3-pre, v2.0.0+incompatible)"""
+    core = version.lstrip("v").split("+", 1)[0]
+    release, dash, pre = core.partition("-")
+    numbers = tuple(int(part) if part.isdigit() else 0 for part in release.split("."))
+    return (numbers, not dash, pre)
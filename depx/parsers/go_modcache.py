@@ -0,0 +1,179 @@
+"""
+Go module cache index
+
+Locate $GOMODCACHE from the environment and the go env file, without
+running "go env", and index the extracted modules in it once by
+module@version. Module paths and versions are stored case-escaped on
+disk ("github.com/!azure/azure-sdk-for-go@v1.0.0"); the index is keyed by
+the unescaped form used in go.mod and go.sum.
+"""
+
+import logging
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Download cache inside GOMODCACHE, not extracted modules
+_DOWNLOAD_DIR = "cache"
+
+
+def escape_module_path(path: str) -> str:
+    """Escape upper-case letters as "!" + lower-case, as the module cache does"""
+    return "".join(f"!{char.lower()}" if char.isupper() else char for char in path)
+
+
+def unescape_module_path(path: str) -> str:
+    """Reverse escape_module_path"""
+    result = []
+    escaped = False
+    for char in path:
+        if char == "!":
+            escaped = True
+            continue
+        result.append(char.upper() if escaped else char)
+        escaped = False
+    return "".join(result)
+
+
+def _read_go_env_file() -> Dict[str, str]:
+    """Read the settings written by "go env -w" ($GOENV or <config dir>/go/env)"""
+    env_file = os.environ.get("GOENV")
+    if env_file == "off":
+        return {}
+    if not env_file:
+        if sys.platform == "win32":
+            config_dir = os.environ.get("APPDATA", "")
+        elif sys.platform == "darwin":
+            config_dir = str(Path.home() / "Library" / "Application Support")
+        else:
+            config_dir = os.environ.get("XDG_CONFIG_HOME") or str(
+                Path.home() / ".config"
+            )
+        if not config_dir:
+            return {}
+        env_file = str(Path(config_dir) / "go" / "env")
+
+    settings = {}
+    try:
+        with open(env_file, "r", encoding="utf-8") as f:
+            for line in f:
+                key, sep, value = line.strip().partition("=")
+                if sep and key and not key.startswith("#"):
+                    settings[key] = value
+    except OSError:
+        pass
+    return settings
+
+
+def _go_setting(name: str, go_env: Dict[str, str]) -> str:
+    """An environment variable wins over the go env file, as in the go command"""
+    return os.environ.get(name) or go_env.get(name, "")
+
+
+def get_gomodcache() -> Path:
+    """
+    Resolve the module cache directory the way the go command does
+
+    GOMODCACHE, else the first GOPATH entry + /pkg/mod, else ~/go/pkg/mod.
+    """
+    go_env = _read_go_env_file()
+    modcache = _go_setting("GOMODCACHE", go_env)
+    if modcache:
+        return Path(modcache).expanduser()
+
+    gopath = _go_setting("GOPATH", go_env)
+    entries = [entry for entry in gopath.split(os.pathsep) if entry]
+    root = Path(entries[0]).expanduser() if entries else Path.home() / "go"
+    return root / "pkg" / "mod"
+
+
+class GoModuleCache:
+    """
+    module@version -> directory index of one module cache
+
+    The cache is walked lazily on the first lookup. The walk stops at each
+    module root (a directory whose name contains "@"), so module contents
+    are never listed.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or get_gomodcache()
+        self._modules: Optional[Dict[str, Path]] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def _ensure_built(self) -> Dict[str, Path]:
+        modules = self._modules
+        if modules is None:
+            with self._lock:
+                if self._modules is None:
+                    self._modules = dict(self._walk())
+                    self.builds += 1
+                    logger.debug(f"Indexed {len(self._modules)} modules in {self.root}")
+                modules = self._modules
+        return modules
+
+    def _walk(self) -> Iterator[Tuple[str, Path]]:
+        pending: List[Tuple[str, str]] = [(str(self.root), "")]
+        while pending:
+            directory, prefix = pending.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    subdirectories = [
+                        entry
+                        for entry in entries
+                        if entry.is_dir(follow_symlinks=False)
+                    ]
+            except OSError as e:
+                logger.debug(f"Cannot list module cache {directory}: {e}")
+                continue
+
+            for entry in subdirectories:
+                if not prefix and entry.name == _DOWNLOAD_DIR:
+                    continue
+                relative = f"{prefix}{entry.name}"
+                if "@" in entry.name:
+                    yield unescape_module_path(relative), Path(entry.path)
+                else:
+                    pending.append((entry.path, f"{relative}/"))
+
+    def find(self, module: str, version: str) -> Optional[Path]:
+        """Directory of module@version, or None if it is not extracted"""
+        return self._ensure_built().get(f"{module}@{version}")
+
+    def __len__(self) -> int:
+        return len(self._ensure_built())
+
+    def clear(self) -> None:
+        """Drop the index; the next lookup walks the cache again"""
+        with self._lock:
+            self._modules = None
+
+
+_cache: Optional[GoModuleCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_go_module_cache() -> GoModuleCache:
+    """
+    Return the process-wide module cache index
+
+    The cache location is resolved once and kept until
+    clear_go_module_cache() is called.
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = GoModuleCache(get_gomodcache())
+        return _cache
+
+
+def clear_go_module_cache() -> None:
+    """Forget the cache location and index, e.g. at the start of a new scan"""
+    global _cache
+    with _cache_lock:
+        _cache = None
@@ -5,12 +5,14 @@ Parse Java projects with Maven (pom.xml) and Gradle (build.gradle)
 """
 
 import logging
+import os
 import re
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from xml.etree import ElementTree as ET
 
-from ..utils.file_utils import get_directory_size
+from ..utils.file_utils import SizeEstimate
+from ..utils.size_cache import get_cached_size_estimate
 from .base import (
     BaseParser,
     DependencyInfo,
@@ -18,6 +20,12 @@ from .base import (
     ProjectInfo,
     ProjectType,
 )
+from .maven_repository import (
+    get_maven_local_repository,
+    get_maven_repository,
+    read_gradle_lockfile,
+    read_verification_metadata,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +46,14 @@ class JavaParser(BaseParser):
             "gradle.properties",
         ]
 
+    @property
+    def lock_files(self) -> List[str]:
+        return ["gradle.lockfile"]
+
+    @property
+    def install_directories(self) -> List[str]:
+        return ["target", "build"]
+
     def can_parse(self, project_path: Path) -> bool:
         """Check if this is a Java project"""
         for config_file in self.config_files:
@@ -99,47 +115,98 @@ class JavaParser(BaseParser):
 
         if config_file.name == "pom.xml":
             dependencies.extend(self._parse_maven_dependencies(config_file))
+            self._add_resolved_maven_dependencies(project_info, dependencies)
         elif config_file.name.startswith("build.gradle"):
             dependencies.extend(self._parse_gradle_dependencies(config_file))
+            self._add_locked_gradle_dependencies(project_info, dependencies)
 
         return dependencies
 
+    def _add_resolved_maven_dependencies(
+        self, project_info: ProjectInfo, dependencies: List[DependencyInfo]
+    ) -> None:
+        """Resolve the transitive closure offline from the local Maven repository"""
+        artifacts = get_maven_repository().resolve(project_info.config_file)
+        if not artifacts:
+            return
+
+        self._merge_pinned_artifacts(
+            dependencies,
+            [(artifact.name, artifact.version) for artifact in artifacts],
+        )
+        project_info.metadata["resolved_artifacts"] = len(artifacts)
+
+    def _add_locked_gradle_dependencies(
+        self, project_info: ProjectInfo, dependencies: List[DependencyInfo]
+    ) -> None:
+        """Add the artifacts pinned by gradle.lockfile or verification metadata"""
+        lockfile = project_info.path / "gradle.lockfile"
+        metadata_file = project_info.path / "gradle" / "verification-metadata.xml"
+
+        if lockfile.exists():
+            pinned = [
+                (f"{group}:{artifact}", version)
+                for group, artifact, version, _ in read_gradle_lockfile(lockfile)
+            ]
+            source = lockfile.name
+        elif metadata_file.exists():
+            pinned = [
+                (f"{group}:{artifact}", version)
+                for group, artifact, version in read_verification_metadata(
+                    metadata_file
+                )
+            ]
+            source = metadata_file.name
+        else:
+            return
+
+        self._merge_pinned_artifacts(dependencies, pinned)
+        project_info.metadata["lockfile"] = source
+        project_info.metadata["resolved_artifacts"] = len(pinned)
+
+    def _merge_pinned_artifacts(
+        self, dependencies: List[DependencyInfo], pinned: List[Tuple[str, str]]
+    ) -> None:
+        """Set versions of direct dependencies and append the transitive ones"""
+        known = {dependency.name: dependency for dependency in dependencies}
+        for name, version in pinned:
+            dependency = known.get(name)
+            if dependency is None:
+                dependency = DependencyInfo(
+                    name=name,
+                    version=version,
+                    installed_version=version or None,
+                    dependency_type=DependencyType.TRANSITIVE,
+                )
+                known[name] = dependency
+                dependencies.append(dependency)
+            elif version and not dependency.installed_version:
+                dependency.installed_version = version
+
     def calculate_dependency_sizes(self, project_info: ProjectInfo) -> None:
         """Calculate Java dependency sizes"""
-        # Look for Maven/Gradle cache directories
-        cache_dirs = []
-
-        # Maven local repository
-        maven_repo = Path.home() / ".m2" / "repository"
-        if maven_repo.exists():
-            cache_dirs.append(maven_repo)
-
-        # Gradle cache
-        gradle_cache = Path.home() / ".gradle" / "caches"
-        if gradle_cache.exists():
-            cache_dirs.append(gradle_cache)
-
-        # Project-specific build directories
-        build_dirs = [
-            project_info.path / "target",  # Maven
-            project_info.path / "build",  # Gradle
-        ]
-
-        total_size = 0
+        # Maven local repository and Gradle module cache
+        maven_repo = self._get_maven_repository()
+        gradle_files = self._get_gradle_files_cache()
 
         for dependency in project_info.dependencies:
-            # Try to find dependency in cache directories
-            for cache_dir in cache_dirs:
-                if self._find_dependency_in_cache(dependency, cache_dir):
-                    break
-
-            # Check build directories
-            for build_dir in build_dirs:
-                if build_dir.exists():
-                    size = get_directory_size(build_dir)
-                    total_size += size
-
-        project_info.total_size_bytes = total_size
+            size = SizeEstimate()
+            for artifact_dir in self._find_dependency_in_cache(
+                dependency, maven_repo, gradle_files
+            ):
+                size += get_cached_size_estimate(artifact_dir)
+                if dependency.install_path is None:
+                    dependency.install_path = artifact_dir
+            dependency.apply_size(size)
+
+        # Project-specific build directories, sized once per project
+        total_size = SizeEstimate()
+        for build_dir in self.install_directories:
+            build_path = project_info.path / build_dir
+            if build_path.exists():
+                total_size += get_cached_size_estimate(build_path)
+
+        project_info.apply_size(total_size)
 
     def _parse_maven_dependencies(self, pom_file: Path) -> List[DependencyInfo]:
         """Parse Maven pom.xml dependencies"""
@@ -290,10 +357,46 @@ class JavaParser(BaseParser):
         """Check if project has wrapper scripts"""
         return (project_path / "mvnw").exists() or (project_path / "gradlew").exists()
 
+    def _get_maven_repository(self) -> Path:
+        """Get the Maven local repository (~/.m2/repository)"""
+        return get_maven_local_repository()
+
+    def _get_gradle_files_cache(self) -> Path:
+        """Get the Gradle module cache ($GRADLE_USER_HOME or ~/.gradle)"""
+        gradle_home = os.environ.get("GRADLE_USER_HOME")
+        gradle_dir = Path(gradle_home) if gradle_home else Path.home() / ".gradle"
+        return gradle_dir / "caches" / "modules-2" / "files-2.1"
+
     def _find_dependency_in_cache(
-        self, dependency: DependencyInfo, cache_dir: Path
-    ) -> bool:
-        """Find dependency in cache directory"""
-        # This is a simplified implementation
-        # In practice, you'd want more sophisticated cache lookup
-        return False
+        self, dependency: DependencyInfo, maven_repo: Path, gradle_files: Path
+    ) -> List[Path]:
+        """
+        Find the cached artifact directories of a dependency
+
+        The directories are computed straight from the coordinates:
+        <repo>/<group path>/<artifact>/<version> for Maven and
+        files-2.1/<group>/<artifact>/<version> for Gradle.
+        """
+        coordinates = self._split_coordinates(dependency)
+        if coordinates is None:
+            return []
+
+        group_id, artifact_id, version = coordinates
+        candidates = [
+            maven_repo.joinpath(*group_id.split("."), artifact_id, version),
+            gradle_files / group_id / artifact_id / version,
+        ]
+        return [candidate for candidate in candidates if candidate.is_dir()]
+
+    def _split_coordinates(
+        self, dependency: DependencyInfo
+    ) -> Optional[Tuple[str, str, str]]:
+        """Split a dependency into (groupId, artifactId, version)"""
+        parts = dependency.name.split(":")
+        version = (dependency.installed_version or dependency.version or "").strip()
+        if len(parts) != 2 or not all(parts):
+            return None
+        # Property placeholders, ranges and dynamic versions have no fixed path
+        if not version or any(char in version for char in "${[(,+"):
+            return None
+        return parts[0], parts[1], version
@@ -0,0 +1,634 @@
+"""
+Offline Maven dependency resolution
+
+Resolve the transitive dependencies of a Maven project from the POMs that
+are already in the local repository (~/.m2/repository), without running
+the build tool. Parent POMs, properties, dependencyManagement (including
+imported BOMs), scopes, optional dependencies and exclusions are applied
+the way Maven does, with "nearest definition wins" conflict resolution.
+
+Parsed POMs are memoised in a process-wide repository object shared by
+every project in a scan. The module also reads the artifacts pinned by
+Gradle's gradle.lockfile and gradle/verification-metadata.xml.
+"""
+
+import logging
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+from xml.etree import ElementTree as ET
+
+logger = logging.getLogger(__name__)
+
+# (groupId, artifactId)
+ArtifactKey = Tuple[str, str]
+
+# Guards against cyclic parents and runaway graphs
+MAX_PARENT_DEPTH = 32
+MAX_RESOLVED_ARTIFACTS = 10000
+
+_PROPERTY = re.compile(r"\$\{([^}]+)\}")
+_MAX_INTERPOLATION_PASSES = 10
+
+# Scope of a transitive dependency, by (scope of the path so far, declared scope)
+_TRANSITIVE_SCOPES = {
+    ("compile", "compile"): "compile",
+    ("compile", "runtime"): "runtime",
+    ("runtime", "compile"): "runtime",
+    ("runtime", "runtime"): "runtime",
+    ("provided", "compile"): "provided",
+    ("provided", "runtime"): "provided",
+    ("test", "compile"): "test",
+    ("test", "runtime"): "test",
+}
+
+
+@dataclass
+class PomDependency:
+    """A <dependency> element"""
+
+    group_id: str
+    artifact_id: str
+    version: str = ""
+    scope: str = ""
+    type: str = "jar"
+    optional: bool = False
+    exclusions: FrozenSet[ArtifactKey] = frozenset()
+
+    @property
+    def key(self) -> ArtifactKey:
+        return self.group_id, self.artifact_id
+
+
+@dataclass
+class RawPom:
+    """The contents of one pom.xml, before inheritance and interpolation"""
+
+    group_id: str = ""
+    artifact_id: str = ""
+    version: str = ""
+    parent: Optional[Tuple[str, str, str]] = None
+    parent_relative_path: Optional[str] = None
+    properties: Dict[str, str] = field(default_factory=dict)
+    dependencies: List[PomDependency] = field(default_factory=list)
+    managed: List[PomDependency] = field(default_factory=list)
+
+
+@dataclass
+class EffectivePom:
+    """A POM with its parents merged and properties interpolated"""
+
+    group_id: str
+    artifact_id: str
+    version: str
+    properties: Dict[str, str]
+    dependencies: List[PomDependency]
+    managed: Dict[ArtifactKey, PomDependency]
+    # Inherited declarations before interpolation, so that a child POM can
+    # interpolate them with its own properties the way Maven does
+    declared_dependencies: List[PomDependency] = field(default_factory=list)
+    declared_managed: List[PomDependency] = field(default_factory=list)
+
+
+@dataclass
+class ResolvedArtifact:
+    """One artifact of a resolved dependency graph"""
+
+    group_id: str
+    artifact_id: str
+    version: str
+    scope: str
+    depth: int  # 1 for direct dependencies
+
+    @property
+    def name(self) -> str:
+        return f"{self.group_id}:{self.artifact_id}"
+
+
+def get_maven_local_repository() -> Path:
+    """Return the Maven local repository (~/.m2/repository)"""
+    return Path.home() / ".m2" / "repository"
+
+
+def _local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _children(element: Optional[ET.Element], name: str) -> List[ET.Element]:
+    if element is None:
+        return []
+    return [child for child in element if _local_name(child.tag) == name]
+
+
+def _child(element: Optional[ET.Element], name: str) -> Optional[ET.Element]:
+    children = _children(element, name)
+    return children[0] if children else None
+
+
+def _text(element: Optional[ET.Element], name: str) -> str:
+    child = _child(element, name)
+    if child is None or child.text is None:
+        return ""
+    return child.text.strip()
+
+
+def _parse_dependency(element: ET.Element) -> Optional[PomDependency]:
+    group_id = _text(element, "groupId")
+    artifact_id = _text(element, "artifactId")
+    if not group_id or not artifact_id:
+        return None
+
+    exclusions = frozenset(
+        (_text(exclusion, "groupId") or "*", _text(exclusion, "artifactId") or "*")
+        for exclusion in _children(_child(element, "exclusions"), "exclusion")
+    )
+    return PomDependency(
+        group_id=group_id,
+        artifact_id=artifact_id,
+        version=_text(element, "version"),
+        scope=_text(element, "scope"),
+        type=_text(element, "type") or "jar",
+        optional=_text(element, "optional").lower() == "true",
+        exclusions=exclusions,
+    )
+
+
+def parse_pom(pom_file: Path) -> Optional[RawPom]:
+    """
+    Parse a pom.xml without resolving anything
+
+    Returns:
+        The raw POM, or None if the file is missing or malformed
+    """
+    try:
+        root = ET.parse(pom_file).getroot()
+    except (ET.ParseError, OSError) as e:
+        logger.debug(f"Failed to parse POM: {pom_file}, error: {e}")
+        return None
+
+    pom = RawPom(
+        group_id=_text(root, "groupId"),
+        artifact_id=_text(root, "artifactId"),
+        version=_text(root, "version"),
+    )
+
+    parent = _child(root, "parent")
+    if parent is not None:
+        pom.parent = (
+            _text(parent, "groupId"),
+            _text(parent, "artifactId"),
+            _text(parent, "version"),
+        )
+        relative_path = _child(parent, "relativePath")
+        if relative_path is not None:
+            pom.parent_relative_path = (relative_path.text or "").strip()
+
+    for properties in _children(root, "properties"):
+        for prop in properties:
+            pom.properties[_local_name(prop.tag)] = (prop.text or "").strip()
+
+    for element in _children(_child(root, "dependencies"), "dependency"):
+        dependency = _parse_dependency(element)
+        if dependency is not None:
+            pom.dependencies.append(dependency)
+
+    management = _child(_child(root, "dependencyManagement"), "dependencies")
+    for element in _children(management, "dependency"):
+        dependency = _parse_dependency(element)
+        if dependency is not None:
+            pom.managed.append(dependency)
+
+    return pom
+
+
+def _interpolate(value: str, properties: Dict[str, str]) -> str:
+    """Replace ${...} references; unknown properties are left in place"""
+    for _ in range(_MAX_INTERPOLATION_PASSES):
+        if "${" not in value:
+            break
+        replaced = _PROPERTY.sub(
+            lambda match: properties.get(match.group(1), match.group(0)), value
+        )
+        if replaced == value:
+            break
+        value = replaced
+    return value
+
+
+def _exact_version(version: str) -> str:
+    """Pin a hard requirement such as "[1.2.3]"; other ranges are unresolved"""
+    if version.startswith("[") and version.endswith("]") and "," not in version:
+        return version[1:-1].strip()
+    return version
+
+
+def _is_resolved(version: str) -> bool:
+    return bool(version) and "${" not in version and version[0] not in "[("
+
+
+def _is_excluded(key: ArtifactKey, exclusions: FrozenSet[ArtifactKey]) -> bool:
+    group_id, artifact_id = key
+    return (
+        key in exclusions
+        or (group_id, "*") in exclusions
+        or ("*", artifact_id) in exclusions
+        or ("*", "*") in exclusions
+    )
+
+
+def _merge_declarations(
+    inherited: List[PomDependency], declared: List[PomDependency]
+) -> List[PomDependency]:
+    """Inherited declarations first, each replaced in place by a redeclaration"""
+    merged: Dict[ArtifactKey, PomDependency] = {d.key: d for d in inherited}
+    for dependency in declared:
+        merged[dependency.key] = dependency
+    return list(merged.values())
+
+
+class MavenRepository:
+    """
+    Read-only view of a Maven local repository
+
+    Raw and effective POMs are memoised by path, so a parent or BOM shared
+    by many projects is parsed once. POMs are parsed and merged outside the
+    lock; a thread asking for a POM that another thread is building waits
+    for that result instead of building it again.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or get_maven_local_repository()
+        self._raw: Dict[Path, Optional[RawPom]] = {}
+        self._effective: Dict[Path, Optional[EffectivePom]] = {}
+        self._lock = threading.Lock()
+        # (kind, path) -> (event set when done, id of the building thread)
+        self._pending: Dict[Tuple[str, Path], Tuple[threading.Event, int]] = {}
+        # thread id -> (kind, path) the thread is waiting for
+        self._waiting: Dict[int, Tuple[str, Path]] = {}
+        self.parses = 0
+
+    def pom_path(self, group_id: str, artifact_id: str, version: str) -> Path:
+        """Path of <artifact>-<version>.pom in the repository"""
+        return self.root.joinpath(
+            *group_id.split("."), artifact_id, version, f"{artifact_id}-{version}.pom"
+        )
+
+    def load(self, pom_file: Path) -> Optional[RawPom]:
+        """Parse a POM once"""
+        return self._once(self._raw, "raw", pom_file, lambda: self._parse(pom_file))
+
+    def _parse(self, pom_file: Path) -> Optional[RawPom]:
+        pom = parse_pom(pom_file) if pom_file.is_file() else None
+        with self._lock:
+            self.parses += 1
+        return pom
+
+    def effective_pom(self, pom_file: Path) -> Optional[EffectivePom]:
+        """Merge a POM with its parents and interpolate its properties"""
+        return self._effective_pom(pom_file, 0)
+
+    def _effective_pom(self, pom_file: Path, depth: int) -> Optional[EffectivePom]:
+        return self._once(
+            self._effective,
+            "effective",
+            pom_file,
+            lambda: self._build_effective_pom(pom_file, depth),
+        )
+
+    def _once(
+        self,
+        cache: Dict[Path, Any],
+        kind: str,
+        pom_file: Path,
+        build: Callable[[], Any],
+    ) -> Any:
+        """
+        Return cache[pom_file], building it at most once across threads
+
+        A request that would wait on itself, directly or through other
+        waiting threads, is a cycle through parents or imported BOMs and
+        gets None.
+        """
+        key = (kind, pom_file)
+        me = threading.get_ident()
+        while True:
+            with self._lock:
+                if pom_file in cache:
+                    return cache[pom_file]
+                pending = self._pending.get(key)
+                if pending is None:
+                    self._pending[key] = (threading.Event(), me)
+                    break
+                event, owner = pending
+                if self._waits_for(owner, me):
+                    return None
+                self._waiting[me] = key
+            try:
+                event.wait()
+            finally:
+                with self._lock:
+                    self._waiting.pop(me, None)
+
+        try:
+            value = build()
+            with self._lock:
+                cache[pom_file] = value
+        finally:
+            with self._lock:
+                self._pending.pop(key)[0].set()
+        return value
+
+    def _waits_for(self, thread: int, target: int) -> bool:
+        """Whether thread is, or transitively waits for, target (lock held)"""
+        for _ in range(len(self._waiting) + 1):
+            if thread == target:
+                return True
+            key = self._waiting.get(thread)
+            if key is None or key not in self._pending:
+                return False
+            thread = self._pending[key][1]
+        return False
+
+    def _build_effective_pom(
+        self, pom_file: Path, depth: int
+    ) -> Optional[EffectivePom]:
+        raw = self.load(pom_file)
+        if raw is None:
+            return None
+
+        parent = None
+        if raw.parent is not None and depth < MAX_PARENT_DEPTH:
+            parent_file = self._locate_parent(pom_file, raw)
+            if parent_file is not None:
+                parent = self._effective_pom(parent_file, depth + 1)
+
+        group_id = raw.group_id or (raw.parent[0] if raw.parent else "")
+        version = raw.version or (raw.parent[2] if raw.parent else "")
+
+        properties = dict(parent.properties) if parent else {}
+        properties.update(raw.properties)
+        properties.update(
+            {
+                "project.groupId": group_id,
+                "project.artifactId": raw.artifact_id,
+                "project.version": version,
+                "pom.groupId": group_id,
+                "pom.artifactId": raw.artifact_id,
+                "pom.version": version,
+                "groupId": group_id,
+                "artifactId": raw.artifact_id,
+                "version": version,
+            }
+        )
+        if raw.parent is not None:
+            properties["project.parent.groupId"] = raw.parent[0]
+            properties["project.parent.version"] = raw.parent[2]
+            properties["parent.version"] = raw.parent[2]
+
+        # Inherited declarations are interpolated with this POM's properties
+        declared_managed = _merge_declarations(
+            parent.declared_managed if parent else [], raw.managed
+        )
+        managed: Dict[ArtifactKey, PomDependency] = {}
+        imported: Dict[ArtifactKey, PomDependency] = {}
+        for dependency in declared_managed:
+            dependency = self._interpolated(dependency, properties)
+            if dependency.scope == "import" and dependency.type == "pom":
+                bom = self._import_bom(dependency, depth)
+                for key, managed_dependency in bom.items():
+                    imported.setdefault(key, managed_dependency)
+            else:
+                managed[dependency.key] = dependency
+        # Entries declared directly win over imported BOMs
+        for key, managed_dependency in imported.items():
+            managed.setdefault(key, managed_dependency)
+
+        declared_dependencies = _merge_declarations(
+            parent.declared_dependencies if parent else [], raw.dependencies
+        )
+        dependencies: Dict[ArtifactKey, PomDependency] = {}
+        for dependency in declared_dependencies:
+            dependency = self._interpolated(dependency, properties)
+            dependencies[dependency.key] = self._apply_management(dependency, managed)
+
+        return EffectivePom(
+            group_id=group_id,
+            artifact_id=raw.artifact_id,
+            version=version,
+            properties=properties,
+            dependencies=list(dependencies.values()),
+            managed=managed,
+            declared_dependencies=declared_dependencies,
+            declared_managed=declared_managed,
+        )
+
+    def _locate_parent(self, pom_file: Path, raw: RawPom) -> Optional[Path]:
+        """Find the parent POM next to the project first, then in the repository"""
+        group_id, artifact_id, version = raw.parent
+        relative_path = raw.parent_relative_path
+        if relative_path is None:
+            relative_path = "../pom.xml"
+        if relative_path:
+            candidate = pom_file.parent / relative_path
+            if candidate.is_dir():
+                candidate = candidate / "pom.xml"
+            local = self.load(candidate)
+            if local is not None and local.artifact_id == artifact_id:
+                return candidate
+        if group_id and artifact_id and _is_resolved(version):
+            return self.pom_path(group_id, artifact_id, version)
+        return None
+
+    def _import_bom(
+        self, dependency: PomDependency, depth: int
+    ) -> Dict[ArtifactKey, PomDependency]:
+        version = _exact_version(dependency.version)
+        if not _is_resolved(version) or depth >= MAX_PARENT_DEPTH:
+            return {}
+        bom_file = self.pom_path(dependency.group_id, dependency.artifact_id, version)
+        bom = self._effective_pom(bom_file, depth + 1)
+        return bom.managed if bom else {}
+
+    def _interpolated(
+        self, dependency: PomDependency, properties: Dict[str, str]
+    ) -> PomDependency:
+        return PomDependency(
+            group_id=_interpolate(dependency.group_id, properties),
+            artifact_id=_interpolate(dependency.artifact_id, properties),
+            version=_exact_version(_interpolate(dependency.version, properties)),
+            scope=dependency.scope,
+            type=_interpolate(dependency.type, properties),
+            optional=dependency.optional,
+            exclusions=dependency.exclusions,
+        )
+
+    def _apply_management(
+        self, dependency: PomDependency, managed: Dict[ArtifactKey, PomDependency]
+    ) -> PomDependency:
+        """Fill a missing version, scope and exclusions from dependencyManagement"""
+        management = managed.get(dependency.key)
+        if management is None:
+            return dependency
+        return PomDependency(
+            group_id=dependency.group_id,
+            artifact_id=dependency.artifact_id,
+            version=dependency.version or management.version,
+            scope=dependency.scope or management.scope,
+            type=dependency.type,
+            optional=dependency.optional,
+            exclusions=dependency.exclusions | management.exclusions,
+        )
+
+    def resolve(self, pom_file: Path) -> List[ResolvedArtifact]:
+        """
+        Resolve the dependency graph of a project
+
+        The graph is walked breadth first, so the nearest declaration of an
+        artifact wins, and the first one wins at equal depth. The project's
+        dependencyManagement also pins the versions of transitive artifacts.
+        Dependencies whose POM is not in the local repository are reported
+        but not expanded.
+
+        Args:
+            pom_file: the project's pom.xml
+
+        Returns:
+            Resolved artifacts in breadth-first order
+        """
+        project = self.effective_pom(pom_file)
+        if project is None:
+            return []
+
+        resolved: Dict[ArtifactKey, ResolvedArtifact] = {}
+        queue = deque(
+            (dependency, 1, frozenset(), None) for dependency in project.dependencies
+        )
+
+        while queue and len(resolved) < MAX_RESOLVED_ARTIFACTS:
+            dependency, depth, exclusions, path_scope = queue.popleft()
+            key = dependency.key
+            if key in resolved or _is_excluded(key, exclusions):
+                continue
+
+            declared_scope = dependency.scope or "compile"
+            if path_scope is None:
+                scope = declared_scope
+            else:
+                if dependency.optional:
+                    continue
+                scope = _TRANSITIVE_SCOPES.get((path_scope, declared_scope))
+                if scope is None:
+                    continue
+
+            version = dependency.version
+            management = project.managed.get(key) if depth > 1 else None
+            if management is not None and management.version:
+                version = management.version
+
+            resolved[key] = ResolvedArtifact(
+                group_id=dependency.group_id,
+                artifact_id=dependency.artifact_id,
+                version=version if _is_resolved(version) else "",
+                scope=scope,
+                depth=depth,
+            )
+
+            if not _is_resolved(version) or dependency.type == "pom":
+                continue
+            child = self.effective_pom(self.pom_path(*key, version))
+            if child is None:
+                continue
+            child_exclusions = exclusions | dependency.exclusions
+            for child_dependency in child.dependencies:
+                queue.append((child_dependency, depth + 1, child_exclusions, scope))
+
+        return list(resolved.values())
+
+    def clear(self) -> None:
+        """Forget every parsed POM"""
+        with self._lock:
+            self._raw.clear()
+            self._effective.clear()
+
+
+def read_gradle_lockfile(lockfile: Path) -> List[Tuple[str, str, str, List[str]]]:
+    """
+    Read a gradle.lockfile
+
+    Each line reads "group:artifact:version=configuration,...".
+
+    Returns:
+        (groupId, artifactId, version, configurations) for every entry
+    """
+    entries = []
+    try:
+        with open(lockfile, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#") or line.startswith("empty="):
+                    continue
+                coordinates, _, configurations = line.partition("=")
+                parts = coordinates.split(":")
+                if len(parts) < 3:
+                    continue
+                entries.append(
+                    (
+                        parts[0],
+                        parts[1],
+                        parts[2],
+                        [name for name in configurations.split(",") if name],
+                    )
+                )
+    except (OSError, UnicodeDecodeError) as e:
+        logger.warning(f"Failed to read Gradle lockfile: {lockfile}, error: {e}")
+    return entries
+
+
+def read_verification_metadata(metadata_file: Path) -> List[Tuple[str, str, str]]:
+    """
+    Read the components of gradle/verification-metadata.xml
+
+    Returns:
+        (groupId, artifactId, version) for every verified component
+    """
+    try:
+        root = ET.parse(metadata_file).getroot()
+    except (ET.ParseError, OSError) as e:
+        logger.warning(
+            f"Failed to read verification metadata: {metadata_file}, error: {e}"
+        )
+        return []
+
+    components = []
+    for component in _children(_child(root, "components"), "component"):
+        group_id = component.get("group", "")
+        artifact_id = component.get("name", "")
+        version = component.get("version", "")
+        if group_id and artifact_id and version:
+            components.append((group_id, artifact_id, version))
+    return components
+
+
+_repository: Optional[MavenRepository] = None
+_repository_lock = threading.Lock()
+
+
+def get_maven_repository() -> MavenRepository:
+    """Return the process-wide view of the current Maven local repository"""
+    global _repository
+    root = get_maven_local_repository()
+    with _repository_lock:
+        if _repository is None or _repository.root != root:
+            _repository = MavenRepository(root)
+        return _repository
+
+
+def clear_maven_repository() -> None:
+    """Forget the memoised POMs, e.g. at the start of a new scan"""
+    with _repository_lock:
+        if _repository is not None:
+            _repository.clear()
@@ -0,0 +1,336 @@
+"""
+Node.js 锁文件流式读取模块
+
+逐条读取 package-lock.json / npm-shrinkwrap.json（v1/v2/v3）、yarn.lock
+（classic / berry）和 pnpm-lock.yaml 中锁定的包。文件按块读取，任一时刻
+只在内存中保留当前条目，几百 MB 的锁文件也不需要整体加载。
+"""
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, TextIO, Tuple
+
+from .base import DependencyInfo, DependencyType
+
+logger = logging.getLogger(__name__)
+
+# 每次从文件读取的字符数
+READ_CHUNK_SIZE = 1 << 16
+
+# 按优先级排列的锁文件名
+LOCKFILE_NAMES = (
+    "npm-shrinkwrap.json",
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+)
+
+_NODE_MODULES = "node_modules/"
+_WHITESPACE = " \t\r\n"
+_JSON_DECODER = json.JSONDecoder()
+
+# pnpm 包键: v6+ 为 name@version(peers)，v5 为 name/version_peers
+_PNPM_KEY = re.compile(r"^(@[^/]+/[^@/]+|[^@/]+)@([^(]+)")
+_PNPM_V5_KEY = re.compile(r"^(@[^/]+/[^/]+|[^@/][^/]*)/([^/_]+)(?:_.*)?$")
+
+
+class _JsonStream:
+    """按块读取的 JSON 拉取式解析器，只支持本模块需要的几种操作"""
+
+    def __init__(self, handle: TextIO, chunk_size: int = READ_CHUNK_SIZE):
+        self._handle = handle
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """读取下一块，丢弃已消费的内容；到达文件末尾时返回 False"""
+        if self._eof:
+            return False
+        chunk = self._handle.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """跳过空白，返回下一个字符（文件末尾返回空字符串）"""
+        while True:
+            while self._pos < len(self._buffer):
+                if self._buffer[self._pos] not in _WHITESPACE:
+                    return self._buffer[self._pos]
+                self._pos += 1
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """消费指定字符"""
+        if self.peek() != char:
+            raise ValueError(f"期望 {char!r}，实际为 {self.peek()!r}")
+        self._pos += 1
+
+    def read_value(self) -> Any:
+        """完整解码下一个值，只用于体积较小的值"""
+        self.peek()
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 数字可能被块边界截断，确认后面还有内容
+            if end == len(self._buffer) and not self._eof and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def read_key(self) -> str:
+        """读取对象的键并消费其后的冒号"""
+        key = self.read_value()
+        if not isinstance(key, str):
+            raise ValueError("对象的键必须是字符串")
+        self.expect(":")
+        return key
+
+    def skip_value(self) -> None:
+        """跳过下一个值，不构造对象"""
+        char = self.peek()
+        if char not in "[{":
+            self.read_value()
+            return
+
+        depth = 0
+        in_string = False
+        escaped = False
+        while True:
+            if self._pos >= len(self._buffer) and not self._fill():
+                raise ValueError("JSON 意外结束")
+            char = self._buffer[self._pos]
+            self._pos += 1
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in "[{":
+                depth += 1
+            elif char in "]}":
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        逐个产出对象的键
+
+        调用方必须在取下一个键之前消费（读取或跳过）对应的值。
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            yield self.read_key()
+            char = self.peek()
+            self._pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError(f"对象中出现意外字符 {char!r}")
+
+
+def find_lockfile(project_path: Path) -> Optional[Path]:
+    """
+    查找项目的锁文件
+
+    Args:
+        project_path: 项目目录
+
+    Returns:
+        第一个存在的锁文件路径，没有时返回 None
+    """
+    for name in LOCKFILE_NAMES:
+        lockfile = project_path / name
+        if lockfile.is_file():
+            return lockfile
+    return None
+
+
+def iter_locked_packages(lockfile: Path) -> Iterator[DependencyInfo]:
+    """
+    流式读取锁文件中的所有包
+
+    每个包产出一个只包含名称、版本的精简 DependencyInfo，类型为
+    TRANSITIVE，version 与 installed_version 都是锁定的版本。同一个包的
+    多个版本会分别产出；项目自身和工作区链接不会产出。
+
+    Args:
+        lockfile: 锁文件路径
+
+    Returns:
+        包信息迭代器，文件无法读取或格式错误时提前结束
+    """
+    reader = _LOCKFILE_READERS.get(lockfile.name)
+    if reader is None:
+        logger.debug(f"不支持的锁文件: {lockfile}")
+        return
+
+    try:
+        with open(lockfile, "r", encoding="utf-8") as handle:
+            for name, version in reader(handle):
+                if name and version:
+                    yield _locked_dependency(name, version)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        logger.warning(f"读取锁文件失败: {lockfile}, 错误: {e}")
+
+
+def _locked_dependency(name: str, version: str) -> DependencyInfo:
+    """构造锁定包的精简依赖信息"""
+    return DependencyInfo(
+        name=name,
+        version=version,
+        installed_version=version,
+        dependency_type=DependencyType.TRANSITIVE,
+    )
+
+
+def _read_npm_lockfile(handle: TextIO) -> Iterator[Tuple[str, str]]:
+    """
+    读取 package-lock.json，v2/v3 使用 packages，v1 使用嵌套的 dependencies
+
+    v2 之后的 dependencies 段与 packages 重复且同样庞大，读完 packages
+    后立即返回，不再逐字符跳过它。
+    """
+    stream = _JsonStream(handle)
+    lockfile_version = None
+
+    for key in stream.iter_object():
+        if key == "lockfileVersion":
+            lockfile_version = stream.read_value()
+        elif key == "packages":
+            for path in stream.iter_object():
+                entry = stream.read_value()
+                package = _npm_package_entry(path, entry)
+                if package is not None:
+                    yield package
+            return
+        elif key == "dependencies" and not (
+            isinstance(lockfile_version, int) and lockfile_version >= 2
+        ):
+            yield from _read_npm_v1_dependencies(stream)
+            return
+        else:
+            stream.skip_value()
+
+
+def _npm_package_entry(path: str, entry: Any) -> Optional[Tuple[str, str]]:
+    """解析 packages 中的一条记录，项目自身、工作区和链接返回 None"""
+    if not isinstance(entry, dict) or entry.get("link"):
+        return None
+    index = path.rfind(_NODE_MODULES)
+    if index < 0:
+        return None
+    name = path[index + len(_NODE_MODULES) :]
+    return name, entry.get("version", "")
+
+
+def _read_npm_v1_dependencies(stream: _JsonStream) -> Iterator[Tuple[str, str]]:
+    """递归读取 v1 的 dependencies 树"""
+    for name in stream.iter_object():
+        version = ""
+        for field in stream.iter_object():
+            if field == "version":
+                version = stream.read_value()
+            elif field == "dependencies":
+                yield from _read_npm_v1_dependencies(stream)
+            else:
+                stream.skip_value()
+        if isinstance(version, str) and not version.startswith("file:"):
+            yield name, version
+
+
+def _read_yarn_lockfile(handle: TextIO) -> Iterator[Tuple[str, str]]:
+    """读取 yarn.lock，兼容 classic（version "x"）和 berry（version: x）"""
+    name = None
+    version = ""
+    workspace = False
+
+    for line in handle:
+        if not line.strip() or line.startswith("#"):
+            continue
+
+        if not line[0].isspace():
+            if name and not workspace:
+                yield name, version
+            name = _yarn_entry_name(line)
+            version = ""
+            workspace = False
+            continue
+
+        stripped = line.strip()
+        if line.startswith("  ") and not line.startswith("   "):
+            if stripped.startswith("version"):
+                version = stripped[len("version") :].lstrip(" :").strip().strip('"')
+            elif stripped.startswith("resolution:"):
+                workspace = "@workspace:" in stripped or "@link:" in stripped
+
+    if name and not workspace:
+        yield name, version
+
+
+def _yarn_entry_name(line: str) -> Optional[str]:
+    """从 yarn.lock 条目头（"a@^1.0.0, a@^1.1.0":）中取出包名"""
+    spec = line.rstrip().rstrip(":").split(",")[0].strip().strip('"')
+    if spec == "__metadata":
+        return None
+    # 作用域包以 @ 开头，包名与版本范围之间是第二个 @
+    index = spec.find("@", 1)
+    return spec[:index] if index > 0 else spec
+
+
+def _read_pnpm_lockfile(handle: TextIO) -> Iterator[Tuple[str, str]]:
+    """读取 pnpm-lock.yaml 的 packages 段（v5 /a/1.0.0、v6 /a@1.0.0、v9 a@1.0.0）"""
+    in_packages = False
+
+    for line in handle:
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+
+        if not line[0].isspace():
+            in_packages = line.rstrip() == "packages:"
+            continue
+
+        if not in_packages or not line.startswith("  ") or line[2].isspace():
+            continue
+
+        key = line.strip().rstrip(":").strip("'\"")
+        package = _pnpm_package_key(key)
+        if package is not None:
+            yield package
+
+
+def _pnpm_package_key(key: str) -> Optional[Tuple[str, str]]:
+    """解析 pnpm 包键，返回 (包名, 版本)"""
+    key = key.lstrip("/")
+    match = _PNPM_KEY.match(key) or _PNPM_V5_KEY.match(key)
+    if match is None or ":" in match.group(2):
+        return None
+    return match.group(1), match.group(2)
+
+
+_LOCKFILE_READERS: Dict[str, Callable[[TextIO], Iterator[Tuple[str, str]]]] = {
+    "package-lock.json": _read_npm_lockfile,
+    "npm-shrinkwrap.json": _read_npm_lockfile,
+    "yarn.lock": _read_yarn_lockfile,
+    "pnpm-lock.yaml": _read_pnpm_lockfile,
+}
@@ -5,14 +5,46 @@ Node.js 项目解析器
 """
 
 import logging
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
-from ..utils.file_utils import get_directory_size, safe_read_json
+from ..utils.file_utils import SizeEstimate, safe_read_json
+from ..utils.size_cache import get_cached_size_estimate
 from .base import BaseParser, DependencyInfo, DependencyType, ProjectInfo, ProjectType
+from .node_lockfiles import find_lockfile, iter_locked_packages
 
 logger = logging.getLogger(__name__)
 
+# npm 7+ 在 node_modules 中维护的隐藏锁文件
+HIDDEN_LOCKFILE = ".package-lock.json"
+
+
+@dataclass
+class InstalledPackage:
+    """node_modules 顶层安装的包"""
+
+    name: str
+    path: Path
+    version: Optional[str] = None
+    description: Optional[str] = None
+    resolved: Optional[str] = None  # 下载地址（来自隐藏锁文件）
+    linked: bool = False  # 符号链接（pnpm、npm link），内容不属于当前目录树
+
+
+@dataclass
+class NodeModulesIndex:
+    """一次遍历 node_modules 得到的顶层包索引"""
+
+    packages: Dict[str, InstalledPackage] = field(default_factory=dict)
+    # .bin、.cache、.pnpm 等不属于任何顶层包的目录
+    other_directories: List[Path] = field(default_factory=list)
+    # node_modules 及 @scope 目录下直接存放的文件大小
+    other_file_bytes: int = 0
+    # 版本信息是否来自隐藏锁文件
+    from_lockfile: bool = False
+
 
 class NodeJSParser(BaseParser):
     """Node.js 项目解析器"""
@@ -25,6 +57,19 @@ class NodeJSParser(BaseParser):
     def config_files(self) -> List[str]:
         return ["package.json"]
 
+    @property
+    def lock_files(self) -> List[str]:
+        return [
+            "package-lock.json",
+            "npm-shrinkwrap.json",
+            "yarn.lock",
+            "pnpm-lock.yaml",
+        ]
+
+    @property
+    def install_directories(self) -> List[str]:
+        return ["node_modules"]
+
     def can_parse(self, project_path: Path) -> bool:
         """检查是否为 Node.js 项目"""
         package_json = project_path / "package.json"
@@ -42,6 +87,8 @@ class NodeJSParser(BaseParser):
             logger.warning(f"无法解析 package.json: {package_json_path}")
             return None
 
+        installed = self._index_node_modules(project_path / "node_modules")
+
         project_name = package_data.get("name", project_path.name)
 
         project_info = ProjectInfo(
@@ -58,11 +105,16 @@ class NodeJSParser(BaseParser):
             },
         )
 
+        if installed is not None:
+            project_info.metadata["installed_packages"] = len(installed.packages)
+
         # 解析依赖
-        project_info.dependencies = self.get_dependencies(project_info)
+        project_info.dependencies = self._parse_dependencies(package_data)
+        self._enrich_with_installed_info(project_info.dependencies, installed)
+        self._add_locked_dependencies(project_info, project_info.dependencies)
 
         # 计算总大小
-        self.calculate_dependency_sizes(project_info)
+        self.calculate_dependency_sizes(project_info, installed)
 
         return project_info
 
@@ -72,6 +124,17 @@ class NodeJSParser(BaseParser):
         if not package_data:
             return []
 
+        dependencies = self._parse_dependencies(package_data)
+
+        # 获取实际安装的依赖信息
+        installed = self._index_node_modules(project_info.path / "node_modules")
+        self._enrich_with_installed_info(dependencies, installed)
+        self._add_locked_dependencies(project_info, dependencies)
+
+        return dependencies
+
+    def _parse_dependencies(self, package_data: Dict[str, Any]) -> List[DependencyInfo]:
+        """从 package.json 内容中解析声明的依赖"""
         dependencies = []
 
         # 解析生产依赖
@@ -106,32 +169,57 @@ class NodeJSParser(BaseParser):
             )
             dependencies.append(dep_info)
 
-        # 获取实际安装的依赖信息
-        self._enrich_with_installed_info(project_info, dependencies)
-
         return dependencies
 
-    def calculate_dependency_sizes(self, project_info: ProjectInfo) -> None:
-        """计算 Node.js 依赖的磁盘占用"""
+    def calculate_dependency_sizes(
+        self, project_info: ProjectInfo, installed: Optional[NodeModulesIndex] = None
+    ) -> None:
+        """
+        计算 Node.js 依赖的磁盘占用
+
+        node_modules 中的每个文件都归属到它所在的顶层包（包括 @scope/* 和
+        嵌套的 node_modules），提升安装的间接依赖计入项目总大小；每个
+        顶层包目录只统计一次。
+
+        Args:
+            project_info: 项目信息
+            installed: 已建立的 node_modules 索引，为 None 时重新遍历
+        """
         node_modules_path = project_info.path / "node_modules"
 
-        if not node_modules_path.exists():
+        if installed is None:
+            installed = self._index_node_modules(node_modules_path)
+        if installed is None:
             logger.info(f"node_modules 不存在: {node_modules_path}")
             return
 
-        total_size = 0
+        total_size = SizeEstimate(size_bytes=installed.other_file_bytes)
+        for directory in installed.other_directories:
+            total_size += get_cached_size_estimate(directory)
 
-        for dependency in project_info.dependencies:
-            dep_path = node_modules_path / dependency.name
-            if dep_path.exists() and dep_path.is_dir():
-                size = get_directory_size(dep_path)
-                dependency.size_bytes = size
-                dependency.install_path = dep_path
+        package_sizes: Dict[str, SizeEstimate] = {}
+        for name, package in installed.packages.items():
+            size = get_cached_size_estimate(package.path)
+            package_sizes[name] = size
+            if not package.linked:
                 total_size += size
-            else:
-                logger.debug(f"依赖目录不存在: {dep_path}")
 
-        project_info.total_size_bytes = total_size
+        for dependency in project_info.dependencies:
+            package = installed.packages.get(dependency.name)
+            if package is None:
+                logger.debug(f"依赖目录不存在: {node_modules_path / dependency.name}")
+                continue
+            if (
+                dependency.dependency_type == DependencyType.TRANSITIVE
+                and package.version
+                and dependency.installed_version != package.version
+            ):
+                # 嵌套安装的其他版本，大小已计入所在的顶层包
+                continue
+            dependency.apply_size(package_sizes[dependency.name])
+            dependency.install_path = package.path
+
+        project_info.apply_size(total_size)
 
     def _detect_package_manager(self, project_path: Path) -> str:
         """检测使用的包管理器"""
@@ -145,18 +233,189 @@ class NodeJSParser(BaseParser):
             return "unknown"
 
     def _enrich_with_installed_info(
-        self, project_info: ProjectInfo, dependencies: List[DependencyInfo]
+        self,
+        dependencies: List[DependencyInfo],
+        installed: Optional[NodeModulesIndex],
     ) -> None:
         """丰富依赖信息，添加实际安装的版本等信息"""
-        node_modules_path = project_info.path / "node_modules"
-
-        if not node_modules_path.exists():
+        if installed is None:
             return
 
         for dependency in dependencies:
-            dep_package_json = node_modules_path / dependency.name / "package.json"
-            if dep_package_json.exists():
-                dep_data = safe_read_json(dep_package_json)
-                if dep_data:
-                    dependency.installed_version = dep_data.get("version")
-                    dependency.description = dep_data.get("description")
+            package = installed.packages.get(dependency.name)
+            if package is not None:
+                if package.description is None and installed.from_lockfile:
+                    # 隐藏锁文件不含描述，只为声明的依赖读取 package.json
+                    package_data = safe_read_json(package.path / "package.json")
+                    package.description = (package_data or {}).get("description")
+                dependency.installed_version = package.version
+                dependency.description = package.description
+
+    def _add_locked_dependencies(
+        self, project_info: ProjectInfo, dependencies: List[DependencyInfo]
+    ) -> None:
+        """
+        从锁文件流式读取完整的依赖树，补充声明依赖的锁定版本并追加间接依赖
+
+        同名不同版本的包分别记录，(包名, 版本) 相同的只记录一次。
+
+        Args:
+            project_info: 项目信息
+            dependencies: 声明的依赖列表，原地追加
+        """
+        lockfile = find_lockfile(project_info.path)
+        if lockfile is None:
+            return
+
+        declared = {dependency.name: dependency for dependency in dependencies}
+        seen = set()
+
+        for locked in iter_locked_packages(lockfile):
+            key = (locked.name, locked.installed_version)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            dependency = declared.get(locked.name)
+            if dependency is not None and dependency.installed_version in (
+                None,
+                locked.installed_version,
+            ):
+                dependency.installed_version = locked.installed_version
+                continue
+
+            dependencies.append(locked)
+
+        project_info.metadata["lockfile"] = lockfile.name
+        project_info.metadata["locked_packages"] = len(seen)
+
+    def _index_node_modules(
+        self, node_modules_path: Path
+    ) -> Optional[NodeModulesIndex]:
+        """
+        列出 node_modules 中的顶层包
+
+        只读取 node_modules 和 @scope 目录两层。安装版本优先取自
+        node_modules/.package-lock.json，锁文件缺失、过期或未记录某个包时
+        才读取该包自己的 package.json。
+
+        Args:
+            node_modules_path: node_modules 目录
+
+        Returns:
+            顶层包索引，node_modules 不存在时返回 None
+        """
+        index = NodeModulesIndex()
+
+        try:
+            entries = list(os.scandir(node_modules_path))
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        except OSError as e:
+            logger.warning(f"无法读取 node_modules: {node_modules_path}, 错误: {e}")
+            return None
+
+        locked = self._read_hidden_lockfile(node_modules_path)
+        index.from_lockfile = locked is not None
+
+        for entry in entries:
+            if entry.name.startswith("@") and entry.is_dir(follow_symlinks=False):
+                try:
+                    scoped = list(os.scandir(entry.path))
+                except OSError as e:
+                    logger.debug(f"无法读取 scope 目录: {entry.path}, 错误: {e}")
+                    continue
+                for scoped_entry in scoped:
+                    self._index_entry(index, scoped_entry, f"{entry.name}/", locked)
+            elif entry.name.startswith("."):
+                self._index_other(index, entry)
+            else:
+                self._index_entry(index, entry, "", locked)
+
+        return index
+
+    def _read_hidden_lockfile(
+        self, node_modules_path: Path
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        读取 node_modules/.package-lock.json 中的顶层包
+
+        锁文件比 node_modules 旧时说明之后有其他工具改动过安装目录，
+        视为过期。
+
+        Args:
+            node_modules_path: node_modules 目录
+
+        Returns:
+            包名到锁文件条目的映射，锁文件缺失、过期或无法解析时返回 None
+        """
+        lockfile = node_modules_path / HIDDEN_LOCKFILE
+        try:
+            lock_mtime = lockfile.stat().st_mtime_ns
+            if lock_mtime < node_modules_path.stat().st_mtime_ns:
+                logger.debug(f"隐藏锁文件已过期: {lockfile}")
+                return None
+        except OSError:
+            return None
+
+        data = safe_read_json(lockfile)
+        packages = data.get("packages") if data else None
+        if not isinstance(packages, dict):
+            return None
+
+        prefix = "node_modules/"
+        locked = {}
+        for key, entry in packages.items():
+            if not key.startswith(prefix) or not isinstance(entry, dict):
+                continue
+            name = key[len(prefix) :]
+            # 嵌套安装的包归属到顶层包，这里只需要顶层
+            if "/node_modules/" not in name:
+                locked[name] = entry
+
+        return locked
+
+    def _index_entry(
+        self,
+        index: NodeModulesIndex,
+        entry: os.DirEntry,
+        prefix: str,
+        locked: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """将 node_modules 的一个条目加入索引"""
+        try:
+            linked = entry.is_symlink()
+            is_package = entry.is_dir()
+        except OSError:
+            return
+
+        if not is_package:
+            self._index_other(index, entry)
+            return
+
+        name = prefix + entry.name
+        path = Path(entry.path)
+        package = InstalledPackage(
+            name=name, path=path.resolve() if linked else path, linked=linked
+        )
+
+        lock_entry = locked.get(name) if locked is not None else None
+        if lock_entry is not None and lock_entry.get("version"):
+            package.version = lock_entry["version"]
+            package.resolved = lock_entry.get("resolved")
+        else:
+            package_data = safe_read_json(path / "package.json") or {}
+            package.version = package_data.get("version")
+            package.description = package_data.get("description")
+
+        index.packages[name] = package
+
+    def _index_other(self, index: NodeModulesIndex, entry: os.DirEntry) -> None:
+        """记录不属于任何顶层包的目录或文件"""
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                index.other_directories.append(Path(entry.path))
+            elif entry.is_file(follow_symlinks=False):
+                index.other_file_bytes += entry.stat(follow_symlinks=False).st_size
+        except OSError as e:
+            logger.debug(f"无法访问: {entry.path}, 错误: {e}")
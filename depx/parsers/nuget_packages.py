@@ -0,0 +1,173 @@
+"""
+NuGet global packages index
+
+Index the NuGet global packages folder (~/.nuget/packages, laid out as
+<id>/<version> in lower case) once, so that every .NET project in a scan
+can size its packages by id and version without searching the folder
+again. The module also reads the resolved package graph from
+obj/project.assets.json.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from ..utils.file_utils import safe_read_json
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AssetsPackage:
+    """A package resolved by NuGet restore"""
+
+    name: str
+    version: str
+    direct: bool
+
+
+@dataclass
+class ProjectAssets:
+    """The parts of obj/project.assets.json used for sizing"""
+
+    packages: List[AssetsPackage]
+    package_folders: List[Path]
+
+
+def get_nuget_packages_dir() -> Path:
+    """Return $NUGET_PACKAGES, falling back to ~/.nuget/packages"""
+    packages_dir = os.environ.get("NUGET_PACKAGES")
+    if packages_dir:
+        return Path(packages_dir).expanduser()
+    return Path.home() / ".nuget" / "packages"
+
+
+def normalize_nuget_version(version: str) -> str:
+    """
+    Normalize a version the way NuGet names its folders
+
+    Build metadata is dropped, versions are padded to three parts, a zero
+    fourth part is removed, and the result is lower case.
+    """
+    version = version.strip().split("+", 1)[0]
+    release, dash, pre = version.partition("-")
+    parts = release.split(".")
+    while len(parts) < 3:
+        parts.append("0")
+    if len(parts) == 4 and parts[3] == "0":
+        parts = parts[:3]
+    normalized = ".".join(str(int(p)) if p.isdigit() else p for p in parts)
+    return f"{normalized}{dash}{pre}".lower()
+
+
+def read_project_assets(assets_file: Path) -> Optional[ProjectAssets]:
+    """
+    Read the resolved packages from obj/project.assets.json
+
+    Returns:
+        The resolved packages, or None if the file is missing or invalid
+    """
+    data = safe_read_json(assets_file)
+    if not isinstance(data, dict):
+        return None
+
+    direct: Set[str] = set()
+    frameworks = (data.get("project") or {}).get("frameworks") or {}
+    for framework in frameworks.values():
+        for name in (framework or {}).get("dependencies") or {}:
+            direct.add(name.lower())
+
+    packages = []
+    for key, library in (data.get("libraries") or {}).items():
+        if not isinstance(library, dict) or library.get("type") != "package":
+            continue
+        name, _, version = key.partition("/")
+        if name and version:
+            packages.append(AssetsPackage(name, version, name.lower() in direct))
+
+    package_folders = [Path(folder) for folder in data.get("packageFolders") or {}]
+    return ProjectAssets(packages=packages, package_folders=package_folders)
+
+
+class NuGetPackageIndex:
+    """
+    Lower-case id -> normalized version -> directory index of a packages folder
+
+    The folder is listed lazily on the first lookup and shared by every
+    caller until clear() is called.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = root or get_nuget_packages_dir()
+        self._packages: Optional[Dict[str, Dict[str, Path]]] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def _ensure_built(self) -> Dict[str, Dict[str, Path]]:
+        packages = self._packages
+        if packages is None:
+            with self._lock:
+                if self._packages is None:
+                    self._packages = self._build()
+                    self.builds += 1
+                packages = self._packages
+        return packages
+
+    def _build(self) -> Dict[str, Dict[str, Path]]:
+        packages: Dict[str, Dict[str, Path]] = {}
+        try:
+            ids = [entry for entry in os.scandir(self.root) if entry.is_dir()]
+        except OSError:
+            return packages
+
+        for package in ids:
+            try:
+                with os.scandir(package.path) as entries:
+                    versions = {
+                        entry.name.lower(): Path(entry.path)
+                        for entry in entries
+                        if entry.is_dir()
+                    }
+            except OSError as e:
+                logger.debug(f"Cannot list NuGet package {package.path}: {e}")
+                continue
+            if versions:
+                packages[package.name.lower()] = versions
+
+        logger.debug(f"Indexed {len(packages)} NuGet packages in {self.root}")
+        return packages
+
+    def find(self, name: str, version: str) -> Optional[Path]:
+        """Directory of a package version, or None if it is not installed"""
+        if not version or version[0] in "[(":
+            return None
+        versions = self._ensure_built().get(name.lower(), {})
+        return versions.get(normalize_nuget_version(version))
+
+    def clear(self) -> None:
+        """Drop the index; the next lookup lists the folder again"""
+        with self._lock:
+            self._packages = None
+
+
+_indexes: Dict[Path, NuGetPackageIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_nuget_package_index(root: Optional[Path] = None) -> NuGetPackageIndex:
+    """Return the process-wide index of a packages folder (default: the global one)"""
+    root = root or get_nuget_packages_dir()
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = _indexes[root] = NuGetPackageIndex(root)
+        return index
+
+
+def clear_nuget_package_indexes() -> None:
+    """Forget every indexed packages folder, e.g. at the start of a new scan"""
+    with _indexes_lock:
+        _indexes.clear()
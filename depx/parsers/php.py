@@ -5,10 +5,13 @@ Parse PHP projects with composer.json and composer.lock files
 """
 
 import logging
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
-from ..utils.file_utils import get_directory_size, safe_read_json
+from ..utils.file_utils import SizeEstimate, safe_read_json
+from ..utils.size_cache import get_cached_size_estimate
 from .base import (
     BaseParser,
     DependencyInfo,
@@ -19,6 +22,29 @@ from .base import (
 
 logger = logging.getLogger(__name__)
 
+# Entries of vendor/ that are not package namespaces
+VENDOR_INTERNAL_DIRECTORIES = ("composer", "bin")
+
+
+@dataclass
+class ComposerPackage:
+    """A package listed in vendor/composer/installed.json"""
+
+    name: str
+    version: str
+    path: Optional[Path]  # None for metapackages
+    dev: bool = False
+
+
+@dataclass
+class VendorIndex:
+    """Result of one pass over vendor/"""
+
+    packages: Dict[str, Path] = field(default_factory=dict)
+    linked: List[str] = field(default_factory=list)
+    other_directories: List[Path] = field(default_factory=list)
+    other_file_bytes: int = 0
+
 
 class PHPParser(BaseParser):
     """PHP project parser"""
@@ -31,6 +57,18 @@ class PHPParser(BaseParser):
     def config_files(self) -> List[str]:
         return ["composer.json", "composer.lock"]
 
+    @property
+    def install_directories(self) -> List[str]:
+        return ["vendor"]
+
+    @property
+    def marker_files(self) -> List[str]:
+        return ["composer.json"]
+
+    @property
+    def marker_extensions(self) -> List[str]:
+        return [".php"]
+
     def can_parse(self, project_path: Path) -> bool:
         """Check if this is a PHP project"""
         # Primary check: composer.json
@@ -38,11 +76,18 @@ class PHPParser(BaseParser):
             return True
 
         # Secondary check: PHP files
-        php_files = list(project_path.glob("*.php"))
-        if php_files:
-            return True
-
-        return False
+        return self._find_php_file(project_path) is not None
+
+    def _find_php_file(self, project_path: Path) -> Optional[Path]:
+        """Return the first *.php file in the project directory, if any"""
+        try:
+            with os.scandir(project_path) as entries:
+                php_files = [
+                    entry.name for entry in entries if entry.name.endswith(".php")
+                ]
+        except OSError:
+            return None
+        return project_path / min(php_files) if php_files else None
 
     def parse_project(self, project_path: Path) -> Optional[ProjectInfo]:
         """Parse PHP project information"""
@@ -59,9 +104,7 @@ class PHPParser(BaseParser):
             project_name = self._get_name_from_composer(composer_json) or project_name
         else:
             # Use first PHP file as reference
-            php_files = list(project_path.glob("*.php"))
-            if php_files:
-                config_file = php_files[0]
+            config_file = self._find_php_file(project_path)
 
         if not config_file:
             return None
@@ -80,22 +123,44 @@ class PHPParser(BaseParser):
             },
         )
 
+        # installed.json is read once and shared by both steps
+        installed = self._read_installed_json(project_path / "vendor")
+
         # Parse dependencies
-        project_info.dependencies = self.get_dependencies(project_info)
+        project_info.dependencies = self.get_dependencies(project_info, installed)
 
         # Calculate sizes
-        self.calculate_dependency_sizes(project_info)
+        self.calculate_dependency_sizes(project_info, installed)
 
         return project_info
 
-    def get_dependencies(self, project_info: ProjectInfo) -> List[DependencyInfo]:
-        """Get PHP project dependencies"""
+    def get_dependencies(
+        self,
+        project_info: ProjectInfo,
+        installed: Optional[Dict[str, ComposerPackage]] = None,
+    ) -> List[DependencyInfo]:
+        """
+        Get PHP project dependencies
+
+        Installed versions and transitive packages come from
+        vendor/composer/installed.json; composer.lock is only used when
+        nothing is installed.
+        """
         dependencies = []
 
         composer_json = project_info.path / "composer.json"
-        if composer_json.exists():
-            dependencies.extend(self._parse_composer_json(composer_json))
+        if not composer_json.exists():
+            return dependencies
+
+        dependencies.extend(self._parse_composer_json(composer_json))
 
+        if installed is None:
+            installed = self._read_installed_json(project_info.path / "vendor")
+
+        if installed is not None:
+            self._merge_installed_packages(dependencies, installed)
+            project_info.metadata["installed_packages"] = len(installed)
+        else:
             # Also parse composer.lock if available for exact versions
             composer_lock = project_info.path / "composer.lock"
             if composer_lock.exists():
@@ -104,24 +169,175 @@ class PHPParser(BaseParser):
 
         return dependencies
 
-    def calculate_dependency_sizes(self, project_info: ProjectInfo) -> None:
-        """Calculate PHP dependency sizes"""
-        total_size = 0
+    def calculate_dependency_sizes(
+        self,
+        project_info: ProjectInfo,
+        installed: Optional[Dict[str, ComposerPackage]] = None,
+    ) -> None:
+        """
+        Calculate PHP dependency sizes
 
-        # Check vendor directory
+        vendor/ is listed once; every package directory is sized once and
+        the vendor total is the sum of the packages and the remaining
+        entries (composer/, bin/, autoload.php), so nothing is counted twice.
+        """
         vendor_dir = project_info.path / "vendor"
-        if vendor_dir.exists():
-            vendor_size = get_directory_size(vendor_dir)
-            total_size += vendor_size
-
-            # Update dependency sizes based on vendor directory
-            for dependency in project_info.dependencies:
-                vendor_path = vendor_dir / dependency.name
-                if vendor_path.exists():
-                    dependency.size_bytes = get_directory_size(vendor_path)
-                    dependency.install_path = vendor_path
-
-        project_info.total_size_bytes = total_size
+        if not vendor_dir.exists():
+            project_info.apply_size(SizeEstimate())
+            return
+
+        if installed is None:
+            installed = self._read_installed_json(vendor_dir) or {}
+
+        index = self._index_vendor(vendor_dir)
+        package_paths = dict(index.packages)
+        for package in installed.values():
+            # Packages installed outside vendor/<vendor>/<name>, e.g. custom
+            # installer paths, are only sized for the dependency itself
+            if package.path is not None and package.name not in package_paths:
+                if package.path.is_dir():
+                    package_paths[package.name] = package.path
+
+        total_size = SizeEstimate(size_bytes=index.other_file_bytes)
+        for directory in index.other_directories:
+            total_size += get_cached_size_estimate(directory)
+
+        package_sizes: Dict[str, SizeEstimate] = {}
+        for name, path in index.packages.items():
+            package_sizes[name] = get_cached_size_estimate(path)
+            if name not in index.linked:
+                total_size += package_sizes[name]
+
+        for dependency in project_info.dependencies:
+            path = package_paths.get(dependency.name)
+            if path is None:
+                continue
+            if dependency.name not in package_sizes:
+                package_sizes[dependency.name] = get_cached_size_estimate(path)
+            dependency.apply_size(package_sizes[dependency.name])
+            dependency.install_path = path
+
+        project_info.apply_size(total_size)
+
+    def _read_installed_json(
+        self, vendor_dir: Path
+    ) -> Optional[Dict[str, ComposerPackage]]:
+        """
+        Read vendor/composer/installed.json
+
+        Composer 2 writes {"packages": [...], "dev-package-names": [...]} with
+        install paths relative to vendor/composer; Composer 1 writes a plain
+        list and installs every package in vendor/<name>.
+
+        Returns:
+            Installed packages by name, or None if the file is missing
+        """
+        installed_json = vendor_dir / "composer" / "installed.json"
+        if not installed_json.exists():
+            return None
+
+        data: Any = safe_read_json(installed_json)
+        if isinstance(data, dict):
+            packages = data.get("packages", [])
+            dev_names = set(data.get("dev-package-names", []))
+        elif isinstance(data, list):
+            packages = data
+            dev_names = set()
+        else:
+            return None
+
+        installed = {}
+        for package in packages:
+            if not isinstance(package, dict) or not package.get("name"):
+                continue
+            name = package["name"]
+            if "install-path" in package:
+                install_path = package["install-path"]
+                path = (
+                    Path(os.path.normpath(vendor_dir / "composer" / install_path))
+                    if install_path
+                    else None
+                )
+            elif package.get("type") == "metapackage":
+                path = None
+            else:
+                path = vendor_dir / name
+            installed[name] = ComposerPackage(
+                name=name,
+                version=package.get("version", ""),
+                path=path,
+                dev=name in dev_names,
+            )
+
+        return installed
+
+    def _merge_installed_packages(
+        self,
+        dependencies: List[DependencyInfo],
+        installed: Dict[str, ComposerPackage],
+    ) -> None:
+        """
+        Set installed versions and append the undeclared packages
+
+        Packages Composer lists in dev-package-names are only pulled in by
+        require-dev, so they are reported as development dependencies.
+        """
+        declared = {dependency.name: dependency for dependency in dependencies}
+        for name, package in installed.items():
+            dependency = declared.get(name)
+            if dependency is not None:
+                dependency.installed_version = package.version
+                continue
+            dependencies.append(
+                DependencyInfo(
+                    name=name,
+                    version=package.version,
+                    installed_version=package.version,
+                    dependency_type=(
+                        DependencyType.DEVELOPMENT
+                        if package.dev
+                        else DependencyType.TRANSITIVE
+                    ),
+                )
+            )
+
+    def _index_vendor(self, vendor_dir: Path) -> VendorIndex:
+        """List vendor/ and its namespace directories once"""
+        index = VendorIndex()
+        try:
+            with os.scandir(vendor_dir) as entries:
+                top_level = list(entries)
+        except OSError as e:
+            logger.warning(f"Cannot list vendor directory: {vendor_dir}, error: {e}")
+            return index
+
+        for entry in top_level:
+            try:
+                if entry.name in VENDOR_INTERNAL_DIRECTORIES or not entry.is_dir(
+                    follow_symlinks=False
+                ):
+                    self._index_other(index, entry)
+                    continue
+                with os.scandir(entry.path) as packages:
+                    for package in packages:
+                        if package.is_dir():
+                            name = f"{entry.name}/{package.name}"
+                            index.packages[name] = Path(package.path)
+                            if package.is_symlink():
+                                index.linked.append(name)
+                        else:
+                            self._index_other(index, package)
+            except OSError as e:
+                logger.debug(f"Cannot access: {entry.path}, error: {e}")
+
+        return index
+
+    def _index_other(self, index: VendorIndex, entry: os.DirEntry) -> None:
+        """Record a vendor/ entry that does not belong to a package"""
+        if entry.is_dir(follow_symlinks=False):
+            index.other_directories.append(Path(entry.path))
+        elif entry.is_file(follow_symlinks=False):
+            index.other_file_bytes += entry.stat(follow_symlinks=False).st_size
 
     def _parse_composer_json(self, composer_json: Path) -> List[DependencyInfo]:
         """Parse composer.json dependencies"""
@@ -6,12 +6,18 @@ Parse Python projects with requirements.txt, setup.py, pyproject.toml
 
 import logging
 import re
-import subprocess
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from ..utils.file_utils import get_directory_size
+from ..utils.file_utils import SizeEstimate
+from ..utils.toml_utils import safe_load_toml
 from .base import BaseParser, DependencyInfo, DependencyType, ProjectInfo, ProjectType
+from .python_envs import PythonEnvironment, get_python_environment_resolver
+from .site_packages import (
+    InstalledDistribution,
+    canonicalize_name,
+    get_site_packages_index,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +39,22 @@ class PythonParser(BaseParser):
             "environment.yml",
         ]
 
+    @property
+    def lock_files(self) -> List[str]:
+        return [
+            "poetry.lock",
+            "Pipfile.lock",
+            "pdm.lock",
+            "uv.lock",
+            "requirements-dev.txt",
+            "dev-requirements.txt",
+            "test-requirements.txt",
+        ]
+
+    @property
+    def install_directories(self) -> List[str]:
+        return ["venv", ".venv", "env", ".env", "virtualenv"]
+
     def can_parse(self, project_path: Path) -> bool:
         """Check if this is a Python project"""
         for config_file in self.config_files:
@@ -122,62 +144,83 @@ class PythonParser(BaseParser):
         return dependencies
 
     def calculate_dependency_sizes(self, project_info: ProjectInfo) -> None:
-        """Calculate Python dependency sizes"""
-        # Look for virtual environment directories
-        venv_dirs = ["venv", ".venv", "env", ".env", "virtualenv"]
-        site_packages_dirs = []
-
-        for venv_dir in venv_dirs:
-            venv_path = project_info.path / venv_dir
-            if venv_path.exists():
-                # Find site-packages directory
-                site_packages = list(venv_path.rglob("site-packages"))
-                site_packages_dirs.extend(site_packages)
-
-        if not site_packages_dirs:
-            # Try to find global site-packages
-            try:
-                result = subprocess.run(
-                    ["python", "-c", "import site; print(site.getsitepackages()[0])"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                )
-                if result.returncode == 0:
-                    global_site_packages = Path(result.stdout.strip())
-                    if global_site_packages.exists():
-                        site_packages_dirs.append(global_site_packages)
-            except (subprocess.TimeoutExpired, Exception):
-                pass
-
-        total_size = 0
-
+        """
+        Calculate Python dependency sizes
+
+        Sizes and installed versions come from the *.dist-info/RECORD files
+        of the project's environments. Every distribution in a dedicated
+        environment belongs to the project; the ones not declared in its
+        configuration are reported as transitive dependencies. A shared
+        interpreter only provides the installed version and location of
+        declared dependencies, its size is not attributed to the project.
+        """
+        environments = get_python_environment_resolver().resolve(project_info.path)
+        if environments:
+            project_info.metadata["python_environment"] = str(environments[0].path)
+            project_info.metadata["python_environment_kind"] = environments[0].kind
+
+        dedicated = [env for env in environments if not env.shared]
+        if not dedicated:
+            self._apply_shared_distributions(project_info, environments)
+            project_info.apply_size(SizeEstimate())
+            return
+
+        installed = self._index_installed_distributions(dedicated)
+        if not installed:
+            project_info.apply_size(SizeEstimate())
+            return
+
+        declared = set()
         for dependency in project_info.dependencies:
-            for site_packages in site_packages_dirs:
-                # Look for package directory
-                package_dirs = [
-                    site_packages / dependency.name,
-                    site_packages / dependency.name.replace("-", "_"),
-                ]
-
-                # Also look for .dist-info directories
-                dist_info_pattern = f"{dependency.name}*.dist-info"
-                dist_info_dirs = list(site_packages.glob(dist_info_pattern))
-                package_dirs.extend(dist_info_dirs)
-
-                for package_dir in package_dirs:
-                    if package_dir.exists():
-                        size = get_directory_size(package_dir)
-                        dependency.size_bytes = max(dependency.size_bytes, size)
-                        dependency.install_path = package_dir
-                        break
-
-                if dependency.size_bytes > 0:
-                    break
+            key = canonicalize_name(dependency.name)
+            distribution = installed.get(key)
+            if distribution is None:
+                continue
+            declared.add(key)
+            dependency.installed_version = distribution.version
+            dependency.install_path = distribution.install_path
+            dependency.apply_size(SizeEstimate(size_bytes=distribution.size_bytes))
+
+        total_size = SizeEstimate()
+        for key, distribution in installed.items():
+            total_size += SizeEstimate(size_bytes=distribution.size_bytes)
+            if key in declared:
+                continue
+            dependency = DependencyInfo(
+                name=distribution.name,
+                version=distribution.version,
+                installed_version=distribution.version,
+                dependency_type=DependencyType.TRANSITIVE,
+                install_path=distribution.install_path,
+            )
+            dependency.apply_size(SizeEstimate(size_bytes=distribution.size_bytes))
+            project_info.dependencies.append(dependency)
 
-            total_size += dependency.size_bytes
+        project_info.metadata["installed_distributions"] = len(installed)
+        project_info.apply_size(total_size)
 
-        project_info.total_size_bytes = total_size
+    def _apply_shared_distributions(
+        self, project_info: ProjectInfo, environments: List[PythonEnvironment]
+    ) -> None:
+        """Record installed versions of declared dependencies in a shared env"""
+        installed = self._index_installed_distributions(environments)
+        for dependency in project_info.dependencies:
+            distribution = installed.get(canonicalize_name(dependency.name))
+            if distribution is not None:
+                dependency.installed_version = distribution.version
+                dependency.install_path = distribution.install_path
+
+    def _index_installed_distributions(
+        self, environments: List[PythonEnvironment]
+    ) -> Dict[str, InstalledDistribution]:
+        """Collect the distributions of the given environments"""
+        installed: Dict[str, InstalledDistribution] = {}
+        for environment in environments:
+            for site_packages in environment.site_packages:
+                index = get_site_packages_index(site_packages)
+                for key, distribution in index.distributions.items():
+                    installed.setdefault(key, distribution)
+        return installed
 
     def _parse_requirements_txt(
         self, file_path: Path, dep_type: DependencyType = DependencyType.PRODUCTION
@@ -193,7 +236,7 @@ class PythonParser(BaseParser):
                         continue
 
                     # Parse package name and version
-                    match = re.match(r"^([a-zA-Z0-9_-]+)([>=<~!]+.*)?", line)
+                    match = re.match(r"^([a-zA-Z0-9._-]+)([>=<~!]+.*)?", line)
                     if match:
                         name = match.group(1)
                         version = match.group(2) or ""
@@ -211,21 +254,11 @@ class PythonParser(BaseParser):
         """Parse pyproject.toml file"""
         dependencies = []
 
-        try:
-            import tomllib
-        except ImportError:
-            try:
-                import tomli as tomllib
-            except ImportError:
-                logger.warning(
-                    "tomllib/tomli not available, cannot parse pyproject.toml"
-                )
-                return dependencies
+        data = safe_load_toml(file_path)
+        if not data:
+            return dependencies
 
         try:
-            with open(file_path, "rb") as f:
-                data = tomllib.load(f)
-
             # Parse dependencies from project.dependencies
             project_deps = data.get("project", {}).get("dependencies", [])
             for dep_spec in project_deps:
@@ -294,19 +327,11 @@ class PythonParser(BaseParser):
         """Parse Pipfile"""
         dependencies = []
 
-        try:
-            import tomllib
-        except ImportError:
-            try:
-                import tomli as tomllib
-            except ImportError:
-                logger.warning("tomllib/tomli not available, cannot parse Pipfile")
-                return dependencies
+        data = safe_load_toml(file_path)
+        if not data:
+            return dependencies
 
         try:
-            with open(file_path, "rb") as f:
-                data = tomllib.load(f)
-
             # Parse packages (production dependencies)
             packages = data.get("packages", {})
             for name, version_spec in packages.items():
@@ -344,7 +369,7 @@ class PythonParser(BaseParser):
 
     def _parse_dependency_spec(self, dep_spec: str) -> Tuple[str, str]:
         """Parse dependency specification like 'requests>=2.25.0'"""
-        match = re.match(r"^([a-zA-Z0-9_-]+)([>=<~!]+.*)?", dep_spec.strip())
+        match = re.match(r"^([a-zA-Z0-9._-]+)([>=<~!]+.*)?", dep_spec.strip())
         if match:
             name = match.group(1)
             version = match.group(2) or ""
@@ -353,20 +378,10 @@ class PythonParser(BaseParser):
 
     def _get_name_from_pyproject(self, file_path: Path) -> Optional[str]:
         """Get project name from pyproject.toml"""
-        try:
-            import tomllib
-        except ImportError:
-            try:
-                import tomli as tomllib
-            except ImportError:
-                return None
-
-        try:
-            with open(file_path, "rb") as f:
-                data = tomllib.load(f)
-            return data.get("project", {}).get("name")
-        except Exception:
+        data = safe_load_toml(file_path)
+        if not data:
             return None
+        return data.get("project", {}).get("name")
 
     def _get_name_from_setup_py(self, file_path: Path) -> Optional[str]:
         """Get project name from setup.py"""
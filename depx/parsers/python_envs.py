@@ -0,0 +1,381 @@
+"""
+Python environment resolver
+
+Find the environments a Python project installs into without starting an
+interpreter. The resolver checks, in order:
+
+- in-project virtual environments (venv, .venv, ...)
+- uv's UV_PROJECT_ENVIRONMENT (shared when it is an absolute path)
+- Poetry and Pipenv environments in their central directories, whose names
+  are derived from the project name and path as the tools do
+- conda environments named in environment.yml
+- pyenv versions and virtualenvs selected by .python-version
+- the "python" found on PATH, or the running interpreter, as a shared
+  fallback
+
+Directory listings and interpreter lookups are memoised until the next
+scan, so resolving thousands of projects costs a few stat() calls each.
+"""
+
+import base64
+import hashlib
+import logging
+import os
+import re
+import shutil
+import sys
+import sysconfig
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from ..utils.toml_utils import safe_load_toml
+from .site_packages import canonicalize_name, find_site_packages
+
+logger = logging.getLogger(__name__)
+
+# In-project environment directories, in priority order
+LOCAL_ENV_DIRECTORIES = ("venv", ".venv", "env", ".env", "virtualenv")
+
+_POETRY_UNSAFE = re.compile(r'[ $`!*@"\\\r\n\t]')
+_PIPENV_UNSAFE = re.compile(r'[ &$`!*@"()\[\]\\\r\n\t]')
+_CONDA_NAME = re.compile(r"^name:\s*['\"]?([^'\"\s#]+)")
+
+
+@dataclass
+class PythonEnvironment:
+    """An environment a project's packages are installed in"""
+
+    path: Path
+    kind: str  # venv, uv, poetry, pipenv, conda, pyenv, interpreter
+    site_packages: List[Path] = field(default_factory=list)
+    python_version: Optional[str] = None
+    shared: bool = False  # True for interpreters used by unrelated projects
+
+
+def read_pyvenv_cfg(env_dir: Path) -> Optional[Dict[str, str]]:
+    """Read pyvenv.cfg ("key = value" lines), None if it does not exist"""
+    try:
+        with open(env_dir / "pyvenv.cfg", "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    config = {}
+    for line in lines:
+        key, sep, value = line.partition("=")
+        if sep:
+            config[key.strip().lower()] = value.strip()
+    return config
+
+
+def _user_cache_dir(app: str) -> Path:
+    """Platform cache directory, as used by Poetry"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+        return Path(base) / app / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / app
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / app
+
+
+def _poetry_env_prefix(project_name: str, project_path: Path) -> str:
+    """
+    Poetry's "<sanitized name>-<hash>" virtualenv name prefix
+
+    Poetry builds it from the canonicalized (PEP 503) package name, so
+    "My_App" and "my.app" both become "my-app".
+    """
+    sanitized = _POETRY_UNSAFE.sub("_", canonicalize_name(project_name))[:42]
+    normalized = os.path.normcase(os.path.realpath(project_path))
+    digest = hashlib.sha256(normalized.encode()).digest()
+    return f"{sanitized}-{base64.urlsafe_b64encode(digest).decode()[:8]}"
+
+
+def _pipenv_env_name(project_path: Path) -> str:
+    """Pipenv's "<sanitized name>-<hash>" virtualenv name"""
+    pipfile = os.path.realpath(project_path / "Pipfile")
+    name = os.path.basename(os.path.dirname(pipfile))
+    sanitized = _PIPENV_UNSAFE.sub("_", name)[:42]
+    digest = hashlib.sha256(pipfile.encode()).digest()[:6]
+    return f"{sanitized}-{base64.urlsafe_b64encode(digest).decode()[:8]}"
+
+
+class PythonEnvironmentResolver:
+    """Resolve and memoise the Python environments of projects"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listings: Dict[Path, List[str]] = {}
+        self._interpreters: Dict[str, Optional[PythonEnvironment]] = {}
+
+    def clear(self) -> None:
+        """Forget memoised listings and interpreters"""
+        with self._lock:
+            self._listings.clear()
+            self._interpreters.clear()
+
+    def _list_directory(self, directory: Path) -> List[str]:
+        """Names in a central environment directory, listed once"""
+        with self._lock:
+            names = self._listings.get(directory)
+        if names is None:
+            try:
+                names = sorted(os.listdir(directory))
+            except OSError:
+                names = []
+            with self._lock:
+                self._listings[directory] = names
+        return names
+
+    def resolve(self, project_path: Path) -> List[PythonEnvironment]:
+        """
+        Find the environments of a project
+
+        Returns:
+            Dedicated environments in priority order; when there are none, a
+            single shared interpreter environment (or nothing)
+        """
+        candidates = [
+            self._environment(project_path / name, "venv")
+            for name in LOCAL_ENV_DIRECTORIES
+        ]
+        candidates.append(self._uv_environment(project_path))
+        candidates.append(self._poetry_environment(project_path))
+        candidates.append(self._pipenv_environment(project_path))
+        candidates.append(self._conda_environment(project_path))
+        candidates.extend(self._pyenv_environments(project_path))
+
+        environments: List[PythonEnvironment] = []
+        seen = set()
+        for environment in candidates:
+            if environment is None or not environment.site_packages:
+                continue
+            key = os.path.normcase(str(environment.path))
+            if key not in seen:
+                seen.add(key)
+                environments.append(environment)
+
+        dedicated = [env for env in environments if not env.shared]
+        if dedicated:
+            return dedicated
+
+        # Nothing dedicated: fall back to the selected or default interpreter
+        if environments:
+            return environments[:1]
+        interpreter = self._default_interpreter()
+        if interpreter is None or not interpreter.site_packages:
+            return []
+        return [interpreter]
+
+    def _environment(
+        self, env_dir: Path, kind: str, shared: bool = False
+    ) -> Optional[PythonEnvironment]:
+        """
+        Describe an environment directory
+
+        Directories without a standard site-packages layout (e.g. a plain
+        "env" folder) get no site_packages and are dropped by resolve().
+        """
+        config = read_pyvenv_cfg(env_dir)
+        if config is None and not env_dir.is_dir():
+            return None
+
+        version = None
+        if config:
+            version = config.get("version_info") or config.get("version")
+            if version and version.count(".") > 2:
+                version = ".".join(version.split(".")[:3])
+        return PythonEnvironment(
+            path=env_dir,
+            kind=kind,
+            site_packages=find_site_packages(env_dir),
+            python_version=version,
+            shared=shared,
+        )
+
+    def _uv_environment(self, project_path: Path) -> Optional[PythonEnvironment]:
+        configured = os.environ.get("UV_PROJECT_ENVIRONMENT")
+        if not configured:
+            return None
+        env_dir = Path(configured).expanduser()
+        if env_dir.is_absolute():
+            # An absolute path is the same environment for every project
+            return self._environment(env_dir, "uv", shared=True)
+        return self._environment(project_path / env_dir, "uv")
+
+    def _poetry_environment(self, project_path: Path) -> Optional[PythonEnvironment]:
+        if not (project_path / "poetry.lock").exists():
+            return None
+        data = safe_load_toml(project_path / "pyproject.toml") or {}
+        # Poetry 2 prefers [project].name over [tool.poetry].name
+        tool = data.get("tool", {}).get("poetry", {})
+        project_name = data.get("project", {}).get("name") or tool.get("name")
+        if not project_name:
+            return None
+
+        virtualenvs = os.environ.get("POETRY_VIRTUALENVS_PATH")
+        if virtualenvs:
+            virtualenvs_dir = Path(virtualenvs).expanduser()
+        else:
+            cache_dir = os.environ.get("POETRY_CACHE_DIR")
+            cache = Path(cache_dir) if cache_dir else _user_cache_dir("pypoetry")
+            virtualenvs_dir = cache / "virtualenvs"
+
+        prefix = _poetry_env_prefix(project_name, project_path) + "-py"
+        for name in reversed(self._list_directory(virtualenvs_dir)):
+            if name.startswith(prefix):
+                return self._environment(virtualenvs_dir / name, "poetry")
+        return None
+
+    def _pipenv_environment(self, project_path: Path) -> Optional[PythonEnvironment]:
+        if not (project_path / "Pipfile").exists():
+            return None
+        workon_home = os.environ.get("WORKON_HOME")
+        if workon_home:
+            virtualenvs_dir = Path(workon_home).expanduser()
+        else:
+            data_home = os.environ.get("XDG_DATA_HOME")
+            base = Path(data_home) if data_home else Path.home() / ".local" / "share"
+            virtualenvs_dir = base / "virtualenvs"
+
+        name = os.environ.get("PIPENV_CUSTOM_VENV_NAME") or _pipenv_env_name(
+            project_path
+        )
+        if name in self._list_directory(virtualenvs_dir):
+            return self._environment(virtualenvs_dir / name, "pipenv")
+        return None
+
+    def _conda_environment(self, project_path: Path) -> Optional[PythonEnvironment]:
+        env_file = project_path / "environment.yml"
+        if not env_file.exists():
+            return None
+        env_name = None
+        try:
+            with open(env_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    match = _CONDA_NAME.match(line)
+                    if match:
+                        env_name = match.group(1)
+                        break
+        except (OSError, UnicodeDecodeError):
+            return None
+        if not env_name:
+            return None
+
+        for envs_dir in self._conda_envs_dirs():
+            if env_name in self._list_directory(envs_dir):
+                return self._environment(envs_dir / env_name, "conda")
+        return None
+
+    def _conda_envs_dirs(self) -> List[Path]:
+        dirs = [
+            Path(entry).expanduser()
+            for entry in os.environ.get("CONDA_ENVS_PATH", "").split(os.pathsep)
+            if entry
+        ]
+        for variable in ("CONDA_ROOT", "CONDA_PREFIX", "MAMBA_ROOT_PREFIX"):
+            prefix = os.environ.get(variable)
+            if prefix:
+                dirs.append(Path(prefix) / "envs")
+                # CONDA_PREFIX may itself be a named environment
+                dirs.append(Path(prefix).parent)
+        home = Path.home()
+        dirs.append(home / ".conda" / "envs")
+        for distribution in ("miniconda3", "anaconda3", "miniforge3", "mambaforge"):
+            dirs.append(home / distribution / "envs")
+        return dirs
+
+    def _pyenv_environments(self, project_path: Path) -> List[PythonEnvironment]:
+        """Versions selected by .python-version under $PYENV_ROOT/versions"""
+        version_file = project_path / ".python-version"
+        if not version_file.exists():
+            return []
+        try:
+            names = version_file.read_text(encoding="utf-8").split()
+        except (OSError, UnicodeDecodeError):
+            return []
+
+        pyenv_root = Path(os.environ.get("PYENV_ROOT") or Path.home() / ".pyenv")
+        versions_dir = pyenv_root / "versions"
+        installed = set(self._list_directory(versions_dir))
+
+        environments = []
+        for name in names:
+            if name.startswith("#") or name not in installed:
+                continue
+            env_dir = versions_dir / name
+            # pyenv-virtualenv environments have pyvenv.cfg; plain versions
+            # are interpreters shared by every project that selects them
+            is_virtualenv = read_pyvenv_cfg(env_dir) is not None
+            environment = self._environment(env_dir, "pyenv", shared=not is_virtualenv)
+            if environment is not None:
+                environments.append(environment)
+        return environments
+
+    def _default_interpreter(self) -> Optional[PythonEnvironment]:
+        """The "python" on PATH, or the running interpreter"""
+        executable = shutil.which("python") or shutil.which("python3")
+        return self.interpreter_environment(executable or sys.executable)
+
+    def interpreter_environment(self, executable: str) -> Optional[PythonEnvironment]:
+        """
+        Describe the environment of an interpreter, memoised per executable
+
+        Virtual environments are recognised by the pyvenv.cfg next to their
+        bin/ (or Scripts/) directory; other interpreters are resolved to
+        their installation prefix. The running interpreter is described
+        with sysconfig.
+        """
+        with self._lock:
+            if executable in self._interpreters:
+                return self._interpreters[executable]
+
+        environment = self._describe_interpreter(executable)
+        with self._lock:
+            self._interpreters[executable] = environment
+        return environment
+
+    def _describe_interpreter(self, executable: str) -> Optional[PythonEnvironment]:
+        if os.path.realpath(executable) == os.path.realpath(sys.executable):
+            paths = sysconfig.get_paths()
+            site_packages = sorted(
+                {Path(paths[key]) for key in ("purelib", "platlib") if key in paths}
+            )
+            return PythonEnvironment(
+                path=Path(sys.prefix),
+                kind="interpreter",
+                site_packages=[path for path in site_packages if path.is_dir()],
+                python_version=".".join(map(str, sys.version_info[:3])),
+                shared=True,
+            )
+
+        env_dir = Path(executable).parent.parent
+        if read_pyvenv_cfg(env_dir) is not None:
+            return self._environment(env_dir, "interpreter", shared=True)
+
+        real = Path(os.path.realpath(executable))
+        prefix = real.parent if sys.platform == "win32" else real.parent.parent
+        return self._environment(prefix, "interpreter", shared=True)
+
+
+_resolver: Optional[PythonEnvironmentResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_python_environment_resolver() -> PythonEnvironmentResolver:
+    """Return the process-wide resolver"""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = PythonEnvironmentResolver()
+        return _resolver
+
+
+def clear_python_environments() -> None:
+    """Forget memoised environments, e.g. at the start of a new scan"""
+    with _resolver_lock:
+        if _resolver is not None:
+            _resolver.clear()
@@ -4,12 +4,13 @@ Rust project parser
 Parse Rust projects with Cargo.toml and Cargo.lock files
 """
 
+import fnmatch
 import logging
-import subprocess
 from pathlib import Path
 from typing import Dict, List, Optional
 
-from ..utils.file_utils import get_directory_size
+from ..utils.file_utils import SizeEstimate
+from ..utils.size_cache import get_cached_size_estimate
 from ..utils.toml_utils import safe_load_toml
 from .base import (
     BaseParser,
@@ -18,6 +19,7 @@ from .base import (
     ProjectInfo,
     ProjectType,
 )
+from .cargo_registry import get_cargo_registry_index
 
 logger = logging.getLogger(__name__)
 
@@ -33,12 +35,53 @@ class RustParser(BaseParser):
     def config_files(self) -> List[str]:
         return ["Cargo.toml", "Cargo.lock"]
 
+    @property
+    def install_directories(self) -> List[str]:
+        return ["target"]
+
+    @property
+    def marker_files(self) -> List[str]:
+        return ["Cargo.toml"]
+
     def can_parse(self, project_path: Path) -> bool:
         """Check if this is a Rust project"""
         return (project_path / "Cargo.toml").exists()
 
     def parse_project(self, project_path: Path) -> Optional[ProjectInfo]:
         """Parse Rust project information"""
+        return self._parse_crate(project_path)
+
+    def parse_projects(self, project_path: Path) -> List[ProjectInfo]:
+        """
+        Parse a Rust project and, for workspaces, all of its member crates
+
+        The shared target/ directory is sized once and attributed to the
+        workspace root; members only report their own dependencies.
+        """
+        root_info = self._parse_crate(project_path)
+        if root_info is None:
+            return []
+
+        members = self._get_workspace_members(project_path)
+        if not members:
+            return [root_info]
+
+        root_info.metadata["workspace_members"] = [
+            member.relative_to(project_path).as_posix() for member in members
+        ]
+
+        projects = [root_info]
+        for member in members:
+            member_info = self._parse_crate(member, workspace_root=project_path)
+            if member_info:
+                projects.append(member_info)
+
+        return projects
+
+    def _parse_crate(
+        self, project_path: Path, workspace_root: Optional[Path] = None
+    ) -> Optional[ProjectInfo]:
+        """Parse a single crate, optionally as a member of a workspace"""
         if not self.can_parse(project_path):
             return None
 
@@ -59,6 +102,9 @@ class RustParser(BaseParser):
             },
         )
 
+        if workspace_root is not None:
+            project_info.metadata["workspace_root"] = str(workspace_root)
+
         # Parse dependencies
         project_info.dependencies = self.get_dependencies(project_info)
 
@@ -75,7 +121,9 @@ class RustParser(BaseParser):
         dependencies.extend(self._parse_cargo_toml(cargo_toml))
 
         # Also parse Cargo.lock if available for exact versions
-        cargo_lock = project_info.path / "Cargo.lock"
+        # (workspace members share the lock file of the workspace root)
+        lock_dir = project_info.metadata.get("workspace_root") or project_info.path
+        cargo_lock = Path(lock_dir) / "Cargo.lock"
         if cargo_lock.exists():
             lock_deps = self._parse_cargo_lock(cargo_lock)
             self._merge_lock_info(dependencies, lock_deps)
@@ -84,24 +132,27 @@ class RustParser(BaseParser):
 
     def calculate_dependency_sizes(self, project_info: ProjectInfo) -> None:
         """Calculate Rust dependency sizes"""
-        total_size = 0
+        total_size = SizeEstimate()
 
         # Check target directory
         target_dir = project_info.path / "target"
         if target_dir.exists():
-            target_size = get_directory_size(target_dir)
-            total_size += target_size
-
-        # Check Cargo registry cache
-        cargo_cache = self._get_cargo_cache_dir()
-        if cargo_cache and cargo_cache.exists():
-            for dependency in project_info.dependencies:
-                cache_path = self._find_crate_in_cache(dependency.name, cargo_cache)
-                if cache_path:
-                    dependency.size_bytes = get_directory_size(cache_path)
-                    dependency.install_path = cache_path
-
-        project_info.total_size_bytes = total_size
+            total_size += get_cached_size_estimate(target_dir)
+
+        # Look up each crate in the shared registry index, using the exact
+        # Cargo.lock version when one is known
+        registry = get_cargo_registry_index()
+        for dependency in project_info.dependencies:
+            location = registry.find(dependency.name, dependency.installed_version)
+            if location is None:
+                continue
+            size = SizeEstimate(size_bytes=location.archive_bytes)
+            if location.source_dir is not None:
+                size += get_cached_size_estimate(location.source_dir)
+            dependency.apply_size(size)
+            dependency.install_path = location.path
+
+        project_info.apply_size(total_size)
 
     def _parse_cargo_toml(self, cargo_toml: Path) -> List[DependencyInfo]:
         """Parse Cargo.toml dependencies"""
@@ -112,7 +163,6 @@ class RustParser(BaseParser):
             return dependencies
 
         try:
-
             # Parse regular dependencies
             deps = data.get("dependencies", {})
             for name, spec in deps.items():
@@ -160,7 +210,6 @@ class RustParser(BaseParser):
             return lock_deps
 
         try:
-
             packages = data.get("package", [])
             for package in packages:
                 name = package.get("name")
@@ -192,65 +241,58 @@ class RustParser(BaseParser):
 
     def _get_name_from_cargo_toml(self, cargo_toml: Path) -> Optional[str]:
         """Get package name from Cargo.toml"""
-        try:
-            import tomllib
-        except ImportError:
-            try:
-                import tomli as tomllib
-            except ImportError:
-                return None
-
-        try:
-            with open(cargo_toml, "rb") as f:
-                data = tomllib.load(f)
-
-            package = data.get("package", {})
-            return package.get("name")
-
-        except Exception:
-            pass
-        return None
+        data = safe_load_toml(cargo_toml)
+        if not data:
+            return None
+        return data.get("package", {}).get("name")
 
     def _get_edition(self, cargo_toml: Path) -> Optional[str]:
         """Get Rust edition from Cargo.toml"""
-        try:
-            import tomllib
-        except ImportError:
+        data = safe_load_toml(cargo_toml)
+        if not data:
+            return None
+        return data.get("package", {}).get("edition")
+
+    def _get_workspace_members(self, project_path: Path) -> List[Path]:
+        """Expand [workspace].members globs, honoring [workspace].exclude"""
+        data = safe_load_toml(project_path / "Cargo.toml")
+        workspace = data.get("workspace") if data else None
+        if not isinstance(workspace, dict):
+            return []
+
+        excludes = [
+            pattern.strip("/") for pattern in workspace.get("exclude", []) or []
+        ]
+        members = []
+        seen = set()
+
+        for pattern in workspace.get("members", []) or []:
             try:
-                import tomli as tomllib
-            except ImportError:
-                return None
-
-        try:
-            with open(cargo_toml, "rb") as f:
-                data = tomllib.load(f)
+                candidates = sorted(project_path.glob(pattern.strip("/")))
+            except (ValueError, OSError) as e:
+                logger.warning(f"Invalid workspace member pattern: {pattern}, {e}")
+                continue
 
-            package = data.get("package", {})
-            return package.get("edition")
-
-        except Exception:
-            pass
-        return None
+            for candidate in candidates:
+                try:
+                    relative = candidate.relative_to(project_path).as_posix()
+                except ValueError:
+                    continue
+                if relative in seen or relative == ".":
+                    continue
+                if any(fnmatch.fnmatch(relative, exclude) for exclude in excludes):
+                    continue
+                if not (candidate / "Cargo.toml").is_file():
+                    continue
+                seen.add(relative)
+                members.append(candidate)
+
+        return members
 
     def _is_workspace(self, cargo_toml: Path) -> bool:
         """Check if this is a Cargo workspace"""
-        try:
-            import tomllib
-        except ImportError:
-            try:
-                import tomli as tomllib
-            except ImportError:
-                return False
-
-        try:
-            with open(cargo_toml, "rb") as f:
-                data = tomllib.load(f)
-
-            return "workspace" in data
-
-        except Exception:
-            pass
-        return False
+        data = safe_load_toml(cargo_toml)
+        return bool(data) and "workspace" in data
 
     def _detect_rust_version(self, project_path: Path) -> Optional[str]:
         """Detect Rust version requirement"""
@@ -266,53 +308,8 @@ class RustParser(BaseParser):
         # Check rust-toolchain.toml
         toolchain_toml = project_path / "rust-toolchain.toml"
         if toolchain_toml.exists():
-            try:
-                import tomllib
-            except ImportError:
-                try:
-                    import tomli as tomllib
-                except ImportError:
-                    return None
-
-            try:
-                with open(toolchain_toml, "rb") as f:
-                    data = tomllib.load(f)
+            data = safe_load_toml(toolchain_toml)
+            if data:
                 return data.get("toolchain", {}).get("channel")
-            except Exception:
-                pass
-
-        return None
-
-    def _get_cargo_cache_dir(self) -> Optional[Path]:
-        """Get Cargo cache directory"""
-        try:
-            result = subprocess.run(
-                ["cargo", "--version"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-            if result.returncode == 0:
-                # Cargo cache is typically in ~/.cargo
-                cargo_home = Path.home() / ".cargo"
-                if cargo_home.exists():
-                    return cargo_home / "registry"
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-
-        return None
-
-    def _find_crate_in_cache(self, crate_name: str, cache_dir: Path) -> Optional[Path]:
-        """Find crate in Cargo cache directory"""
-        # Cargo stores crates in registry/src/index.crates.io-*/crate_name-version
-        try:
-            src_dirs = list(cache_dir.glob("src/index.crates.io-*"))
-            for src_dir in src_dirs:
-                crate_dirs = list(src_dir.glob(f"{crate_name}-*"))
-                if crate_dirs:
-                    # Return the first match (could be improved to find latest version)
-                    return crate_dirs[0]
-        except Exception:
-            pass
 
         return None
@@ -0,0 +1,214 @@
+"""
+site-packages index
+
+Index the distributions installed in a site-packages directory from their
+*.dist-info metadata. RECORD lists every installed file together with its
+size, so each distribution is sized exactly without walking the package
+directories. Names are normalised as in PEP 503 so "Django", "django"
+and "zope.interface" / "zope_interface" match their requirements.
+"""
+
+import csv
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_NORMALIZE = re.compile(r"[-_.]+")
+_DIST_INFO_SUFFIX = ".dist-info"
+_EGG_INFO_SUFFIX = ".egg-info"
+
+
+def canonicalize_name(name: str) -> str:
+    """Normalise a distribution name as described in PEP 503"""
+    return _NORMALIZE.sub("-", name).lower()
+
+
+@dataclass
+class InstalledDistribution:
+    """A distribution installed in a site-packages directory"""
+
+    name: str
+    version: str
+    metadata_dir: Path  # *.dist-info or *.egg-info
+    size_bytes: int = 0
+    file_count: int = 0
+    top_level: Optional[Path] = None  # main package directory or module
+
+    @property
+    def install_path(self) -> Path:
+        return self.top_level or self.metadata_dir
+
+
+def find_site_packages(env_dir: Path) -> List[Path]:
+    """
+    Locate the site-packages directories of a virtual environment
+
+    Only the standard layouts are checked (lib/pythonX.Y/site-packages and
+    Lib/site-packages), so the environment is never walked.
+    """
+    found = []
+    windows = env_dir / "Lib" / "site-packages"
+    if windows.is_dir():
+        found.append(windows)
+
+    for lib_name in ("lib", "lib64"):
+        lib_dir = env_dir / lib_name
+        if lib_dir.is_symlink():
+            # lib64 -> lib on most Linux venvs
+            continue
+        try:
+            with os.scandir(lib_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(("python", "pypy")):
+                        candidate = Path(entry.path) / "site-packages"
+                        if candidate.is_dir():
+                            found.append(candidate)
+        except OSError:
+            continue
+
+    return sorted(set(found))
+
+
+def _split_metadata_dir_name(dir_name: str, suffix: str) -> Optional[Tuple[str, str]]:
+    """Split "<name>-<version>.dist-info" into (name, version)"""
+    stem = dir_name[: -len(suffix)]
+    name, sep, version = stem.partition("-")
+    if not name:
+        return None
+    # egg-info names may carry a "-pyX.Y" tag after the version
+    version = version.split("-py", 1)[0] if sep else ""
+    return name, version
+
+
+class SitePackagesIndex:
+    """
+    Canonical name -> installed distribution index of one site-packages
+
+    The directory is listed once and every RECORD is read once, lazily on
+    first use.
+    """
+
+    def __init__(self, site_packages: Path):
+        self.site_packages = site_packages
+        self._distributions: Optional[Dict[str, InstalledDistribution]] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    @property
+    def distributions(self) -> Dict[str, InstalledDistribution]:
+        distributions = self._distributions
+        if distributions is None:
+            with self._lock:
+                if self._distributions is None:
+                    self._distributions = self._build()
+                    self.builds += 1
+                distributions = self._distributions
+        return distributions
+
+    def find(self, name: str) -> Optional[InstalledDistribution]:
+        """Look up a distribution by any spelling of its name"""
+        return self.distributions.get(canonicalize_name(name))
+
+    def _build(self) -> Dict[str, InstalledDistribution]:
+        distributions: Dict[str, InstalledDistribution] = {}
+        try:
+            with os.scandir(self.site_packages) as entries:
+                metadata_dirs = [
+                    entry
+                    for entry in entries
+                    if entry.name.endswith((_DIST_INFO_SUFFIX, _EGG_INFO_SUFFIX))
+                ]
+        except OSError as e:
+            logger.debug(f"Cannot list site-packages {self.site_packages}: {e}")
+            return distributions
+
+        for entry in sorted(metadata_dirs, key=lambda item: item.name):
+            is_dist_info = entry.name.endswith(_DIST_INFO_SUFFIX)
+            suffix = _DIST_INFO_SUFFIX if is_dist_info else _EGG_INFO_SUFFIX
+            parsed = _split_metadata_dir_name(entry.name, suffix)
+            if parsed is None:
+                continue
+            name, version = parsed
+            distribution = InstalledDistribution(
+                name=name, version=version, metadata_dir=Path(entry.path)
+            )
+            if is_dist_info:
+                self._read_record(distribution)
+            distributions.setdefault(canonicalize_name(name), distribution)
+
+        return distributions
+
+    def _read_record(self, distribution: InstalledDistribution) -> None:
+        """Sum the file sizes listed in RECORD and find the top-level package"""
+        record = distribution.metadata_dir / "RECORD"
+        top_levels: Dict[str, int] = {}
+        try:
+            with open(record, "r", encoding="utf-8", newline="") as f:
+                for row in csv.reader(f):
+                    if not row or not row[0]:
+                        continue
+                    path = row[0]
+                    size = row[2] if len(row) > 2 else ""
+                    distribution.file_count += 1
+                    if size.isdigit():
+                        distribution.size_bytes += int(size)
+                    else:
+                        # RECORD itself and generated *.pyc carry no size
+                        distribution.size_bytes += self._stat_size(path)
+
+                    top = path.replace("\\", "/").split("/", 1)[0]
+                    if (
+                        top
+                        and top != ".."
+                        and not top.endswith((_DIST_INFO_SUFFIX, ".data"))
+                    ):
+                        top_levels[top] = top_levels.get(top, 0) + 1
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            logger.debug(f"Cannot read {record}: {e}")
+            return
+
+        if top_levels:
+            canonical = canonicalize_name(distribution.name)
+            preferred = [
+                top
+                for top in top_levels
+                if canonicalize_name(top.split(".")[0]) == canonical
+            ]
+            top = preferred[0] if preferred else max(top_levels, key=top_levels.get)
+            distribution.top_level = self.site_packages / top
+
+    def _stat_size(self, path: str) -> int:
+        try:
+            return os.stat(os.path.join(self.site_packages, path)).st_size
+        except OSError:
+            return 0
+
+    def clear(self) -> None:
+        """Drop the index; the next lookup lists the directory again"""
+        with self._lock:
+            self._distributions = None
+
+
+_indexes: Dict[Path, SitePackagesIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_site_packages_index(site_packages: Path) -> SitePackagesIndex:
+    """Return the process-wide index of a site-packages directory"""
+    with _indexes_lock:
+        index = _indexes.get(site_packages)
+        if index is None:
+            index = _indexes[site_packages] = SitePackagesIndex(site_packages)
+        return index
+
+
+def clear_site_packages_indexes() -> None:
+    """Forget every indexed site-packages, e.g. at the start of a new scan"""
+    with _indexes_lock:
+        _indexes.clear()
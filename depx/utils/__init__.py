@@ -6,10 +6,13 @@ Depx 工具模块
 
 from .file_utils import (
     find_files_by_pattern,
+    format_size_with_error,
     get_directory_size,
+    get_disk_usage,
     is_hidden_directory,
     safe_read_json,
 )
+from .path_matcher import PathMatcher
 from .toml_utils import (
     ensure_toml_support,
     get_available_toml_library,
@@ -18,9 +21,12 @@ from .toml_utils import (
 
 __all__ = [
     "get_directory_size",
+    "get_disk_usage",
     "find_files_by_pattern",
+    "format_size_with_error",
     "is_hidden_directory",
     "safe_read_json",
+    "PathMatcher",
     "safe_load_toml",
     "ensure_toml_support",
     "get_available_toml_library",
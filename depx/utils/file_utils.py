@@ -6,39 +6,592 @@
 
 import json
 import logging
+import math
 import os
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Generator, Optional
+from typing import Any, Dict, FrozenSet, Generator, List, Optional, Set, Tuple
+
+from .performance import internal_wait
 
 logger = logging.getLogger(__name__)
 
+# 默认跳过的目录名（版本控制、IDE、缓存）
+DEFAULT_SKIP_DIRECTORIES = frozenset(
+    {
+        ".git",
+        ".svn",
+        ".hg",  # 版本控制
+        ".vscode",
+        ".idea",  # IDE
+        "__pycache__",
+        ".pytest_cache",  # Python
+    }
+)
+
+
+@dataclass
+class DirectorySnapshot:
+    """目录列表快照（一次 scandir 的结果）"""
 
-def get_directory_size(directory: Path) -> int:
+    path: Path  # 目录路径
+    file_names: FrozenSet[str]  # 目录下的文件名
+    dir_names: List[str]  # 目录下的子目录名（保持列表顺序）
+    entries: Dict[str, os.DirEntry] = field(default_factory=dict)  # 原始目录项
+    link_names: FrozenSet[str] = frozenset()  # 指向目录的符号链接名
+    stat: Optional[os.stat_result] = None  # 目录自身的 stat 结果（如已获取）
+
+    def has_file(self, name: str) -> bool:
+        """判断目录下是否存在指定文件"""
+        return name in self.file_names
+
+    def has_suffix(self, suffix: str) -> bool:
+        """判断目录下是否存在指定扩展名的文件"""
+        return any(name.endswith(suffix) for name in self.file_names)
+
+    def files_with_suffix(self, suffix: str) -> List[Path]:
+        """返回指定扩展名的文件路径（按名称排序）"""
+        return [
+            self.path / name
+            for name in sorted(self.file_names)
+            if name.endswith(suffix)
+        ]
+
+
+def read_directory_snapshot(
+    directory: Path, stat_result: Optional[os.stat_result] = None
+) -> DirectorySnapshot:
     """
-    计算目录的总大小（字节）
+    读取目录快照，每个目录只调用一次 os.scandir
+
+    文件/目录类型来自 DirEntry 缓存的 d_type，只有符号链接才需要额外 stat。
+
+    Args:
+        directory: 目录路径
+        stat_result: 调用方已获取的目录 stat 结果，会原样保存在快照中
+
+    Returns:
+        目录快照
+
+    Raises:
+        OSError: 目录无法读取时抛出
+    """
+    file_names = set()
+    dir_names = []
+    link_names = set()
+    entries = {}
+
+    with os.scandir(directory) as iterator:
+        for entry in iterator:
+            entries[entry.name] = entry
+            try:
+                if entry.is_dir():
+                    dir_names.append(entry.name)
+                    if entry.is_symlink():
+                        link_names.add(entry.name)
+                elif entry.is_file():
+                    file_names.add(entry.name)
+            except OSError:
+                # 失效的符号链接等
+                continue
+
+    return DirectorySnapshot(
+        path=directory,
+        file_names=frozenset(file_names),
+        dir_names=dir_names,
+        entries=entries,
+        link_names=frozenset(link_names),
+        stat=stat_result,
+    )
+
+
+@dataclass
+class DiskUsage:
+    """目录磁盘占用统计"""
+
+    apparent_bytes: int = 0  # 文件内容大小之和（st_size）
+    allocated_bytes: int = 0  # 实际分配的磁盘空间（st_blocks * 512）
+    file_count: int = 0  # 计入统计的文件数（硬链接只计一次）
+
+    def __add__(self, other: "DiskUsage") -> "DiskUsage":
+        return DiskUsage(
+            apparent_bytes=self.apparent_bytes + other.apparent_bytes,
+            allocated_bytes=self.allocated_bytes + other.allocated_bytes,
+            file_count=self.file_count + other.file_count,
+        )
+
+
+class InodeLedger:
+    """
+    硬链接去重记录（线程安全）
+
+    在多次目录统计之间共享时，同一个 (st_dev, st_ino) 只会被计入一次，
+    与 du 对多个参数的处理方式一致。
+    """
+
+    def __init__(self):
+        self._seen: Set[Tuple[int, int]] = set()
+        self._lock = threading.Lock()
+
+    def claim(self, device: int, inode: int) -> bool:
+        """
+        登记一个 inode
+
+        Returns:
+            首次出现时返回 True，已计入过时返回 False
+        """
+        key = (device, inode)
+        with self._lock:
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+            return True
+
+
+class ScanInodeLedger:
+    """
+    一次扫描内跨目录的硬链接去重记录（线程安全）
+
+    记录每个 inode 首次由哪个目录的统计计入。之后统计与该目录无关
+    （既不是其祖先也不是其子孙）的目录时，这些文件不再计入，例如多个
+    项目硬链接到同一个 pnpm 内容仓库；嵌套的目录（node_modules 与其中
+    的包）仍各自完整统计。
+    """
+
+    def __init__(self):
+        self._owners: Dict[Tuple[int, int], str] = {}
+        self._lock = threading.Lock()
+
+    def ledger_for(self, directory: Path) -> "ScopedInodeLedger":
+        """返回统计 directory 时使用的去重记录"""
+        return ScopedInodeLedger(self, os.path.realpath(directory))
+
+    def claim(self, device: int, inode: int, root: str) -> bool:
+        """
+        以 root 的名义登记一个 inode
+
+        Returns:
+            首次出现或已由相关目录计入时返回 True，已由无关目录计入时返回 False
+        """
+        with self._lock:
+            owner = self._owners.setdefault((device, inode), root)
+        return (
+            owner == root
+            or owner.startswith(root.rstrip(os.sep) + os.sep)
+            or root.startswith(owner.rstrip(os.sep) + os.sep)
+        )
+
+
+class ScopedInodeLedger(InodeLedger):
+    """统计单个目录时使用的去重记录，同时参与扫描级的去重"""
+
+    def __init__(self, scan_ledger: ScanInodeLedger, root: str):
+        super().__init__()
+        self.scan_ledger = scan_ledger
+        self.root = root
+        self.shared = False  # 是否有文件因已由无关目录计入而被跳过
+
+    def claim(self, device: int, inode: int) -> bool:
+        if not super().claim(device, inode):
+            return False
+        if self.scan_ledger.claim(device, inode, self.root):
+            return True
+        self.shared = True
+        return False
+
+
+def _allocated_bytes(stat_result: os.stat_result) -> int:
+    """返回实际分配的字节数，不支持 st_blocks 的平台退回 st_size"""
+    blocks = getattr(stat_result, "st_blocks", None)
+    if blocks is None:
+        return stat_result.st_size
+    return blocks * 512
+
+
+def get_disk_usage(
+    directory: Path, ledger: Optional[InodeLedger] = None, parallel: bool = False
+) -> DiskUsage:
+    """
+    统计目录的磁盘占用
+
+    使用 os.scandir 迭代遍历，每个目录项只调用一次 DirEntry.stat()；
+    不跟随符号链接，硬链接按 (st_dev, st_ino) 只计一次。
 
     Args:
         directory: 目录路径
+        ledger: 跨多次统计共享的硬链接去重记录，默认只在本次统计内去重
+        parallel: 是否把子目录分发到共享的统计线程池（适合巨大的目录树）
 
     Returns:
-        目录总大小（字节）
+        磁盘占用统计，目录无法访问时返回全零
     """
-    total_size = 0
+    if ledger is None:
+        ledger = InodeLedger()
+
     try:
-        for dirpath, dirnames, filenames in os.walk(directory):
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                try:
-                    if os.path.exists(filepath):
-                        total_size += os.path.getsize(filepath)
-                except (OSError, IOError) as e:
-                    logger.warning(f"无法获取文件大小: {filepath}, 错误: {e}")
-                    continue
-    except (OSError, IOError) as e:
+        with os.scandir(directory) as iterator:
+            root_entries = list(iterator)
+    except OSError as e:
         logger.error(f"无法访问目录: {directory}, 错误: {e}")
-        return 0
+        return DiskUsage()
+
+    if parallel:
+        return _get_sizing_pool().measure(root_entries, ledger)
+
+    usage = DiskUsage()
+    pending: List[str] = []
+    _accumulate(root_entries, ledger, usage, pending)
+
+    while pending:
+        entries = _list_directory(pending.pop())
+        if entries is not None:
+            _accumulate(entries, ledger, usage, pending)
+
+    return usage
+
+
+def _list_directory(path: str) -> Optional[List[os.DirEntry]]:
+    """列出目录条目，失败时记录警告并返回 None"""
+    try:
+        with os.scandir(path) as iterator:
+            return list(iterator)
+    except OSError as e:
+        logger.warning(f"无法访问目录: {path}, 错误: {e}")
+        return None
+
+
+def _accumulate(
+    entries: List[os.DirEntry],
+    ledger: InodeLedger,
+    usage: DiskUsage,
+    subdirectories: List[str],
+) -> None:
+    """将一个目录的条目计入 usage，子目录路径追加到 subdirectories"""
+    for entry in entries:
+        try:
+            stat_result = entry.stat(follow_symlinks=False)
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError as e:
+            logger.warning(f"无法获取文件大小: {entry.path}, 错误: {e}")
+            continue
+
+        if is_dir:
+            subdirectories.append(entry.path)
+            usage.allocated_bytes += _allocated_bytes(stat_result)
+            continue
+
+        if stat_result.st_nlink > 1 and not ledger.claim(
+            stat_result.st_dev, stat_result.st_ino
+        ):
+            continue
+
+        usage.apparent_bytes += stat_result.st_size
+        usage.allocated_bytes += _allocated_bytes(stat_result)
+        usage.file_count += 1
+
+
+class _SizingJob:
+    """一次并行统计的共享状态"""
+
+    def __init__(self, ledger: InodeLedger):
+        self.ledger = ledger
+        self.usage = DiskUsage()
+        self._outstanding = 1  # 调用线程自身的遍历
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def add_task(self) -> None:
+        with self._lock:
+            self._outstanding += 1
+
+    def finish_task(self, partial: DiskUsage) -> None:
+        with self._lock:
+            self.usage = self.usage + partial
+            self._outstanding -= 1
+            if self._outstanding == 0:
+                self._done.set()
+
+    def wait(self) -> DiskUsage:
+        with internal_wait():
+            self._done.wait()
+        return self.usage
+
+
+class _SizingPool:
+    """
+    目录大小统计的共享线程池
+
+    每个任务在本地栈上深度优先遍历；发现子目录时若池中还有空闲线程，
+    就把子目录交给线程池，否则留给自己继续处理。调用线程也参与遍历，
+    任务之间从不相互等待，因此不会出现线程池饥饿导致的死锁。
+    """
 
-    return total_size
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="depx-size"
+        )
+        self._lock = threading.Lock()
+        self._busy = 0
+
+    def measure(
+        self, root_entries: List[os.DirEntry], ledger: InodeLedger
+    ) -> DiskUsage:
+        """统计已列出的根目录条目及其全部子目录"""
+        job = _SizingJob(ledger)
+        usage = DiskUsage()
+        pending: List[str] = []
+        _accumulate(root_entries, ledger, usage, pending)
+        self._walk(job, pending, usage)
+        return job.wait()
+
+    def _try_reserve(self) -> bool:
+        """有空闲线程时占用一个并返回 True"""
+        with self._lock:
+            if self._busy >= self.max_workers:
+                return False
+            self._busy += 1
+            return True
+
+    def _run(self, job: _SizingJob, path: str) -> None:
+        try:
+            self._walk(job, [path], DiskUsage())
+        finally:
+            with self._lock:
+                self._busy -= 1
+
+    def _walk(self, job: _SizingJob, stack: List[str], usage: DiskUsage) -> None:
+        try:
+            while stack:
+                entries = _list_directory(stack.pop())
+                if entries is None:
+                    continue
+
+                subdirectories: List[str] = []
+                _accumulate(entries, job.ledger, usage, subdirectories)
+                for path in subdirectories:
+                    if self._try_reserve():
+                        job.add_task()
+                        try:
+                            self._executor.submit(self._run, job, path)
+                            continue
+                        except RuntimeError:
+                            # 解释器退出时线程池已关闭，改为自己处理
+                            with self._lock:
+                                self._busy -= 1
+                            job.finish_task(DiskUsage())
+                    stack.append(path)
+        finally:
+            job.finish_task(usage)
+
+
+_sizing_pool: Optional[_SizingPool] = None
+_sizing_pool_lock = threading.Lock()
+
+
+def _get_sizing_pool() -> _SizingPool:
+    """获取（必要时创建）共享的统计线程池"""
+    global _sizing_pool
+
+    with _sizing_pool_lock:
+        if _sizing_pool is None:
+            _sizing_pool = _SizingPool(min(32, (os.cpu_count() or 1) + 4))
+        return _sizing_pool
+
+
+def _reset_sizing_pool() -> None:
+    """fork 出的子进程中丢弃继承的线程池，其工作线程在子进程中并不存在"""
+    global _sizing_pool, _sizing_pool_lock
+
+    _sizing_pool = None
+    _sizing_pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_sizing_pool)
+
+
+# 95% 置信区间对应的 z 值
+CONFIDENCE_Z = 1.96
+
+# 抽样估计时每个目录最多 stat 的文件数 / 最多进入的子目录数
+DEFAULT_SAMPLE_FILES = 32
+DEFAULT_SAMPLE_SUBDIRECTORIES = 32
+
+
+@dataclass
+class SizeEstimate:
+    """目录大小估计值（精确统计时方差为 0）"""
+
+    size_bytes: int = 0  # 估计的内容大小（字节）
+    variance: float = 0.0  # 估计量的方差
+    exact: bool = True  # 是否为精确统计
+
+    @property
+    def error_bytes(self) -> int:
+        """95% 置信区间的半宽（字节）"""
+        return int(round(CONFIDENCE_Z * math.sqrt(self.variance)))
+
+    def __add__(self, other: "SizeEstimate") -> "SizeEstimate":
+        # 各目录的抽样相互独立，方差直接相加
+        return SizeEstimate(
+            size_bytes=self.size_bytes + other.size_bytes,
+            variance=self.variance + other.variance,
+            exact=self.exact and other.exact,
+        )
+
+
+def _sample_variance(values: List[float]) -> float:
+    """样本方差（n - 1 作分母），少于两个样本时返回 0"""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean = sum(values) / n
+    return sum((value - mean) ** 2 for value in values) / (n - 1)
+
+
+class _EstimateNode:
+    """抽样估计中的一个目录"""
+
+    __slots__ = ("path", "total", "variance", "exact", "subdirectory_count", "children")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.total = 0.0
+        self.variance = 0.0
+        self.exact = True
+        self.subdirectory_count = 0
+        self.children: List["_EstimateNode"] = []
+
+    def add_files(
+        self, files: List[os.DirEntry], max_files: int, rng: random.Random
+    ) -> None:
+        """估计本目录文件的大小：抽样 stat，按总数外推"""
+        count = len(files)
+        sample = files if count <= max_files else rng.sample(files, max_files)
+
+        sizes = []
+        for entry in sample:
+            try:
+                sizes.append(float(entry.stat(follow_symlinks=False).st_size))
+            except OSError as e:
+                logger.warning(f"无法获取文件大小: {entry.path}, 错误: {e}")
+                sizes.append(0.0)
+
+        if not sizes:
+            return
+
+        n = len(sizes)
+        self.total += count * sum(sizes) / n
+        if n < count:
+            self.exact = False
+            self.variance += (
+                count * count * (1 - n / count) * _sample_variance(sizes) / n
+            )
+
+    def finish(self) -> None:
+        """合并子目录的估计（两阶段抽样）"""
+        sampled = len(self.children)
+        if not sampled:
+            return
+
+        scale = self.subdirectory_count / sampled
+        totals = [child.total for child in self.children]
+        self.total += scale * sum(totals)
+        self.variance += scale * sum(child.variance for child in self.children)
+        self.exact = self.exact and all(child.exact for child in self.children)
+
+        if sampled < self.subdirectory_count:
+            self.exact = False
+            self.variance += (
+                self.subdirectory_count**2
+                * (1 - sampled / self.subdirectory_count)
+                * _sample_variance(totals)
+                / sampled
+            )
+
+
+def estimate_disk_usage(
+    directory: Path,
+    max_files: int = DEFAULT_SAMPLE_FILES,
+    max_subdirectories: int = DEFAULT_SAMPLE_SUBDIRECTORIES,
+    seed: Optional[int] = None,
+) -> SizeEstimate:
+    """
+    抽样估计目录的内容大小
+
+    每个目录仍然 scandir 一次以获得条目数，但只 stat 随机抽取的最多
+    max_files 个文件、只进入随机抽取的最多 max_subdirectories 个子目录，
+    再按总数外推（两阶段整群抽样）。小目录会被完整统计，结果是精确的。
+
+    Args:
+        directory: 目录路径
+        max_files: 每个目录最多 stat 的文件数
+        max_subdirectories: 每个目录最多进入的子目录数（至少为 2）
+        seed: 随机种子，默认由路径决定，保证结果可复现
+
+    Returns:
+        大小估计值，目录无法访问时返回 0
+    """
+    rng = random.Random(seed if seed is not None else str(directory))
+    max_subdirectories = max(2, max_subdirectories)
+
+    root = _EstimateNode(str(directory))
+    stack = [(root, False)]
+
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            node.finish()
+            continue
+
+        entries = _list_directory(node.path)
+        if entries is None:
+            if node is root:
+                return SizeEstimate()
+            continue
+
+        files = []
+        subdirectories = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirectories.append(entry.path)
+                else:
+                    files.append(entry)
+            except OSError:
+                continue
+
+        node.add_files(files, max_files, rng)
+
+        node.subdirectory_count = len(subdirectories)
+        if len(subdirectories) > max_subdirectories:
+            subdirectories = rng.sample(subdirectories, max_subdirectories)
+        node.children = [_EstimateNode(path) for path in subdirectories]
+
+        stack.append((node, True))
+        stack.extend((child, False) for child in node.children)
+
+    return SizeEstimate(
+        size_bytes=int(round(root.total)), variance=root.variance, exact=root.exact
+    )
+
+
+def get_directory_size(directory: Path, ledger: Optional[InodeLedger] = None) -> int:
+    """
+    计算目录的总大小（字节）
+
+    Args:
+        directory: 目录路径
+        ledger: 跨多次统计共享的硬链接去重记录
+
+    Returns:
+        目录总大小（字节，按文件内容大小计算，硬链接只计一次）
+    """
+    return get_disk_usage(directory, ledger).apparent_bytes
 
 
 def find_files_by_pattern(root_dir: Path, pattern: str) -> Generator[Path, None, None]:
@@ -70,24 +623,8 @@ def is_hidden_directory(path: Path) -> bool:
     Returns:
         是否应该跳过该目录
     """
-    skip_dirs = {
-        ".git",
-        ".svn",
-        ".hg",  # 版本控制
-        ".vscode",
-        ".idea",  # IDE
-        "__pycache__",
-        ".pytest_cache",  # Python
-        "node_modules/.cache",  # Node.js 缓存
-        ".DS_Store",  # macOS
-        "Thumbs.db",  # Windows
-    }
-
-    return (
-        path.name.startswith(".")
-        or path.name in skip_dirs
-        or any(skip_dir in str(path) for skip_dir in skip_dirs)
-    )
+    name = path.name
+    return name.startswith(".") or name in DEFAULT_SKIP_DIRECTORIES
 
 
 def safe_read_json(file_path: Path) -> Optional[Dict[str, Any]]:
@@ -130,3 +667,19 @@ def format_size(size_bytes: int) -> str:
         i += 1
 
     return f"{size:.1f} {size_names[i]}"
+
+
+def format_size_with_error(size_bytes: int, error_bytes: int = 0) -> str:
+    """
+    格式化文件大小，带估计误差时附加 "± 误差"
+
+    Args:
+        size_bytes: 字节数
+        error_bytes: 95% 置信误差（字节），0 表示精确值
+
+    Returns:
+        格式化后的大小字符串
+    """
+    if error_bytes > 0:
+        return f"{format_size(size_bytes)} ± {format_size(error_bytes)}"
+    return format_size(size_bytes)
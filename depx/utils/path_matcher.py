@@ -0,0 +1,284 @@
+"""
+路径匹配工具模块
+
+将配置中的 include/exclude 模式和忽略目录编译为一个匹配器，
+扫描时每个目录只需一次集合查找，必要时再做一次正则匹配
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Iterable, List, Optional, Pattern, Sequence, Tuple
+
+from .file_utils import DEFAULT_SKIP_DIRECTORIES
+
+# glob 通配符
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _has_glob(pattern: str) -> bool:
+    """判断模式中是否包含通配符"""
+    return not _GLOB_CHARS.isdisjoint(pattern)
+
+
+def glob_to_regex(pattern: str) -> str:
+    """
+    将 glob 模式转换为正则表达式（不含首尾锚点）
+
+    支持 *（不跨越目录）、?、[...] 和 **（跨越任意层目录）
+
+    Args:
+        pattern: 以 / 分隔的 glob 模式
+
+    Returns:
+        正则表达式字符串
+    """
+    result = []
+    i = 0
+    n = len(pattern)
+
+    while i < n:
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            result.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            result.append("(?:/.*)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            result.append(".*")
+            i += 2
+        elif char == "*":
+            result.append("[^/]*")
+            i += 1
+        elif char == "?":
+            result.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                result.append(re.escape(char))
+                i += 1
+            else:
+                body = pattern[i + 1 : end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                result.append(f"[{body}]")
+                i = end + 1
+        else:
+            result.append(re.escape(char))
+            i += 1
+
+    return "".join(result)
+
+
+def _compile_union(regexes: Sequence[str]) -> Optional[Pattern]:
+    """将多个正则合并为一个，没有模式时返回 None"""
+    if not regexes:
+        return None
+    return re.compile("|".join(f"(?:{regex})" for regex in regexes))
+
+
+def _normalize(pattern: str) -> Tuple[str, bool]:
+    """
+    规范化模式
+
+    Returns:
+        (去掉首尾 / 的模式, 是否为相对扫描根目录的路径模式)
+    """
+    pattern = pattern.strip().replace("\\", "/")
+    anchored = "/" in pattern.rstrip("/")
+    return pattern.strip("/"), anchored
+
+
+class PathMatcher:
+    """
+    编译后的目录匹配器
+
+    模式规则（与 .gitignore 相近）：
+    - 不含 / 的模式匹配任意层级的目录名，如 "build"、"*.egg-info"
+    - 含 / 的模式相对扫描根目录匹配，如 "/vendor"、"apps/*/dist"、"**/tmp"
+    - ** 可以跨越任意层目录
+
+    include_patterns 非空时只报告自身或上级目录匹配的项目，
+    不可能匹配任何 include 模式的子树会被直接剪枝。
+    """
+
+    def __init__(
+        self,
+        root_path: Path,
+        exclude_patterns: Iterable[str] = (),
+        include_patterns: Iterable[str] = (),
+        skip_hidden: bool = True,
+    ):
+        """
+        编译匹配器
+
+        Args:
+            root_path: 扫描根目录，路径模式相对它匹配
+            exclude_patterns: 排除模式（含忽略目录名）
+            include_patterns: 包含模式
+            skip_hidden: 是否跳过以 . 开头的目录
+        """
+        self.root_path = root_path
+        self.skip_hidden = skip_hidden
+        self._root_prefix = str(root_path).rstrip(os.sep) + os.sep
+
+        excluded_names = set()
+        name_regexes: List[str] = []
+        excluded_paths = set()
+        path_regexes: List[str] = []
+
+        for raw in exclude_patterns:
+            pattern, anchored = _normalize(raw)
+            if not pattern:
+                continue
+            if not anchored:
+                if _has_glob(pattern):
+                    name_regexes.append(glob_to_regex(pattern))
+                else:
+                    excluded_names.add(pattern)
+            elif _has_glob(pattern):
+                path_regexes.append(glob_to_regex(pattern))
+            else:
+                excluded_paths.add(pattern)
+
+        self._excluded_names = frozenset(excluded_names)
+        self._excluded_name_regex = _compile_union(name_regexes)
+        self._excluded_paths = frozenset(excluded_paths)
+        self._excluded_path_regex = _compile_union(path_regexes)
+        self._has_path_excludes = bool(excluded_paths or path_regexes)
+
+        include_name_regexes: List[str] = []
+        include_path_regexes: List[str] = []
+        # 路径模式按目录层级拆分后的正则，None 表示 **
+        self._include_segments: List[Tuple[Optional[Pattern], ...]] = []
+
+        for raw in include_patterns:
+            pattern, anchored = _normalize(raw)
+            if not pattern:
+                continue
+            if anchored:
+                include_path_regexes.append(glob_to_regex(pattern))
+                self._include_segments.append(
+                    tuple(
+                        None if segment == "**" else re.compile(glob_to_regex(segment))
+                        for segment in pattern.split("/")
+                    )
+                )
+            else:
+                include_name_regexes.append(glob_to_regex(pattern))
+
+        self._include_name_regex = _compile_union(include_name_regexes)
+        self._include_path_regex = _compile_union(include_path_regexes)
+        self._has_includes = bool(include_name_regexes or include_path_regexes)
+        # 只有全部为路径模式时才能根据前缀剪枝
+        self._can_prune_includes = bool(self._include_segments) and not (
+            include_name_regexes
+        )
+
+    @classmethod
+    def from_config(cls, config, root_path: Path) -> "PathMatcher":
+        """
+        根据 Depx 配置构建匹配器
+
+        Args:
+            config: Depx 配置
+            root_path: 扫描根目录
+
+        Returns:
+            路径匹配器
+        """
+        exclude_patterns = list(DEFAULT_SKIP_DIRECTORIES)
+        exclude_patterns.extend(config.ignore_directories)
+        exclude_patterns.extend(config.scan.exclude_patterns)
+        return cls(
+            root_path,
+            exclude_patterns=exclude_patterns,
+            include_patterns=config.scan.include_patterns,
+        )
+
+    def relative_path(self, path: Path) -> str:
+        """返回相对扫描根目录的 / 分隔路径"""
+        path_str = str(path)
+        if path_str.startswith(self._root_prefix):
+            relative = path_str[len(self._root_prefix) :]
+        else:
+            try:
+                relative = str(path.relative_to(self.root_path))
+            except ValueError:
+                relative = path_str
+        if os.sep != "/":
+            relative = relative.replace(os.sep, "/")
+        return relative
+
+    def is_excluded(self, path: Path) -> bool:
+        """
+        判断目录是否应被剪枝（不再进入）
+
+        Args:
+            path: 目录路径
+
+        Returns:
+            是否跳过该目录及其子树
+        """
+        name = path.name
+        if self.skip_hidden and name.startswith("."):
+            return True
+        if name in self._excluded_names:
+            return True
+        if self._excluded_name_regex and self._excluded_name_regex.fullmatch(name):
+            return True
+
+        if not self._has_path_excludes and not self._can_prune_includes:
+            return False
+
+        relative = self.relative_path(path)
+        if relative in self._excluded_paths:
+            return True
+        if self._excluded_path_regex and self._excluded_path_regex.fullmatch(relative):
+            return True
+        if self._can_prune_includes and not self._may_contain_include(relative):
+            return True
+        return False
+
+    def is_included(self, path: Path) -> bool:
+        """
+        判断目录是否满足 include 模式（自身或任一上级目录匹配即可）
+
+        Args:
+            path: 目录路径
+
+        Returns:
+            未配置 include 模式或匹配时返回 True
+        """
+        if not self._has_includes:
+            return True
+
+        relative = self.relative_path(path)
+        parts = relative.split("/") if relative and relative != "." else []
+
+        for index in range(len(parts), 0, -1):
+            if self._include_name_regex and self._include_name_regex.fullmatch(
+                parts[index - 1]
+            ):
+                return True
+            if self._include_path_regex and self._include_path_regex.fullmatch(
+                "/".join(parts[:index])
+            ):
+                return True
+        return False
+
+    def _may_contain_include(self, relative: str) -> bool:
+        """判断目录自身、上级或下级是否可能匹配某个 include 路径模式"""
+        parts = relative.split("/")
+
+        for segments in self._include_segments:
+            for index, part in enumerate(parts):
+                if index >= len(segments) or segments[index] is None:
+                    return True
+                if not segments[index].fullmatch(part):
+                    break
+            else:
+                return True
+        return False
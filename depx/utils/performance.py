@@ -4,12 +4,15 @@
 提供缓存、内存优化和性能监控功能
 """
 
+import contextlib
 import functools
 import hashlib
 import logging
+import os
+import threading
 import time
 from pathlib import Path
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -183,6 +186,122 @@ class PerformanceMonitor:
                 logger.info(f"指标 {name}: {value}")
 
 
+# 每个线程在 internal_wait() 中累计的 (墙钟时间, 进程 CPU 时间)
+_internal_waits = threading.local()
+
+
+def _internal_wait_totals() -> Tuple[float, float]:
+    return getattr(_internal_waits, "totals", (0.0, 0.0))
+
+
+@contextlib.contextmanager
+def internal_wait() -> Iterator[None]:
+    """
+    标记当前线程在等待 Depx 自己的工作线程（如共享的统计线程池）
+
+    这段时间不是 IO 阻塞，AdaptiveConcurrency.measure() 会将其从任务
+    耗时中扣除，其间其他线程消耗的 CPU 也不计为 GIL 竞争。
+    """
+    start_wall = time.perf_counter()
+    start_process = time.process_time()
+    try:
+        yield
+    finally:
+        wall, process = _internal_wait_totals()
+        _internal_waits.totals = (
+            wall + time.perf_counter() - start_wall,
+            process + time.process_time() - start_process,
+        )
+
+
+class AdaptiveConcurrency:
+    """
+    自适应并发控制器
+
+    根据任务的墙钟时间和线程 CPU 时间估算 IO 等待比例，按
+    ``CPU 核数 × (1 + 等待时间 / 计算时间)`` 调整同时执行的任务数。
+
+    线程不在 CPU 上的时间并不都是 IO 阻塞：等待统计线程池的时间
+    （internal_wait）被扣除；同一时间段内其他线程消耗的 CPU 时间视为
+    GIL 竞争，也不计入等待时间，避免线程越多、等待越长、并发数越大
+    的正反馈。
+    """
+
+    def __init__(
+        self,
+        min_workers: int = 2,
+        max_workers: Optional[int] = None,
+        smoothing: float = 0.2,
+    ):
+        """
+        初始化并发控制器
+
+        Args:
+            min_workers: 最小并发数
+            max_workers: 最大并发数，默认为 CPU 核数的 4 倍（最多 64）
+            smoothing: 指数移动平均的平滑系数
+        """
+        cpu_count = os.cpu_count() or 1
+        self.cpu_count = cpu_count
+        self.max_workers = max_workers or min(64, cpu_count * 4)
+        self.min_workers = max(1, min(min_workers, self.max_workers))
+        self.smoothing = smoothing
+
+        self._lock = threading.Lock()
+        self._avg_wall: Optional[float] = None
+        self._avg_cpu: Optional[float] = None
+        self._limit = max(self.min_workers, min(cpu_count, self.max_workers))
+
+    @property
+    def limit(self) -> int:
+        """当前建议的并发数"""
+        return self._limit
+
+    def record(self, wall_time: float, cpu_time: float) -> int:
+        """
+        记录一次任务的耗时并重新计算并发数
+
+        Args:
+            wall_time: 任务墙钟时间（秒）
+            cpu_time: 任务线程 CPU 时间（秒）
+
+        Returns:
+            更新后的并发数
+        """
+        with self._lock:
+            if self._avg_wall is None:
+                self._avg_wall, self._avg_cpu = wall_time, cpu_time
+            else:
+                alpha = self.smoothing
+                self._avg_wall += alpha * (wall_time - self._avg_wall)
+                self._avg_cpu += alpha * (cpu_time - self._avg_cpu)
+
+            compute = max(self._avg_cpu, 1e-6)
+            wait = max(self._avg_wall - self._avg_cpu, 0.0)
+            target = int(round(self.cpu_count * (1 + wait / compute)))
+            self._limit = max(self.min_workers, min(target, self.max_workers))
+            return self._limit
+
+    def measure(self, func: Callable, *args, **kwargs) -> Any:
+        """执行函数并记录其耗时，只有真正的阻塞时间计为 IO 等待"""
+        start_wall = time.perf_counter()
+        start_cpu = time.thread_time()
+        start_process = time.process_time()
+        start_waits = _internal_wait_totals()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            end_waits = _internal_wait_totals()
+            waited_wall = end_waits[0] - start_waits[0]
+            waited_process = end_waits[1] - start_waits[1]
+            cpu = time.thread_time() - start_cpu
+            wall = time.perf_counter() - start_wall - waited_wall
+            process = time.process_time() - start_process - waited_process
+            blocked = max(wall - cpu, 0.0)
+            contention = min(blocked, max(process - cpu, 0.0))
+            self.record(cpu + blocked - contention, cpu)
+
+
 def timed(func: Callable) -> Callable:
     """计时装饰器"""
 
@@ -0,0 +1,365 @@
+"""
+目录大小缓存模块
+
+进程内共享的目录大小缓存，按目录的 (st_dev, st_ino, st_mtime_ns) 索引，
+同一个物理目录树在一次运行中最多只遍历一次；可选的 SQLite 磁盘层让
+多次运行之间复用结果。
+
+目录的 mtime 只在其直接条目增删时变化，深层文件的修改不会反映到
+上级目录，因此磁盘层的记录只在 size_cache_ttl 秒内有效。
+
+硬链接在一次扫描内（两次 clear() 之间）跨目录去重：多个项目硬链接
+到同一个内容仓库时，共享的文件只计入先统计的项目。去重后的结果与
+统计顺序有关，不写入磁盘层；命中磁盘层的目录不参与去重。
+
+估计模式（estimate_mode）下，尚未精确统计过的目录改用抽样估计，
+估计值单独缓存，不写入磁盘层。
+"""
+
+import atexit
+import contextlib
+import dataclasses
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from .file_utils import (
+    DiskUsage,
+    ScanInodeLedger,
+    SizeEstimate,
+    estimate_disk_usage,
+    get_disk_usage,
+)
+from .performance import internal_wait
+
+logger = logging.getLogger(__name__)
+
+SIZE_CACHE_FILE_NAME = "size_cache.sqlite3"
+
+# 缓存键: (设备号, inode, mtime_ns)
+SizeKey = Tuple[int, int, int]
+
+
+class DirectorySizeCache:
+    """线程安全的目录大小缓存"""
+
+    def __init__(self, db_path: Optional[Path] = None, ttl: int = 0):
+        """
+        初始化缓存
+
+        Args:
+            db_path: 磁盘层 SQLite 文件路径，为 None 时只使用内存
+            ttl: 磁盘层记录的有效期（秒）
+        """
+        self._entries: Dict[SizeKey, DiskUsage] = {}
+        self._pending: Dict[SizeKey, threading.Event] = {}
+        self._estimates: Dict[SizeKey, SizeEstimate] = {}
+        self._estimate_depth = 0
+        self._scan_ledger = ScanInodeLedger()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        if db_path is not None and ttl > 0:
+            self._open(db_path)
+
+    def _open(self, db_path: Path) -> None:
+        """打开磁盘层，失败时只使用内存"""
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(db_path), timeout=5, check_same_thread=False)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sizes (
+                    device INTEGER NOT NULL,
+                    inode INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    apparent INTEGER NOT NULL,
+                    allocated INTEGER NOT NULL,
+                    files INTEGER NOT NULL,
+                    measured_at REAL NOT NULL,
+                    PRIMARY KEY (device, inode, mtime_ns)
+                )
+                """
+            )
+            conn.execute(
+                "DELETE FROM sizes WHERE measured_at < ?", (time.time() - self.ttl,)
+            )
+            conn.commit()
+            self._conn = conn
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"无法打开目录大小缓存: {db_path}, 错误: {e}")
+
+    def disk_usage(self, directory: Path) -> DiskUsage:
+        """
+        获取目录的磁盘占用，命中缓存时不再遍历
+
+        多个线程同时请求同一目录时只有一个线程遍历，其余线程等待结果。
+
+        Args:
+            directory: 目录路径
+
+        Returns:
+            磁盘占用统计（副本，可以随意修改）
+        """
+        try:
+            stat_result = os.stat(directory)
+        except OSError as e:
+            logger.warning(f"无法访问目录: {directory}, 错误: {e}")
+            return DiskUsage()
+
+        key = (stat_result.st_dev, stat_result.st_ino, stat_result.st_mtime_ns)
+
+        while True:
+            with self._lock:
+                usage = self._entries.get(key)
+                if usage is not None:
+                    self.hits += 1
+                    return dataclasses.replace(usage)
+
+                pending = self._pending.get(key)
+                if pending is None:
+                    self._pending[key] = threading.Event()
+                    self.misses += 1
+                    break
+
+            # 其他线程正在遍历同一目录
+            with internal_wait():
+                pending.wait()
+
+        try:
+            usage = self._load(key)
+            if usage is None:
+                ledger = self._scan_ledger.ledger_for(directory)
+                usage = get_disk_usage(directory, ledger, parallel=True)
+                if not ledger.shared:
+                    self._save(key, usage)
+            with self._lock:
+                self._entries[key] = usage
+        finally:
+            with self._lock:
+                self._pending.pop(key).set()
+
+        return dataclasses.replace(usage)
+
+    def directory_size(self, directory: Path) -> int:
+        """获取目录的内容大小（字节）"""
+        return self.disk_usage(directory).apparent_bytes
+
+    @property
+    def estimating(self) -> bool:
+        """当前是否处于估计模式"""
+        return self._estimate_depth > 0
+
+    @contextlib.contextmanager
+    def estimate_mode(self) -> Iterator[None]:
+        """在上下文内让 size_estimate() 使用抽样估计"""
+        with self._lock:
+            self._estimate_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._estimate_depth -= 1
+
+    def size_estimate(self, directory: Path) -> SizeEstimate:
+        """
+        获取目录大小及其误差
+
+        非估计模式下等同于精确统计；估计模式下已有精确结果时直接使用，
+        否则进行抽样估计。
+
+        Args:
+            directory: 目录路径
+
+        Returns:
+            目录大小估计值
+        """
+        if not self.estimating:
+            return SizeEstimate(size_bytes=self.directory_size(directory))
+
+        try:
+            stat_result = os.stat(directory)
+        except OSError as e:
+            logger.warning(f"无法访问目录: {directory}, 错误: {e}")
+            return SizeEstimate()
+
+        key = (stat_result.st_dev, stat_result.st_ino, stat_result.st_mtime_ns)
+        with self._lock:
+            usage = self._entries.get(key)
+            if usage is not None:
+                self.hits += 1
+                return SizeEstimate(size_bytes=usage.apparent_bytes)
+            estimate = self._estimates.get(key)
+            if estimate is not None:
+                self.hits += 1
+                return dataclasses.replace(estimate)
+
+        estimate = estimate_disk_usage(directory)
+        with self._lock:
+            self._estimates[key] = estimate
+        return dataclasses.replace(estimate)
+
+    def clear(self) -> None:
+        """清空内存层，并开始新的硬链接去重范围"""
+        with self._lock:
+            self._entries.clear()
+            self._estimates.clear()
+            self._scan_ledger = ScanInodeLedger()
+            self.hits = 0
+            self.misses = 0
+
+    def flush(self) -> None:
+        """提交磁盘层未写入的记录"""
+        if self._conn is None:
+            return
+        with self._lock:
+            try:
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"写入目录大小缓存失败: {e}")
+
+    def close(self) -> None:
+        """提交并关闭磁盘层"""
+        self.flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _load(self, key: SizeKey) -> Optional[DiskUsage]:
+        """从磁盘层读取未过期的记录"""
+        if self._conn is None:
+            return None
+
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT apparent, allocated, files FROM sizes "
+                    "WHERE device = ? AND inode = ? AND mtime_ns = ? "
+                    "AND measured_at >= ?",
+                    key + (time.time() - self.ttl,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.debug(f"读取目录大小缓存失败: {e}")
+                return None
+
+        if row is None:
+            return None
+        return DiskUsage(
+            apparent_bytes=row[0], allocated_bytes=row[1], file_count=row[2]
+        )
+
+    def _save(self, key: SizeKey, usage: DiskUsage) -> None:
+        """写入磁盘层"""
+        if self._conn is None:
+            return
+
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sizes "
+                    "(device, inode, mtime_ns, apparent, allocated, files, "
+                    "measured_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    key
+                    + (
+                        usage.apparent_bytes,
+                        usage.allocated_bytes,
+                        usage.file_count,
+                        time.time(),
+                    ),
+                )
+            except sqlite3.Error as e:
+                logger.debug(f"写入目录大小缓存失败: {e}")
+
+
+# 进程内共享的缓存实例
+_size_cache = DirectorySizeCache()
+_size_cache_lock = threading.Lock()
+
+
+def get_size_cache() -> DirectorySizeCache:
+    """获取进程内共享的目录大小缓存"""
+    return _size_cache
+
+
+def configure_size_cache(config) -> DirectorySizeCache:
+    """
+    根据配置启用磁盘层
+
+    config.size_cache_ttl 大于 0 且缓存启用时，在 cache_directory 下
+    打开磁盘层；否则只使用内存。
+
+    Args:
+        config: Depx 配置
+
+    Returns:
+        进程内共享的目录大小缓存
+    """
+    global _size_cache
+
+    ttl = config.size_cache_ttl if config.cache_enabled else 0
+    with _size_cache_lock:
+        if ttl > 0 and _size_cache._conn is None:
+            db_path = Path(config.cache_directory).expanduser() / SIZE_CACHE_FILE_NAME
+            cache = DirectorySizeCache(db_path, ttl)
+            cache._entries.update(_size_cache._entries)
+            _size_cache = cache
+            atexit.register(cache.close)
+    return _size_cache
+
+
+def clear_size_cache() -> None:
+    """
+    清空共享缓存的内存层，例如在新的扫描开始时
+
+    内存层以顶层目录的 mtime 为键，深层文件的修改不会使其失效；
+    长时间运行的调用方（交互模式、清理后的重新分析）每次扫描前清空，
+    避免得到过期的大小。磁盘层仍按 size_cache_ttl 过期。
+    """
+    _size_cache.clear()
+
+
+def get_cached_directory_size(directory: Path) -> int:
+    """
+    通过共享缓存计算目录的总大小（字节）
+
+    Args:
+        directory: 目录路径
+
+    Returns:
+        目录总大小（字节）
+    """
+    return _size_cache.directory_size(directory)
+
+
+def get_cached_size_estimate(directory: Path) -> SizeEstimate:
+    """
+    通过共享缓存获取目录大小及其误差（估计模式下为抽样估计）
+
+    Args:
+        directory: 目录路径
+
+    Returns:
+        目录大小估计值
+    """
+    return _size_cache.size_estimate(directory)
+
+
+def get_cached_disk_usage(directory: Path) -> DiskUsage:
+    """
+    通过共享缓存统计目录的磁盘占用
+
+    Args:
+        directory: 目录路径
+
+    Returns:
+        磁盘占用统计
+    """
+    return _size_cache.disk_usage(directory)
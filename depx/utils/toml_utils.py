@@ -5,97 +5,168 @@ TOML 解析工具模块
 """
 
 import logging
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# 解析缓存最多保留的文档数
+TOML_CACHE_SIZE = 1024
 
-def safe_load_toml(file_path: Path) -> Optional[Dict[str, Any]]:
+# 缓存键: (路径, mtime_ns, 文件大小)
+TomlKey = Tuple[str, int, int]
+
+
+def _resolve_toml_library() -> Tuple[Optional[str], Optional[Callable[[str], Any]]]:
     """
-    安全加载 TOML 文件，支持多种解析库
+    按优先级查找可用的 TOML 解析库
 
     优先级：
     1. tomllib (Python 3.11+ 内置)
     2. tomli (第三方库)
     3. toml (备用库)
 
-    Args:
-        file_path: TOML 文件路径
-
     Returns:
-        解析后的 TOML 数据，失败时返回 None
+        (库名称, loads 函数)，都不可用时为 (None, None)
     """
-    if not file_path.exists():
-        logger.warning(f"TOML 文件不存在: {file_path}")
-        return None
-
-    # 尝试使用 Python 3.11+ 内置的 tomllib
     try:
         import tomllib
 
-        with open(file_path, "rb") as f:
-            return tomllib.load(f)
+        return "tomllib", tomllib.loads
     except ImportError:
         pass
-    except Exception as e:
-        logger.warning(f"使用 tomllib 解析失败: {file_path}, 错误: {e}")
 
-    # 尝试使用 tomli (推荐的第三方库)
     try:
         import tomli
 
-        with open(file_path, "rb") as f:
-            return tomli.load(f)
+        return "tomli", tomli.loads
     except ImportError:
         pass
-    except Exception as e:
-        logger.warning(f"使用 tomli 解析失败: {file_path}, 错误: {e}")
 
-    # 尝试使用 toml (备用库)
     try:
         import toml
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            return toml.load(f)
+        return "toml", toml.loads
     except ImportError:
+        pass
+
+    return None, None
+
+
+# 模块加载时确定一次解析库
+_TOML_LIBRARY, _toml_loads = _resolve_toml_library()
+
+
+class TomlCache:
+    """
+    已解析 TOML 文档的缓存
+
+    以 (路径, mtime_ns, 大小) 为键，文件变化后自动重新解析；解析失败的
+    结果同样缓存，避免反复报告同一个错误。缓存的文档在调用方之间共享，
+    不应修改。
+    """
+
+    def __init__(self, max_entries: int = TOML_CACHE_SIZE):
+        self._entries: "OrderedDict[TomlKey, Optional[Dict[str, Any]]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        加载 TOML 文件，命中缓存时不再读取和解析
+
+        Args:
+            file_path: TOML 文件路径
+
+        Returns:
+            解析后的 TOML 数据，失败时返回 None
+        """
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            logger.warning(f"TOML 文件不存在: {file_path}")
+            return None
+
+        key = (str(file_path), stat_result.st_mtime_ns, stat_result.st_size)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        data = _parse_toml_file(file_path)
+
+        with self._lock:
+            self._entries[key] = data
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return data
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def _parse_toml_file(file_path: Path) -> Optional[Dict[str, Any]]:
+    """读取并解析 TOML 文件"""
+    if _toml_loads is None:
         logger.error("无法找到 TOML 解析库。请安装: pip install tomli")
         return None
+
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            return _toml_loads(f.read())
     except Exception as e:
-        logger.warning(f"使用 toml 解析失败: {file_path}, 错误: {e}")
+        logger.warning(f"使用 {_TOML_LIBRARY} 解析失败: {file_path}, 错误: {e}")
+        return None
 
-    return None
 
+# 进程内共享的解析缓存
+_toml_cache = TomlCache()
 
-def get_available_toml_library() -> Optional[str]:
+
+def safe_load_toml(file_path: Path) -> Optional[Dict[str, Any]]:
     """
-    检查可用的 TOML 解析库
+    安全加载 TOML 文件，同一文件未变化时只解析一次
+
+    返回的数据在调用方之间共享，不应修改。
+
+    Args:
+        file_path: TOML 文件路径
 
     Returns:
-        可用的库名称，如果都不可用则返回 None
+        解析后的 TOML 数据，失败时返回 None
     """
-    try:
-        pass
+    return _toml_cache.load(file_path)
 
-        return "tomllib"
-    except ImportError:
-        pass
 
-    try:
-        pass
+def clear_toml_cache() -> None:
+    """清空 TOML 解析缓存，每次扫描开始时调用"""
+    _toml_cache.clear()
 
-        return "tomli"
-    except ImportError:
-        pass
 
-    try:
-        pass
+def get_toml_cache() -> TomlCache:
+    """获取进程内共享的 TOML 解析缓存"""
+    return _toml_cache
 
-        return "toml"
-    except ImportError:
-        pass
 
-    return None
+def get_available_toml_library() -> Optional[str]:
+    """
+    检查可用的 TOML 解析库
+
+    Returns:
+        可用的库名称，如果都不可用则返回 None
+    """
+    return _TOML_LIBRARY
 
 
 def ensure_toml_support() -> bool:
@@ -0,0 +1,138 @@
+"""
+C# 解析器测试
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from depx.parsers.base import DependencyType, ProjectType
+from depx.parsers.csharp import CSharpParser
+from depx.parsers.nuget_packages import (
+    clear_nuget_package_indexes,
+    get_nuget_package_index,
+    normalize_nuget_version,
+)
+
+
+class TestCSharpParser(unittest.TestCase):
+    """C# 解析器测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.parser = CSharpParser()
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.nuget_dir = self.temp_dir / "nuget"
+        self.env = patch.dict(os.environ, {"NUGET_PACKAGES": str(self.nuget_dir)})
+        self.env.start()
+        clear_nuget_package_indexes()
+
+    def tearDown(self):
+        """测试后清理"""
+        import shutil
+
+        self.env.stop()
+        clear_nuget_package_indexes()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _install_package(self, name: str, version: str, size: int) -> Path:
+        """在全局包目录中创建一个包"""
+        package_dir = self.nuget_dir / name.lower() / version
+        package_dir.mkdir(parents=True)
+        (package_dir / f"{name.lower()}.nupkg").write_bytes(b"x" * size)
+        return package_dir
+
+    def test_project_type(self):
+        """测试项目类型"""
+        self.assertEqual(self.parser.project_type, ProjectType.CSHARP)
+
+    def test_normalize_nuget_version(self):
+        """测试 NuGet 版本号规范化"""
+        self.assertEqual(normalize_nuget_version("1.0"), "1.0.0")
+        self.assertEqual(normalize_nuget_version("1.2.3.0"), "1.2.3")
+        self.assertEqual(normalize_nuget_version("01.2.3-Beta+sha"), "1.2.3-beta")
+
+    def test_sdk_project_with_assets_file(self):
+        """测试读取 project.assets.json 并从全局包目录计算大小"""
+        project_dir = self.temp_dir / "App"
+        (project_dir / "obj").mkdir(parents=True)
+        (project_dir / "App.csproj").write_text(
+            '<Project Sdk="Microsoft.NET.Sdk">'
+            "<PropertyGroup><TargetFramework>net8.0</TargetFramework>"
+            "</PropertyGroup><ItemGroup>"
+            '<PackageReference Include="Newtonsoft.Json" Version="13.0" />'
+            "</ItemGroup></Project>"
+        )
+        (project_dir / "Program.cs").write_text("class Program {}")
+        (project_dir / "obj" / "project.assets.json").write_text(
+            json.dumps(
+                {
+                    "version": 3,
+                    "libraries": {
+                        "Newtonsoft.Json/13.0.3": {"type": "package"},
+                        "System.Memory/4.5.5": {"type": "package"},
+                        "Shared/1.0.0": {"type": "project"},
+                    },
+                    "project": {
+                        "frameworks": {
+                            "net8.0": {
+                                "dependencies": {
+                                    "Newtonsoft.Json": {"version": "[13.0, )"}
+                                }
+                            }
+                        }
+                    },
+                }
+            )
+        )
+        newtonsoft = self._install_package("Newtonsoft.Json", "13.0.3", 100)
+        self._install_package("System.Memory", "4.5.5", 40)
+
+        with patch.object(Path, "glob", side_effect=AssertionError("glob")):
+            project = self.parser.parse_project(project_dir)
+            self.parser.parse_project(project_dir)
+
+        self.assertEqual(project.metadata["framework"], ".NET Core/5+")
+        self.assertEqual(project.metadata["dotnet_version"], "net8.0")
+        self.assertEqual(project.metadata["project_type"], "C#")
+        self.assertEqual(project.metadata["restored_packages"], 2)
+
+        deps = {dep.name: dep for dep in project.dependencies}
+        self.assertEqual(sorted(deps), ["Newtonsoft.Json", "System.Memory"])
+        self.assertEqual(deps["Newtonsoft.Json"].installed_version, "13.0.3")
+        self.assertEqual(deps["Newtonsoft.Json"].install_path, newtonsoft)
+        self.assertEqual(deps["Newtonsoft.Json"].size_bytes, 100)
+        self.assertEqual(
+            deps["System.Memory"].dependency_type, DependencyType.TRANSITIVE
+        )
+        self.assertEqual(deps["System.Memory"].size_bytes, 40)
+
+        # 全局包目录只索引一次
+        self.assertEqual(get_nuget_package_index().builds, 1)
+
+    def test_legacy_packages_folder(self):
+        """测试 packages.config 项目使用 packages/ 中的对应版本"""
+        (self.temp_dir / "packages.config").write_text(
+            '<?xml version="1.0" encoding="utf-8"?><packages>'
+            '<package id="NUnit" version="3.13.3" />'
+            "</packages>"
+        )
+        for name, size in [("NUnit.3.12.0", 10), ("NUnit.3.13.3", 20)]:
+            (self.temp_dir / "packages" / name).mkdir(parents=True)
+            (self.temp_dir / "packages" / name / "lib.dll").write_bytes(b"x" * size)
+
+        project = self.parser.parse_project(self.temp_dir)
+
+        dependency = project.dependencies[0]
+        self.assertEqual(
+            dependency.install_path, self.temp_dir / "packages" / "NUnit.3.13.3"
+        )
+        self.assertEqual(dependency.size_bytes, 20)
+        self.assertEqual(project.total_size_bytes, 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,299 @@
+"""
+文件工具测试
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from depx.core.cleaner import DependencyCleaner
+from depx.parsers.base import DependencyInfo, DependencyType, ProjectInfo, ProjectType
+from depx.utils.file_utils import (
+    InodeLedger,
+    estimate_disk_usage,
+    format_size_with_error,
+    get_directory_size,
+    get_disk_usage,
+)
+
+
+def _parallel_disk_usage(directory: Path):
+    """在子进程中并行统计目录"""
+    return get_disk_usage(directory, parallel=True)
+
+
+@pytest.mark.skipif(os.name == "nt", reason="requires POSIX links and st_blocks")
+class TestDiskUsage:
+    """磁盘占用统计测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, relative: str, size: int) -> Path:
+        path = self.temp_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+        return path
+
+    def test_apparent_and_allocated_sizes(self):
+        """测试内容大小与分配大小"""
+        self._write("a/one.bin", 1000)
+        self._write("a/b/two.bin", 3000)
+        (self.temp_dir / "a" / "link").symlink_to(self.temp_dir / "a" / "b")
+
+        usage = get_disk_usage(self.temp_dir / "a")
+
+        assert usage.apparent_bytes >= 4000
+        assert usage.file_count == 3  # 两个文件 + 符号链接本身
+        assert usage.allocated_bytes > 0
+        assert get_directory_size(self.temp_dir / "a") == usage.apparent_bytes
+
+    def test_hardlinks_counted_once(self):
+        """测试硬链接只计一次"""
+        original = self._write("store/pkg.bin", 5000)
+        for name in ["p1", "p2"]:
+            (self.temp_dir / name).mkdir()
+            os.link(original, self.temp_dir / name / "pkg.bin")
+
+        assert get_directory_size(self.temp_dir) == 5000
+
+        ledger = InodeLedger()
+        first = get_disk_usage(self.temp_dir / "p1", ledger)
+        second = get_disk_usage(self.temp_dir / "p2", ledger)
+        assert first.apparent_bytes == 5000
+        assert second.apparent_bytes == 0
+
+    def test_parallel_matches_sequential(self):
+        """测试并行统计与顺序统计结果一致"""
+        for i in range(20):
+            for j in range(5):
+                self._write(f"tree/d{i}/s{j}/f.bin", 100 * (i + 1))
+        original = self._write("tree/shared.bin", 4096)
+        os.link(original, self.temp_dir / "tree" / "d3" / "shared-link.bin")
+
+        sequential = get_disk_usage(self.temp_dir / "tree")
+        parallel = get_disk_usage(self.temp_dir / "tree", parallel=True)
+
+        assert parallel == sequential
+        assert parallel.file_count == 101
+        assert get_disk_usage(self.temp_dir / "missing", parallel=True).file_count == 0
+
+    @pytest.mark.skipif(
+        "fork" not in multiprocessing.get_all_start_methods(), reason="requires fork"
+    )
+    def test_parallel_sizing_after_fork(self, monkeypatch):
+        """测试父进程启动统计线程池后，fork 出的子进程仍能并行统计"""
+        from depx.utils import file_utils
+
+        for i in range(10):
+            self._write(f"tree/d{i}/s/f.bin", 100)
+
+        # 线程池的线程全部启动后，子进程提交的任务不会再创建新线程
+        monkeypatch.setattr(file_utils, "_sizing_pool", file_utils._SizingPool(1))
+        expected = get_disk_usage(self.temp_dir / "tree", parallel=True)
+
+        # Pool 退出时终止子进程，回归时测试超时失败而不是挂起
+        with multiprocessing.get_context("fork").Pool(1) as pool:
+            result = pool.apply_async(_parallel_disk_usage, (self.temp_dir / "tree",))
+            assert result.get(timeout=30) == expected
+
+    def test_missing_directory(self):
+        """测试不存在的目录"""
+        usage = get_disk_usage(self.temp_dir / "missing")
+        assert usage.apparent_bytes == 0
+        assert usage.allocated_bytes == 0
+
+    def test_cleanup_plan_uses_allocated_size(self):
+        """测试清理计划按实际分配空间估算，并对硬链接去重"""
+        original = self._write("a/node_modules/jest/index.js", 8192)
+        (self.temp_dir / "b" / "node_modules" / "jest").mkdir(parents=True)
+        os.link(original, self.temp_dir / "b" / "node_modules" / "jest" / "index.js")
+
+        projects = []
+        for name in ["a", "b"]:
+            dep_path = self.temp_dir / name / "node_modules" / "jest"
+            projects.append(
+                ProjectInfo(
+                    name=name,
+                    path=self.temp_dir / name,
+                    project_type=ProjectType.NODEJS,
+                    config_file=self.temp_dir / name / "package.json",
+                    dependencies=[
+                        DependencyInfo(
+                            name="jest",
+                            version="^29.0.0",
+                            dependency_type=DependencyType.DEVELOPMENT,
+                            install_path=dep_path,
+                            size_bytes=8192,
+                        )
+                    ],
+                )
+            )
+
+        plan = DependencyCleaner().create_cleanup_plan(projects, ["dev"])
+
+        assert len(plan.project_dependencies) == 2
+        assert plan.total_size == os.stat(original).st_blocks * 512
+        assert sum(i["apparent_size"] for i in plan.project_dependencies) == 8192
+
+
+class TestDirectorySizeCache:
+    """目录大小缓存测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / "data").mkdir()
+        (self.temp_dir / "data" / "file.bin").write_bytes(b"x" * 2048)
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_memory_cache_walks_once(self):
+        """测试同一目录只遍历一次，目录变化后重新计算"""
+        from unittest.mock import patch
+
+        from depx.utils import size_cache
+        from depx.utils.size_cache import DirectorySizeCache
+
+        cache = DirectorySizeCache()
+        data_dir = self.temp_dir / "data"
+
+        with patch.object(
+            size_cache, "get_disk_usage", wraps=size_cache.get_disk_usage
+        ) as walk:
+            assert cache.directory_size(data_dir) == 2048
+            assert cache.directory_size(data_dir) == 2048
+            assert walk.call_count == 1
+
+            (data_dir / "more.bin").write_bytes(b"y" * 10)
+            os.utime(data_dir, ns=(0, 10**9))
+            assert cache.directory_size(data_dir) == 2058
+            assert walk.call_count == 2
+
+        assert cache.hits == 1
+        assert cache.misses == 2
+
+    def test_scan_clears_shared_memory_cache(self):
+        """测试每次扫描前清空共享缓存，深层文件的修改反映在大小中"""
+        from depx.core.scanner import ProjectScanner
+        from depx.utils.size_cache import get_cached_directory_size
+
+        project_dir = self.temp_dir / "app"
+        nested = project_dir / "node_modules" / "express" / "lib"
+        nested.mkdir(parents=True)
+        (project_dir / "package.json").write_text('{"name": "app"}')
+        express = nested.parent
+        assert get_cached_directory_size(express) == 0
+
+        (nested / "big.js").write_bytes(b"x" * 4096)
+        assert get_cached_directory_size(express) == 0
+
+        ProjectScanner().scan_directory(self.temp_dir)
+        assert get_cached_directory_size(express) == 4096
+
+    @pytest.mark.skipif(os.name == "nt", reason="requires POSIX hard links")
+    def test_hardlinks_shared_between_projects_counted_once(self):
+        """测试一次扫描内硬链接到两个项目的文件只计入一次"""
+        from depx.utils.size_cache import DirectorySizeCache
+
+        store = self.temp_dir / "data" / "file.bin"
+        for name in ["p1", "p2"]:
+            package_dir = self.temp_dir / name / "node_modules" / "pkg"
+            package_dir.mkdir(parents=True)
+            os.link(store, package_dir / "file.bin")
+
+        cache = DirectorySizeCache()
+        node_modules = self.temp_dir / "p1" / "node_modules"
+        assert cache.directory_size(node_modules) == 2048
+        # 嵌套的目录仍完整统计，无关的项目不再计入共享的文件
+        assert cache.directory_size(node_modules / "pkg") == 2048
+        assert cache.directory_size(self.temp_dir / "p2" / "node_modules") == 0
+
+        # 新的扫描重新开始去重
+        cache.clear()
+        assert cache.directory_size(self.temp_dir / "p2" / "node_modules") == 2048
+
+    def test_disk_tier_persists_between_instances(self):
+        """测试磁盘层在缓存实例之间复用"""
+        from depx.utils.size_cache import DirectorySizeCache
+
+        db_path = self.temp_dir / "cache" / "sizes.sqlite3"
+        first = DirectorySizeCache(db_path, ttl=3600)
+        assert first.directory_size(self.temp_dir / "data") == 2048
+        first.close()
+
+        (self.temp_dir / "data" / "file.bin").write_bytes(b"x" * 10)
+
+        second = DirectorySizeCache(db_path, ttl=3600)
+        # 目录条目未变化，磁盘层中的记录仍然有效
+        assert second.directory_size(self.temp_dir / "data") == 2048
+        second.close()
+
+
+class TestSizeEstimate:
+    """抽样估计测试类"""
+
+    def setup_method(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        for i in range(40):
+            package = self.temp_dir / "big" / f"pkg{i}"
+            package.mkdir(parents=True)
+            for j in range(50):
+                size = 100 + (i * 37 + j * 53) % 900
+                (package / f"f{j}.js").write_bytes(b"x" * size)
+        (self.temp_dir / "small").mkdir()
+        (self.temp_dir / "small" / "a.txt").write_bytes(b"x" * 10)
+        (self.temp_dir / "small" / "b.txt").write_bytes(b"x" * 20)
+
+    def teardown_method(self):
+        """测试后清理"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_small_directory_is_exact(self):
+        """测试小目录被完整统计，没有误差"""
+        estimate = estimate_disk_usage(self.temp_dir / "small")
+        assert estimate.exact
+        assert estimate.size_bytes == 30
+        assert estimate.error_bytes == 0
+
+    def test_large_directory_within_error_bounds(self):
+        """测试大目录的估计值落在误差范围内"""
+        big = self.temp_dir / "big"
+        exact = get_directory_size(big)
+        estimate = estimate_disk_usage(big, max_files=8, max_subdirectories=8, seed=1)
+
+        assert not estimate.exact
+        assert estimate.error_bytes > 0
+        assert abs(estimate.size_bytes - exact) <= 2 * estimate.error_bytes
+
+    def test_estimate_mode_prefers_exact_entries(self):
+        """测试估计模式下优先使用已有的精确结果"""
+        from depx.utils.size_cache import DirectorySizeCache
+
+        cache = DirectorySizeCache()
+        big = self.temp_dir / "big"
+
+        with cache.estimate_mode():
+            assert cache.size_estimate(big).error_bytes > 0
+
+        exact = cache.size_estimate(big)
+        assert exact.error_bytes == 0
+        with cache.estimate_mode():
+            assert cache.size_estimate(big) == exact
+
+    def test_format_size_with_error(self):
+        """测试带误差的大小格式化"""
+        assert format_size_with_error(2048) == "2.0 KB"
+        assert format_size_with_error(2048, 512) == "2.0 KB ± 512.0 B"
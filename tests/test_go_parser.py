@@ -0,0 +1,125 @@
+"""
+Go 解析器测试
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from depx.parsers.base import DependencyType, ProjectType
+from depx.parsers.go import GoParser
+from depx.parsers.go_modcache import (
+    clear_go_module_cache,
+    escape_module_path,
+    get_go_module_cache,
+    unescape_module_path,
+)
+
+
+class TestGoParser(unittest.TestCase):
+    """Go 解析器测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.parser = GoParser()
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.modcache = self.temp_dir / "modcache"
+        self.env = patch.dict(
+            os.environ, {"GOMODCACHE": str(self.modcache), "GOENV": "off"}
+        )
+        self.env.start()
+        clear_go_module_cache()
+
+    def tearDown(self):
+        """测试后清理"""
+        import shutil
+
+        self.env.stop()
+        clear_go_module_cache()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _extract_module(self, module: str, version: str, size: int) -> Path:
+        """在模块缓存中创建一个已解压的模块"""
+        module_dir = self.modcache / f"{escape_module_path(module)}@{version}"
+        module_dir.mkdir(parents=True)
+        (module_dir / "go.mod").write_bytes(b"x" * size)
+        return module_dir
+
+    def test_project_type(self):
+        """测试项目类型"""
+        self.assertEqual(self.parser.project_type, ProjectType.GO)
+
+    def test_escape_module_path(self):
+        """测试模块路径的大小写转义"""
+        escaped = escape_module_path("github.com/Azure/azure-sdk-for-go")
+        self.assertEqual(escaped, "github.com/!azure/azure-sdk-for-go")
+        self.assertEqual(
+            unescape_module_path(escaped), "github.com/Azure/azure-sdk-for-go"
+        )
+
+    def test_parse_go_mod_and_go_sum(self):
+        """测试 go.mod 的 require 块和 go.sum 驱动的间接依赖"""
+        (self.temp_dir / "go.mod").write_text(
+            "module example.com/app\n\n"
+            "go 1.21\n\n"
+            "require (\n"
+            "\tgithub.com/Azure/go-autorest v14.2.0+incompatible\n"
+            "\tgolang.org/x/sys v0.15.0 // indirect\n"
+            ")\n\n"
+            "require github.com/pkg/errors v0.9.1\n\n"
+            "replace (\n"
+            "\tgithub.com/old/mod => github.com/new/mod v1.0.0\n"
+            ")\n"
+        )
+        (self.temp_dir / "go.sum").write_text(
+            "github.com/Azure/go-autorest v14.2.0+incompatible h1:a=\n"
+            "github.com/Azure/go-autorest v14.2.0+incompatible/go.mod h1:b=\n"
+            "github.com/pkg/errors v0.9.1 h1:c=\n"
+            "golang.org/x/sys v0.15.0 h1:d=\n"
+            "golang.org/x/text v0.3.0 h1:e=\n"
+            "golang.org/x/text v0.14.0 h1:f=\n"
+            "golang.org/x/text v0.14.0/go.mod h1:g=\n"
+            "golang.org/x/net v0.19.0/go.mod h1:h=\n"
+        )
+        autorest = self._extract_module(
+            "github.com/Azure/go-autorest", "v14.2.0+incompatible", 10
+        )
+        text = self._extract_module("golang.org/x/text", "v0.14.0", 20)
+        self._extract_module("golang.org/x/text", "v0.3.0", 30)
+
+        project = self.parser.parse_project(self.temp_dir)
+
+        deps = {dep.name: dep for dep in project.dependencies}
+        self.assertEqual(
+            sorted(deps),
+            [
+                "github.com/Azure/go-autorest",
+                "github.com/pkg/errors",
+                "golang.org/x/sys",
+                "golang.org/x/text",
+            ],
+        )
+        self.assertEqual(
+            deps["golang.org/x/sys"].dependency_type, DependencyType.OPTIONAL
+        )
+        self.assertEqual(
+            deps["golang.org/x/text"].dependency_type, DependencyType.TRANSITIVE
+        )
+        self.assertEqual(deps["golang.org/x/text"].installed_version, "v0.14.0")
+
+        # 按 module@version 在转义后的缓存路径中定位
+        self.assertEqual(deps["github.com/Azure/go-autorest"].install_path, autorest)
+        self.assertEqual(deps["github.com/Azure/go-autorest"].size_bytes, 10)
+        self.assertEqual(deps["golang.org/x/text"].install_path, text)
+        self.assertEqual(deps["golang.org/x/text"].size_bytes, 20)
+        self.assertIsNone(deps["github.com/pkg/errors"].install_path)
+
+        # 模块缓存只索引一次
+        self.parser.parse_project(self.temp_dir)
+        self.assertEqual(get_go_module_cache().builds, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
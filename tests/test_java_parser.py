@@ -212,6 +212,58 @@ dependencies {
         # 无包装器
         self.assertFalse(self.parser._has_wrapper(self.temp_dir))
 
+    def test_resolve_dependencies_in_local_caches(self):
+        """测试直接按坐标定位 ~/.m2 和 Gradle 缓存中的依赖"""
+        import os
+        from unittest.mock import patch
+
+        home = self.temp_dir / "home"
+        maven_repo = home / ".m2" / "repository"
+        maven_dir = maven_repo / "org" / "slf4j" / "slf4j-api" / "2.0.9"
+        maven_dir.mkdir(parents=True)
+        (maven_dir / "slf4j-api-2.0.9.jar").write_bytes(b"x" * 100)
+        gradle_dir = (
+            home / "gradle" / "caches" / "modules-2" / "files-2.1"
+            / "org.slf4j" / "slf4j-api" / "2.0.9" / "abc123"
+        )
+        gradle_dir.mkdir(parents=True)
+        (gradle_dir / "slf4j-api-2.0.9.jar").write_bytes(b"x" * 100)
+
+        project_dir = self.temp_dir / "app"
+        (project_dir / "target").mkdir(parents=True)
+        (project_dir / "target" / "app.jar").write_bytes(b"x" * 50)
+        (project_dir / "pom.xml").write_text("""<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+    <artifactId>app</artifactId>
+    <dependencies>
+        <dependency>
+            <groupId>org.slf4j</groupId>
+            <artifactId>slf4j-api</artifactId>
+            <version>2.0.9</version>
+        </dependency>
+        <dependency>
+            <groupId>junit</groupId>
+            <artifactId>junit</artifactId>
+            <version>${junit.version}</version>
+        </dependency>
+    </dependencies>
+</project>""")
+
+        env = {"HOME": str(home), "GRADLE_USER_HOME": str(home / "gradle")}
+        with patch.dict(os.environ, env), patch.object(
+            Path, "home", return_value=home
+        ):
+            project = self.parser.parse_project(project_dir)
+
+        deps = {dep.name: dep for dep in project.dependencies}
+        slf4j = deps["org.slf4j:slf4j-api"]
+        self.assertEqual(slf4j.install_path, maven_dir)
+        self.assertEqual(slf4j.size_bytes, 200)
+        # 属性占位符无法直接定位
+        self.assertIsNone(deps["junit:junit"].install_path)
+        self.assertEqual(deps["junit:junit"].size_bytes, 0)
+        self.assertEqual(project.total_size_bytes, 50)
+
 
 if __name__ == "__main__":
     unittest.main()
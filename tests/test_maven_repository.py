@@ -0,0 +1,287 @@
+"""
+Maven 离线依赖解析测试
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from depx.parsers.base import DependencyType
+from depx.parsers.java import JavaParser
+from depx.parsers.maven_repository import (
+    MavenRepository,
+    clear_maven_repository,
+    read_gradle_lockfile,
+    read_verification_metadata,
+)
+
+
+def _dependency(coordinates: str, extra: str = "") -> str:
+    group_id, artifact_id, version = (coordinates.split(":") + [""])[:3]
+    version_element = f"<version>{version}</version>" if version else ""
+    return (
+        f"<dependency><groupId>{group_id}</groupId>"
+        f"<artifactId>{artifact_id}</artifactId>{version_element}{extra}"
+        "</dependency>"
+    )
+
+
+def _pom(coordinates: str, body: str = "", dependencies=(), parent: str = "") -> str:
+    group_id, artifact_id, version = coordinates.split(":")
+    parent_element = ""
+    if parent:
+        p_group, p_artifact, p_version = parent.split(":")
+        parent_element = (
+            f"<parent><groupId>{p_group}</groupId>"
+            f"<artifactId>{p_artifact}</artifactId>"
+            f"<version>{p_version}</version></parent>"
+        )
+    return (
+        '<project xmlns="http://maven.apache.org/POM/4.0.0">'
+        f"{parent_element}<groupId>{group_id}</groupId>"
+        f"<artifactId>{artifact_id}</artifactId><version>{version}</version>"
+        f"{body}<dependencies>{''.join(dependencies)}</dependencies></project>"
+    )
+
+
+class TestMavenRepository(unittest.TestCase):
+    """Maven 离线依赖解析测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.repo_root = self.temp_dir / "repository"
+        self.repository = MavenRepository(self.repo_root)
+
+    def tearDown(self):
+        """测试后清理"""
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _install(self, coordinates: str, content: str) -> None:
+        """在本地仓库中写入一个 POM"""
+        group_id, artifact_id, version = coordinates.split(":")
+        pom_file = self.repository.pom_path(group_id, artifact_id, version)
+        pom_file.parent.mkdir(parents=True, exist_ok=True)
+        pom_file.write_text(content)
+
+    def _build_repository(self) -> Path:
+        """构造一个带父 POM、BOM、排除和可选依赖的仓库，返回项目 pom.xml"""
+        self._install(
+            "com.acme:acme-parent:1",
+            _pom(
+                "com.acme:acme-parent:1",
+                "<properties><guava.version>32.1.0</guava.version></properties>"
+                "<dependencyManagement><dependencies>"
+                + _dependency(
+                    "com.acme:acme-bom:1", "<type>pom</type><scope>import</scope>"
+                )
+                + "</dependencies></dependencyManagement>",
+            ),
+        )
+        self._install(
+            "com.acme:acme-bom:1",
+            _pom(
+                "com.acme:acme-bom:1",
+                "<dependencyManagement><dependencies>"
+                + _dependency("org.slf4j:slf4j-api:2.0.9")
+                + "</dependencies></dependencyManagement>",
+            ),
+        )
+        self._install(
+            "com.google.guava:guava:32.1.0",
+            _pom(
+                "com.google.guava:guava:32.1.0",
+                dependencies=[
+                    _dependency("com.google.guava:failureaccess:1.0.1"),
+                    _dependency(
+                        "org.checkerframework:checker-qual:3.33.0",
+                        "<optional>true</optional>",
+                    ),
+                    _dependency("junit:junit:4.13", "<scope>test</scope>"),
+                ],
+            ),
+        )
+        self._install(
+            "com.google.guava:failureaccess:1.0.1",
+            _pom("com.google.guava:failureaccess:1.0.1"),
+        )
+        self._install(
+            "ch.qos.logback:logback-classic:1.4.11",
+            _pom(
+                "ch.qos.logback:logback-classic:1.4.11",
+                dependencies=[
+                    _dependency("ch.qos.logback:logback-core:1.4.11"),
+                    _dependency("org.slf4j:slf4j-api:2.0.7"),
+                ],
+            ),
+        )
+
+        project_dir = self.temp_dir / "app"
+        project_dir.mkdir()
+        pom_file = project_dir / "pom.xml"
+        pom_file.write_text(
+            _pom(
+                "com.acme:app:1.0",
+                parent="com.acme:acme-parent:1",
+                dependencies=[
+                    _dependency("com.google.guava:guava:${guava.version}"),
+                    _dependency(
+                        "ch.qos.logback:logback-classic:1.4.11",
+                        "<exclusions><exclusion><groupId>ch.qos.logback</groupId>"
+                        "<artifactId>logback-core</artifactId></exclusion>"
+                        "</exclusions>",
+                    ),
+                    _dependency(
+                        "org.mockito:mockito-core:5.0.0", "<scope>test</scope>"
+                    ),
+                ],
+            )
+        )
+        return pom_file
+
+    def test_resolve_transitive_closure(self):
+        """测试父 POM 属性、BOM、排除、可选和 test 作用域的处理"""
+        pom_file = self._build_repository()
+
+        artifacts = {
+            artifact.name: (artifact.version, artifact.scope, artifact.depth)
+            for artifact in self.repository.resolve(pom_file)
+        }
+
+        self.assertEqual(
+            artifacts,
+            {
+                "com.google.guava:guava": ("32.1.0", "compile", 1),
+                "ch.qos.logback:logback-classic": ("1.4.11", "compile", 1),
+                "org.mockito:mockito-core": ("5.0.0", "test", 1),
+                "com.google.guava:failureaccess": ("1.0.1", "compile", 2),
+                # BOM 中的版本覆盖传递依赖声明的版本
+                "org.slf4j:slf4j-api": ("2.0.9", "compile", 2),
+            },
+        )
+
+    def test_poms_parsed_once(self):
+        """测试 POM 解析结果在多次解析间共享"""
+        pom_file = self._build_repository()
+
+        self.repository.resolve(pom_file)
+        parses = self.repository.parses
+        self.repository.resolve(pom_file)
+
+        self.assertEqual(self.repository.parses, parses)
+
+    def test_inherited_declarations_use_child_properties(self):
+        """测试继承的依赖和依赖管理使用子 POM 覆盖后的属性插值"""
+        self._install(
+            "com.acme:base:1",
+            _pom(
+                "com.acme:base:1",
+                "<properties><lib.version>1.0</lib.version>"
+                "<managed.version>1.0</managed.version></properties>"
+                "<dependencyManagement><dependencies>"
+                + _dependency("org.acme:managed:${managed.version}")
+                + "</dependencies></dependencyManagement>",
+                dependencies=[_dependency("org.acme:lib:${lib.version}")],
+            ),
+        )
+        pom_file = self.temp_dir / "pom.xml"
+        pom_file.write_text(
+            _pom(
+                "com.acme:app:1",
+                "<properties><lib.version>2.0</lib.version>"
+                "<managed.version>3.0</managed.version></properties>",
+                dependencies=[_dependency("org.acme:managed")],
+                parent="com.acme:base:1",
+            )
+        )
+
+        versions = {
+            artifact.name: artifact.version
+            for artifact in self.repository.resolve(pom_file)
+        }
+        self.assertEqual(versions, {"org.acme:lib": "2.0", "org.acme:managed": "3.0"})
+
+    def test_cyclic_parents_and_concurrent_resolution(self):
+        """测试循环的父 POM 不会挂起，多线程解析时每个 POM 只解析一次"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._install("com.acme:a:1", _pom("com.acme:a:1", parent="com.acme:b:1"))
+        self._install("com.acme:b:1", _pom("com.acme:b:1", parent="com.acme:a:1"))
+        cyclic = self.repository.pom_path("com.acme", "a", "1")
+        self.assertIsNotNone(self.repository.effective_pom(cyclic))
+
+        pom_file = self._build_repository()
+        repository = MavenRepository(self.repo_root)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(repository.resolve, [pom_file] * 16))
+
+        self.assertTrue(all(result == results[0] for result in results))
+        self.assertEqual(len(results[0]), 5)
+        sequential = MavenRepository(self.repo_root)
+        self.assertEqual(sequential.resolve(pom_file), results[0])
+        self.assertEqual(repository.parses, sequential.parses)
+
+    def test_read_gradle_lockfile(self):
+        """测试读取 gradle.lockfile"""
+        lockfile = self.temp_dir / "gradle.lockfile"
+        lockfile.write_text(
+            "# This is a Gradle generated file for dependency locking.\n"
+            "com.google.guava:guava:32.1.0-jre=compileClasspath,runtimeClasspath\n"
+            "junit:junit:4.13.2=testCompileClasspath\n"
+            "empty=annotationProcessor\n"
+        )
+
+        self.assertEqual(
+            read_gradle_lockfile(lockfile),
+            [
+                (
+                    "com.google.guava",
+                    "guava",
+                    "32.1.0-jre",
+                    ["compileClasspath", "runtimeClasspath"],
+                ),
+                ("junit", "junit", "4.13.2", ["testCompileClasspath"]),
+            ],
+        )
+
+    def test_read_verification_metadata(self):
+        """测试读取 verification-metadata.xml"""
+        metadata_file = self.temp_dir / "verification-metadata.xml"
+        metadata_file.write_text(
+            '<verification-metadata xmlns="https://schema.gradle.org/dependency-'
+            'verification"><components>'
+            '<component group="org.slf4j" name="slf4j-api" version="2.0.9">'
+            '<artifact name="slf4j-api-2.0.9.jar"/></component>'
+            "</components></verification-metadata>"
+        )
+
+        self.assertEqual(
+            read_verification_metadata(metadata_file),
+            [("org.slf4j", "slf4j-api", "2.0.9")],
+        )
+
+    def test_java_parser_reports_transitive_dependencies(self):
+        """测试 Java 解析器报告离线解析出的间接依赖"""
+        pom_file = self._build_repository()
+
+        clear_maven_repository()
+        with patch(
+            "depx.parsers.maven_repository.get_maven_local_repository",
+            return_value=self.repo_root,
+        ):
+            project = JavaParser().parse_project(pom_file.parent)
+        clear_maven_repository()
+
+        deps = {dep.name: dep for dep in project.dependencies}
+        self.assertEqual(deps["com.google.guava:guava"].installed_version, "32.1.0")
+        self.assertEqual(
+            deps["org.slf4j:slf4j-api"].dependency_type, DependencyType.TRANSITIVE
+        )
+        self.assertEqual(project.metadata["resolved_artifacts"], 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
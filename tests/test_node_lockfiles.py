@@ -0,0 +1,206 @@
+"""
+Node.js 锁文件读取测试
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from depx.parsers import node_lockfiles
+from depx.parsers.base import DependencyType
+from depx.parsers.node_lockfiles import find_lockfile, iter_locked_packages
+from depx.parsers.nodejs import NodeJSParser
+
+
+class TestNodeLockfiles(unittest.TestCase):
+    """Node.js 锁文件读取测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """测试后清理"""
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _read(self, name: str, content: str) -> list:
+        """写入锁文件并以很小的块大小读取，覆盖块边界的情况"""
+        lockfile = self.temp_dir / name
+        lockfile.write_text(content, encoding="utf-8")
+        with patch.object(node_lockfiles, "READ_CHUNK_SIZE", 7):
+            return [
+                (dep.name, dep.installed_version)
+                for dep in iter_locked_packages(lockfile)
+            ]
+
+    def test_npm_v3_packages(self):
+        """测试 v2/v3 的 packages 段"""
+        content = json.dumps(
+            {
+                "name": "app",
+                "lockfileVersion": 3,
+                "packages": {
+                    "": {"name": "app", "dependencies": {"express": "^4.0.0"}},
+                    "node_modules/express": {"version": "4.18.2", "dev": False},
+                    "node_modules/express/node_modules/debug": {"version": "2.6.9"},
+                    "node_modules/@types/node": {"version": "20.1.0"},
+                    "node_modules/local": {"resolved": "packages/local", "link": True},
+                    "packages/local": {"version": "1.0.0"},
+                },
+                "dependencies": {"express": {"version": "4.18.2"}},
+            },
+            indent=2,
+        )
+
+        self.assertEqual(
+            self._read("package-lock.json", content),
+            [("express", "4.18.2"), ("debug", "2.6.9"), ("@types/node", "20.1.0")],
+        )
+
+    def test_npm_v2_skips_legacy_dependencies(self):
+        """测试 v2 读完 packages 后不再读取重复的 dependencies 段"""
+        content = json.dumps(
+            {
+                "lockfileVersion": 2,
+                "packages": {"node_modules/ms": {"version": "2.1.3"}},
+            }
+        )
+        # 之后的 dependencies 段不完整，说明它没有被读取
+        content = content[:-1] + ', "dependencies": {"ms": {"version": '
+
+        with patch.object(
+            node_lockfiles._JsonStream, "skip_value", autospec=True
+        ) as skip_value:
+            self.assertEqual(
+                self._read("package-lock.json", content), [("ms", "2.1.3")]
+            )
+        skip_value.assert_not_called()
+
+    def test_npm_v1_nested_dependencies(self):
+        """测试 v1 嵌套的 dependencies 树"""
+        content = json.dumps(
+            {
+                "lockfileVersion": 1,
+                "dependencies": {
+                    "express": {
+                        "version": "4.18.2",
+                        "requires": {"debug": "2.6.9"},
+                        "dependencies": {"debug": {"version": "2.6.9"}},
+                    },
+                    "local": {"version": "file:../local"},
+                    "ms": {"version": "2.1.3", "integrity": 'sha512-"x"{'},
+                },
+            }
+        )
+
+        self.assertEqual(
+            self._read("npm-shrinkwrap.json", content),
+            [("debug", "2.6.9"), ("express", "4.18.2"), ("ms", "2.1.3")],
+        )
+
+    def test_yarn_classic_and_berry(self):
+        """测试 yarn classic 和 berry 格式"""
+        classic = (
+            "# THIS IS AN AUTOGENERATED FILE.\n"
+            "# yarn lockfile v1\n\n\n"
+            '"@babel/code-frame@^7.0.0", "@babel/code-frame@^7.10.4":\n'
+            '  version "7.12.13"\n'
+            '  resolved "https://registry.yarnpkg.com/x.tgz"\n'
+            "  dependencies:\n"
+            '    "@babel/highlight" "^7.12.13"\n\n'
+            "lodash@^4.17.21:\n"
+            '  version "4.17.21"\n'
+        )
+        self.assertEqual(
+            self._read("yarn.lock", classic),
+            [("@babel/code-frame", "7.12.13"), ("lodash", "4.17.21")],
+        )
+
+        berry = (
+            "__metadata:\n  version: 6\n  cacheKey: 8\n\n"
+            '"app@workspace:.":\n'
+            "  version: 0.0.0-use.local\n"
+            '  resolution: "app@workspace:."\n\n'
+            '"lodash@npm:^4.17.21":\n'
+            "  version: 4.17.21\n"
+            '  resolution: "lodash@npm:4.17.21"\n'
+        )
+        self.assertEqual(self._read("yarn.lock", berry), [("lodash", "4.17.21")])
+
+    def test_pnpm_lockfile_versions(self):
+        """测试 pnpm v5、v6 和 v9 的包键格式"""
+        content = (
+            "lockfileVersion: '6.0'\n\n"
+            "dependencies:\n"
+            "  react-dom:\n"
+            "    specifier: ^18.0.0\n"
+            "    version: 18.2.0(react@18.2.0)\n\n"
+            "packages:\n\n"
+            "  /react-dom@18.2.0(react@18.2.0):\n"
+            "    resolution: {integrity: sha512-x}\n"
+            "    dev: false\n\n"
+            "  /@babel/code-frame/7.12.13:\n"
+            "    resolution: {integrity: sha512-y}\n\n"
+            "  /react-is/16.13.1_react@18.2.0:\n"
+            "    dev: true\n\n"
+            "  '@types/node@20.1.0':\n"
+            "    resolution: {integrity: sha512-z}\n"
+        )
+
+        self.assertEqual(
+            self._read("pnpm-lock.yaml", content),
+            [
+                ("react-dom", "18.2.0"),
+                ("@babel/code-frame", "7.12.13"),
+                ("react-is", "16.13.1"),
+                ("@types/node", "20.1.0"),
+            ],
+        )
+
+    def test_invalid_lockfile(self):
+        """测试格式错误的锁文件不会抛出异常"""
+        self.assertEqual(self._read("package-lock.json", '{"packages": {"a": '), [])
+
+    def test_parser_reports_transitive_dependencies(self):
+        """测试 Node.js 解析器报告完整的间接依赖"""
+        (self.temp_dir / "package.json").write_text(
+            json.dumps({"name": "app", "dependencies": {"express": "^4.0.0"}})
+        )
+        (self.temp_dir / "package-lock.json").write_text(
+            json.dumps(
+                {
+                    "lockfileVersion": 3,
+                    "packages": {
+                        "node_modules/express": {"version": "4.18.2"},
+                        "node_modules/debug": {"version": "4.3.4"},
+                        "node_modules/express/node_modules/debug": {"version": "2.6.9"},
+                    },
+                }
+            )
+        )
+        self.assertEqual(find_lockfile(self.temp_dir).name, "package-lock.json")
+
+        project = NodeJSParser().parse_project(self.temp_dir)
+
+        deps = [
+            (dep.name, dep.installed_version, dep.dependency_type)
+            for dep in project.dependencies
+        ]
+        self.assertEqual(
+            deps,
+            [
+                ("express", "4.18.2", DependencyType.PRODUCTION),
+                ("debug", "4.3.4", DependencyType.TRANSITIVE),
+                ("debug", "2.6.9", DependencyType.TRANSITIVE),
+            ],
+        )
+        self.assertEqual(project.metadata["lockfile"], "package-lock.json")
+        self.assertEqual(project.metadata["locked_packages"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
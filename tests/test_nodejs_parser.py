@@ -0,0 +1,170 @@
+"""
+Node.js 解析器测试
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from depx.parsers.base import DependencyType, ProjectType
+from depx.parsers.nodejs import NodeJSParser
+
+
+class TestNodeJSParser(unittest.TestCase):
+    """Node.js 解析器测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.parser = NodeJSParser()
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """测试后清理"""
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write_package(self, relative: str, version: str, size: int) -> None:
+        """在 node_modules 中创建一个包"""
+        package_dir = self.temp_dir / "node_modules" / relative
+        package_dir.mkdir(parents=True)
+        (package_dir / "package.json").write_text(
+            json.dumps({"name": relative, "version": version, "description": relative})
+        )
+        (package_dir / "index.js").write_bytes(b"x" * size)
+
+    def test_project_type(self):
+        """测试项目类型"""
+        self.assertEqual(self.parser.project_type, ProjectType.NODEJS)
+
+    def test_parse_attributes_all_installed_packages(self):
+        """测试一次遍历归属 scoped、提升和嵌套的包"""
+        (self.temp_dir / "package.json").write_text(
+            json.dumps(
+                {
+                    "name": "app",
+                    "dependencies": {"express": "^4.0.0", "@types/node": "^20.0.0"},
+                    "devDependencies": {"jest": "^29.0.0"},
+                }
+            )
+        )
+        self._write_package("express", "4.18.2", 1000)
+        self._write_package("express/node_modules/debug", "2.6.9", 300)
+        self._write_package("@types/node", "20.1.0", 200)
+        # 提升安装的间接依赖
+        self._write_package("ms", "2.1.3", 50)
+        (self.temp_dir / "node_modules" / ".bin").mkdir()
+        (self.temp_dir / "node_modules" / ".bin" / "tool").write_bytes(b"x" * 7)
+
+        def tree_size(relative: str) -> int:
+            total = 0
+            for root, _, files in os.walk(self.temp_dir / "node_modules" / relative):
+                total += sum(os.path.getsize(Path(root) / name) for name in files)
+            return total
+
+        project = self.parser.parse_project(self.temp_dir)
+
+        self.assertIsNotNone(project)
+        deps = {dep.name: dep for dep in project.dependencies}
+        self.assertEqual(deps["express"].installed_version, "4.18.2")
+        self.assertEqual(deps["@types/node"].installed_version, "20.1.0")
+        self.assertEqual(deps["jest"].dependency_type, DependencyType.DEVELOPMENT)
+        self.assertIsNone(deps["jest"].installed_version)
+
+        # 嵌套的 node_modules 归属到顶层包
+        self.assertEqual(deps["express"].size_bytes, tree_size("express"))
+        self.assertEqual(deps["@types/node"].size_bytes, tree_size("@types/node"))
+        self.assertEqual(deps["jest"].size_bytes, 0)
+
+        # 项目总大小包含提升的包和 .bin
+        self.assertEqual(project.total_size_bytes, tree_size(""))
+        self.assertEqual(project.metadata["installed_packages"], 3)
+
+    def test_parse_without_node_modules(self):
+        """测试未安装依赖的项目"""
+        (self.temp_dir / "package.json").write_text(
+            json.dumps({"name": "app", "dependencies": {"lodash": "^4.0.0"}})
+        )
+
+        project = self.parser.parse_project(self.temp_dir)
+
+        self.assertEqual(project.total_size_bytes, 0)
+        self.assertIsNone(project.dependencies[0].installed_version)
+        self.assertNotIn("installed_packages", project.metadata)
+
+    def _write_hidden_lockfile(self, versions: dict) -> Path:
+        """写入 node_modules/.package-lock.json"""
+        packages = {
+            f"node_modules/{name}": {
+                "version": version,
+                "resolved": f"https://registry.npmjs.org/{name}/-/{version}.tgz",
+            }
+            for name, version in versions.items()
+        }
+        lockfile = self.temp_dir / "node_modules" / ".package-lock.json"
+        lockfile.write_text(
+            json.dumps({"name": "app", "lockfileVersion": 3, "packages": packages})
+        )
+        return lockfile
+
+    def test_hidden_lockfile_fast_path(self):
+        """测试优先使用隐藏锁文件中的版本，不读取各个包的 package.json"""
+        from unittest.mock import patch
+
+        from depx.parsers import nodejs
+
+        (self.temp_dir / "package.json").write_text(
+            json.dumps({"name": "app", "dependencies": {"express": "^4.0.0"}})
+        )
+        self._write_package("express", "4.18.2", 100)
+        self._write_package("@types/node", "20.1.0", 100)
+        self._write_hidden_lockfile(
+            {
+                "express": "4.18.3",
+                "express/node_modules/debug": "2.6.9",
+                "@types/node": "20.1.1",
+            }
+        )
+
+        with patch.object(
+            nodejs, "safe_read_json", wraps=nodejs.safe_read_json
+        ) as read_json:
+            project = self.parser.parse_project(self.temp_dir)
+            read_paths = [call.args[0] for call in read_json.call_args_list]
+
+        # 只有声明的依赖需要读取 package.json 获取描述
+        self.assertEqual(
+            read_paths,
+            [
+                self.temp_dir / "package.json",
+                self.temp_dir / "node_modules" / ".package-lock.json",
+                self.temp_dir / "node_modules" / "express" / "package.json",
+            ],
+        )
+        self.assertEqual(project.dependencies[0].installed_version, "4.18.3")
+        self.assertEqual(project.dependencies[0].description, "express")
+
+        index = self.parser._index_node_modules(self.temp_dir / "node_modules")
+        self.assertTrue(index.from_lockfile)
+        self.assertEqual(sorted(index.packages), ["@types/node", "express"])
+        self.assertEqual(index.packages["@types/node"].version, "20.1.1")
+        self.assertTrue(index.packages["express"].resolved.endswith("4.18.3.tgz"))
+
+    def test_stale_hidden_lockfile_falls_back(self):
+        """测试隐藏锁文件比 node_modules 旧时回退到逐个读取"""
+        (self.temp_dir / "package.json").write_text(
+            json.dumps({"name": "app", "dependencies": {"express": "^4.0.0"}})
+        )
+        self._write_package("express", "4.18.2", 100)
+        lockfile = self._write_hidden_lockfile({"express": "4.18.3"})
+        os.utime(lockfile, ns=(0, 0))
+
+        index = self.parser._index_node_modules(self.temp_dir / "node_modules")
+        self.assertFalse(index.from_lockfile)
+        self.assertEqual(index.packages["express"].version, "4.18.2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+路径匹配器测试
+"""
+
+from pathlib import Path
+
+from depx.config import DepxConfig
+from depx.utils.path_matcher import PathMatcher, glob_to_regex
+
+ROOT = Path("/scan/root")
+
+
+class TestPathMatcher:
+    """路径匹配器测试类"""
+
+    def test_glob_to_regex(self):
+        """测试 glob 模式转换"""
+        import re
+
+        assert re.fullmatch(glob_to_regex("*.egg-info"), "depx.egg-info")
+        assert not re.fullmatch(glob_to_regex("apps/*"), "apps/a/b")
+        assert re.fullmatch(glob_to_regex("**/dist"), "dist")
+        assert re.fullmatch(glob_to_regex("**/dist"), "a/b/dist")
+        assert re.fullmatch(glob_to_regex("build/**"), "build/x/y")
+        assert re.fullmatch(glob_to_regex("v[0-9]"), "v1")
+
+    def test_basename_and_hidden_excludes(self):
+        """测试目录名排除和隐藏目录"""
+        matcher = PathMatcher(ROOT, exclude_patterns=["build", "*.egg-info"])
+
+        assert matcher.is_excluded(ROOT / "a" / "build")
+        assert matcher.is_excluded(ROOT / "depx.egg-info")
+        assert matcher.is_excluded(ROOT / ".cache")
+        assert not matcher.is_excluded(ROOT / "src")
+        assert not matcher.is_excluded(ROOT / "builder")
+
+    def test_anchored_excludes(self):
+        """测试相对根目录的路径排除"""
+        matcher = PathMatcher(ROOT, exclude_patterns=["/vendor", "apps/*/dist"])
+
+        assert matcher.is_excluded(ROOT / "vendor")
+        assert not matcher.is_excluded(ROOT / "lib" / "vendor")
+        assert matcher.is_excluded(ROOT / "apps" / "web" / "dist")
+        assert not matcher.is_excluded(ROOT / "apps" / "web")
+
+    def test_include_patterns_prune_and_match(self):
+        """测试 include 路径模式的剪枝和匹配"""
+        matcher = PathMatcher(ROOT, include_patterns=["packages/*"])
+
+        assert not matcher.is_excluded(ROOT / "packages")
+        assert not matcher.is_excluded(ROOT / "packages" / "a" / "src")
+        assert matcher.is_excluded(ROOT / "docs")
+
+        assert matcher.is_included(ROOT / "packages" / "a")
+        assert matcher.is_included(ROOT / "packages" / "a" / "nested")
+        assert not matcher.is_included(ROOT / "packages")
+        assert not matcher.is_included(ROOT)
+
+    def test_from_config(self):
+        """测试从配置构建匹配器"""
+        config = DepxConfig()
+        config.scan.exclude_patterns = ["legacy"]
+        matcher = PathMatcher.from_config(config, ROOT)
+
+        assert matcher.is_excluded(ROOT / "node_modules")
+        assert matcher.is_excluded(ROOT / "__pycache__")
+        assert matcher.is_excluded(ROOT / "legacy")
+        assert matcher.is_included(ROOT / "anything")
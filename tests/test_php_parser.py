@@ -0,0 +1,150 @@
+"""
+PHP 解析器测试
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from depx.parsers.base import DependencyType, ProjectType
+from depx.parsers.php import PHPParser
+
+
+class TestPHPParser(unittest.TestCase):
+    """PHP 解析器测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.parser = PHPParser()
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.vendor_dir = self.temp_dir / "vendor"
+
+    def tearDown(self):
+        """测试后清理"""
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _install(self, name: str, size: int) -> Path:
+        """在 vendor 中创建一个包"""
+        package_dir = self.vendor_dir / name
+        (package_dir / "src").mkdir(parents=True)
+        (package_dir / "src" / "index.php").write_bytes(b"x" * size)
+        return package_dir
+
+    def _write_composer_json(self) -> None:
+        (self.temp_dir / "composer.json").write_text(
+            json.dumps(
+                {
+                    "name": "acme/app",
+                    "require": {"php": "^8.1", "laravel/framework": "^10.0"},
+                    "require-dev": {"phpunit/phpunit": "^10.0"},
+                }
+            )
+        )
+
+    def test_project_type(self):
+        """测试项目类型"""
+        self.assertEqual(self.parser.project_type, ProjectType.PHP)
+
+    def test_can_parse_php_sources(self):
+        """测试仅有 PHP 源文件的项目"""
+        (self.temp_dir / "index.php").write_text("<?php")
+
+        with patch.object(Path, "glob", side_effect=AssertionError("glob")):
+            project = self.parser.parse_project(self.temp_dir)
+
+        self.assertEqual(project.config_file, self.temp_dir / "index.php")
+
+    def test_composer2_installed_json(self):
+        """测试读取 Composer 2 的 installed.json 并一次遍历 vendor"""
+        self._write_composer_json()
+        framework = self._install("laravel/framework", 1000)
+        self._install("symfony/console", 300)
+        self._install("phpunit/phpunit", 200)
+        self._install("sebastian/diff", 50)
+        (self.vendor_dir / "composer").mkdir()
+        (self.vendor_dir / "autoload.php").write_bytes(b"x" * 7)
+        (self.vendor_dir / "composer" / "installed.json").write_text(
+            json.dumps(
+                {
+                    "packages": [
+                        {
+                            "name": "laravel/framework",
+                            "version": "v10.30.1",
+                            "install-path": "../laravel/framework",
+                        },
+                        {
+                            "name": "symfony/console",
+                            "version": "v6.3.4",
+                            "install-path": "../symfony/console",
+                        },
+                        {
+                            "name": "phpunit/phpunit",
+                            "version": "10.4.2",
+                            "install-path": "../phpunit/phpunit",
+                        },
+                        {
+                            "name": "sebastian/diff",
+                            "version": "5.0.3",
+                            "install-path": "../sebastian/diff",
+                        },
+                        {
+                            "name": "acme/meta",
+                            "version": "1.0.0",
+                            "type": "metapackage",
+                            "install-path": None,
+                        },
+                    ],
+                    "dev": True,
+                    "dev-package-names": ["phpunit/phpunit", "sebastian/diff"],
+                }
+            )
+        )
+
+        def tree_size(path: Path) -> int:
+            total = 0
+            for root, _, files in os.walk(path):
+                total += sum(os.path.getsize(Path(root) / name) for name in files)
+            return total
+
+        project = self.parser.parse_project(self.temp_dir)
+
+        deps = {dep.name: dep for dep in project.dependencies}
+        self.assertEqual(deps["laravel/framework"].installed_version, "v10.30.1")
+        self.assertEqual(deps["laravel/framework"].install_path, framework)
+        self.assertEqual(deps["laravel/framework"].size_bytes, 1000)
+        self.assertEqual(
+            deps["symfony/console"].dependency_type, DependencyType.TRANSITIVE
+        )
+        self.assertEqual(deps["symfony/console"].size_bytes, 300)
+        # 仅由 require-dev 引入的包标记为开发依赖
+        self.assertEqual(
+            deps["sebastian/diff"].dependency_type, DependencyType.DEVELOPMENT
+        )
+        self.assertEqual(deps["acme/meta"].size_bytes, 0)
+        self.assertEqual(project.metadata["installed_packages"], 5)
+        self.assertEqual(project.total_size_bytes, tree_size(self.vendor_dir))
+
+    def test_composer1_installed_json(self):
+        """测试读取 Composer 1 的 installed.json（顶层为列表）"""
+        self._write_composer_json()
+        self._install("laravel/framework", 100)
+        (self.vendor_dir / "composer").mkdir()
+        (self.vendor_dir / "composer" / "installed.json").write_text(
+            json.dumps([{"name": "laravel/framework", "version": "v5.8.38"}])
+        )
+
+        project = self.parser.parse_project(self.temp_dir)
+
+        deps = {dep.name: dep for dep in project.dependencies}
+        self.assertEqual(deps["laravel/framework"].installed_version, "v5.8.38")
+        self.assertEqual(deps["laravel/framework"].size_bytes, 100)
+        self.assertIsNone(deps["phpunit/phpunit"].installed_version)
+
+
+if __name__ == "__main__":
+    unittest.main()
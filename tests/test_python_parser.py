@@ -0,0 +1,216 @@
+"""
+Python 解析器测试
+"""
+
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from depx.parsers.base import DependencyType, ProjectType
+from depx.parsers.python import PythonParser
+from depx.parsers.python_envs import (
+    _poetry_env_prefix,
+    clear_python_environments,
+    get_python_environment_resolver,
+)
+from depx.parsers.site_packages import (
+    canonicalize_name,
+    clear_site_packages_indexes,
+    get_site_packages_index,
+)
+
+
+class TestPythonParser(unittest.TestCase):
+    """Python 解析器测试类"""
+
+    def setUp(self):
+        """测试前准备"""
+        self.parser = PythonParser()
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.site_packages = (
+            self.temp_dir / ".venv" / "lib" / "python3.11" / "site-packages"
+        )
+        self.site_packages.mkdir(parents=True)
+        clear_site_packages_indexes()
+        clear_python_environments()
+
+    def tearDown(self):
+        """测试后清理"""
+        clear_site_packages_indexes()
+        clear_python_environments()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _install(
+        self, dist_name: str, version: str, files: dict, site_packages=None
+    ) -> None:
+        """写入一个 dist-info 目录和 RECORD"""
+        site_packages = site_packages or self.site_packages
+        dist_info = site_packages / f"{dist_name}-{version}.dist-info"
+        dist_info.mkdir()
+        rows = []
+        for relative, size in files.items():
+            path = site_packages / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"x" * size)
+            rows.append(f"{relative},sha256=abc,{size}")
+        (dist_info / "METADATA").write_text(f"Name: {dist_name}\n")
+        rows.append(f"{dist_name}-{version}.dist-info/METADATA,,")
+        rows.append(f"{dist_name}-{version}.dist-info/RECORD,,")
+        (dist_info / "RECORD").write_text("\n".join(rows) + "\n")
+
+    def test_project_type(self):
+        """测试项目类型"""
+        self.assertEqual(self.parser.project_type, ProjectType.PYTHON)
+
+    def test_canonicalize_name(self):
+        """测试 PEP 503 名称规范化"""
+        self.assertEqual(canonicalize_name("Zope.Interface"), "zope-interface")
+        self.assertEqual(canonicalize_name("typing__extensions"), "typing-extensions")
+
+    def test_sizes_from_record(self):
+        """测试从 RECORD 计算大小和安装版本，不遍历目录"""
+        (self.temp_dir / "requirements.txt").write_text(
+            "Django>=4.2\nzope.interface\nmissing-package==1.0\n"
+        )
+        self._install(
+            "django", "4.2.7", {"django/__init__.py": 100, "django/db/models.py": 300}
+        )
+        self._install("zope.interface", "6.1", {"zope/interface/__init__.py": 50})
+        self._install("asgiref", "3.7.2", {"asgiref/__init__.py": 20})
+
+        with patch.object(Path, "rglob", side_effect=AssertionError("rglob")), patch(
+            "os.walk", side_effect=AssertionError("walk")
+        ):
+            project = self.parser.parse_project(self.temp_dir)
+
+        deps = {dep.name: dep for dep in project.dependencies}
+        django = deps["Django"]
+        self.assertEqual(django.installed_version, "4.2.7")
+        self.assertEqual(django.install_path, self.site_packages / "django")
+        metadata_size = len("Name: django\n") + len(
+            (self.site_packages / "django-4.2.7.dist-info" / "RECORD").read_bytes()
+        )
+        self.assertEqual(django.size_bytes, 400 + metadata_size)
+
+        self.assertEqual(deps["zope.interface"].installed_version, "6.1")
+        self.assertIsNone(deps["missing-package"].installed_version)
+        self.assertEqual(deps["asgiref"].dependency_type, DependencyType.TRANSITIVE)
+        self.assertEqual(project.metadata["installed_distributions"], 3)
+        self.assertEqual(
+            project.total_size_bytes,
+            sum(dep.size_bytes for dep in project.dependencies),
+        )
+
+        # 同一个 site-packages 只建立一次索引
+        self.parser.parse_project(self.temp_dir)
+        self.assertEqual(get_site_packages_index(self.site_packages).builds, 1)
+
+    def test_project_without_environment(self):
+        """测试没有虚拟环境的项目不计算全局 site-packages"""
+        shutil.rmtree(self.temp_dir / ".venv")
+        (self.temp_dir / "requirements.txt").write_text("requests\n")
+
+        with patch("subprocess.run", side_effect=AssertionError("subprocess")):
+            project = self.parser.parse_project(self.temp_dir)
+
+        self.assertEqual(project.total_size_bytes, 0)
+        self.assertEqual(project.dependencies[0].size_bytes, 0)
+
+    def _make_env(self, env_dir: Path, pyvenv_cfg: bool = True) -> Path:
+        """创建一个外部环境，返回其 site-packages"""
+        site_packages = env_dir / "lib" / "python3.12" / "site-packages"
+        site_packages.mkdir(parents=True)
+        if pyvenv_cfg:
+            (env_dir / "pyvenv.cfg").write_text("home = /usr/bin\nversion = 3.12.1\n")
+        return site_packages
+
+    def test_poetry_environment(self):
+        """测试按 Poetry 的命名规则定位集中存放的虚拟环境"""
+        shutil.rmtree(self.temp_dir / ".venv")
+        project_dir = self.temp_dir / "app"
+        project_dir.mkdir()
+        (project_dir / "pyproject.toml").write_text(
+            '[tool.poetry]\nname = "legacy"\n\n[project]\n'
+            'name = "My_App"\ndependencies = ["requests>=2"]\n'
+        )
+        (project_dir / "poetry.lock").write_text("")
+        virtualenvs = self.temp_dir / "virtualenvs"
+        # [project].name 优先，并按 PEP 503 规范化
+        prefix = _poetry_env_prefix("My_App", project_dir)
+        self.assertTrue(prefix.startswith("my-app-"))
+        self.assertEqual(prefix, _poetry_env_prefix("my.app", project_dir))
+        site_packages = self._make_env(virtualenvs / f"{prefix}-py3.12")
+        self._make_env(virtualenvs / "other-AbCdEfGh-py3.12")
+        self._install("requests", "2.31.0", {"requests/api.py": 80}, site_packages)
+        self._install("idna", "3.6", {"idna/core.py": 40}, site_packages)
+
+        env = {"POETRY_VIRTUALENVS_PATH": str(virtualenvs)}
+        with patch.dict("os.environ", env), patch(
+            "subprocess.run", side_effect=AssertionError("subprocess")
+        ):
+            project = self.parser.parse_project(project_dir)
+
+        deps = {dep.name: dep for dep in project.dependencies}
+        self.assertEqual(deps["requests"].installed_version, "2.31.0")
+        self.assertEqual(deps["idna"].dependency_type, DependencyType.TRANSITIVE)
+        self.assertEqual(project.metadata["python_environment_kind"], "poetry")
+        self.assertGreater(project.total_size_bytes, 120)
+
+    def test_pyenv_version_file(self):
+        """测试 .python-version 选择的 pyenv 虚拟环境和共享解释器"""
+        shutil.rmtree(self.temp_dir / ".venv")
+        (self.temp_dir / "requirements.txt").write_text("requests\n")
+        pyenv_root = self.temp_dir / "pyenv"
+        shared = self._make_env(pyenv_root / "versions" / "3.12.1", pyvenv_cfg=False)
+        self._install("requests", "2.30.0", {"requests/api.py": 80}, shared)
+        venv = self._make_env(pyenv_root / "versions" / "my-venv")
+        self._install("requests", "2.31.0", {"requests/api.py": 90}, venv)
+
+        resolver = get_python_environment_resolver()
+        with patch.dict("os.environ", {"PYENV_ROOT": str(pyenv_root)}):
+            (self.temp_dir / ".python-version").write_text("my-venv\n")
+            environments = resolver.resolve(self.temp_dir)
+            self.assertEqual([env.path.name for env in environments], ["my-venv"])
+            self.assertEqual(environments[0].python_version, "3.12.1")
+
+            # 普通的 pyenv 版本被多个项目共享，只提供已安装版本，不计入大小
+            (self.temp_dir / ".python-version").write_text("3.12.1\n")
+            project = self.parser.parse_project(self.temp_dir)
+
+        requests = project.dependencies[0]
+        self.assertEqual(requests.installed_version, "2.30.0")
+        self.assertEqual(requests.size_bytes, 0)
+        self.assertEqual(project.total_size_bytes, 0)
+        self.assertEqual(project.metadata["python_environment_kind"], "pyenv")
+
+    def test_pipenv_environment_from_relative_path(self):
+        """测试相对路径的项目按 Pipfile 的真实路径计算 Pipenv 环境名"""
+        project_dir = self.temp_dir / "web app"
+        project_dir.mkdir()
+        (project_dir / "Pipfile").write_text('[packages]\nflask = "*"\n')
+        pipfile = os.path.realpath(project_dir / "Pipfile")
+        digest = hashlib.sha256(pipfile.encode()).digest()[:6]
+        env_name = "web_app-" + base64.urlsafe_b64encode(digest).decode()[:8]
+        workon_home = self.temp_dir / "virtualenvs"
+        site_packages = self._make_env(workon_home / env_name)
+        self._install("flask", "3.0.0", {"flask/app.py": 60}, site_packages)
+
+        cwd = os.getcwd()
+        os.chdir(self.temp_dir)
+        try:
+            with patch.dict("os.environ", {"WORKON_HOME": str(workon_home)}):
+                project = self.parser.parse_project(Path("web app"))
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(project.metadata["python_environment_kind"], "pipenv")
+        self.assertEqual(project.dependencies[0].installed_version, "3.0.0")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -226,6 +226,143 @@ channel = "1.65.0"
         version = self.parser._detect_rust_version(self.temp_dir)
         self.assertEqual(version, "1.65.0")
 
+    def test_cargo_toml_parsed_once(self):
+        """测试同一个 Cargo.toml 在一次解析中只读取一次"""
+        from depx.utils.toml_utils import clear_toml_cache, get_toml_cache
+
+        cargo_file = self.temp_dir / "Cargo.toml"
+        cargo_file.write_text("""[package]
+name = "cached"
+version = "0.1.0"
+edition = "2021"
+
+[dependencies]
+serde = "1.0"
+""")
+
+        clear_toml_cache()
+        project_info = self.parser.parse_project(self.temp_dir)
+
+        self.assertEqual(project_info.name, "cached")
+        self.assertEqual(project_info.metadata["edition"], "2021")
+        self.assertEqual(get_toml_cache().misses, 1)
+
+        # 文件变化后重新解析
+        cargo_file.write_text("""[package]
+name = "renamed"
+version = "0.1.0"
+""")
+        self.assertEqual(self.parser.parse_project(self.temp_dir).name, "renamed")
+        self.assertEqual(get_toml_cache().misses, 2)
+
+    def test_workspace_members_and_shared_target(self):
+        """测试工作区成员展开，共享的 target 只计入根项目"""
+        (self.temp_dir / "Cargo.toml").write_text("""[workspace]
+members = ["crates/*", "tools/cli"]
+exclude = ["crates/skip"]
+""")
+        (self.temp_dir / "Cargo.lock").write_text("""version = 3
+
+[[package]]
+name = "serde"
+version = "1.0.190"
+""")
+        for member in ["crates/core", "crates/skip", "tools/cli"]:
+            member_dir = self.temp_dir / member
+            member_dir.mkdir(parents=True)
+            (member_dir / "Cargo.toml").write_text(f"""[package]
+name = "{member_dir.name}"
+version = "0.1.0"
+
+[dependencies]
+serde = "1.0"
+""")
+        (self.temp_dir / "crates" / "notes").mkdir()
+        (self.temp_dir / "target" / "debug").mkdir(parents=True)
+        (self.temp_dir / "target" / "debug" / "app").write_bytes(b"x" * 4096)
+
+        projects = self.parser.parse_projects(self.temp_dir)
+
+        self.assertEqual(
+            [p.name for p in projects], [self.temp_dir.name, "core", "cli"]
+        )
+        root, core, cli = projects
+        self.assertEqual(
+            root.metadata["workspace_members"], ["crates/core", "tools/cli"]
+        )
+        self.assertEqual(root.total_size_bytes, 4096)
+        self.assertEqual(core.total_size_bytes, 0)
+        self.assertEqual(cli.total_size_bytes, 0)
+        self.assertEqual(core.metadata["workspace_root"], str(self.temp_dir))
+        self.assertEqual(core.dependencies[0].installed_version, "1.0.190")
+
+    def test_parse_projects_without_workspace(self):
+        """测试普通项目只返回自身"""
+        (self.temp_dir / "Cargo.toml").write_text("""[package]
+name = "single"
+version = "0.1.0"
+""")
+
+        projects = self.parser.parse_projects(self.temp_dir)
+
+        self.assertEqual([p.name for p in projects], ["single"])
+        self.assertNotIn("workspace_members", projects[0].metadata)
+
+    def test_registry_index_uses_locked_version(self):
+        """测试按 Cargo.lock 的版本在共享的注册表索引中查找 crate"""
+        import os
+        from unittest.mock import patch
+
+        from depx.parsers.cargo_registry import (
+            clear_cargo_registry_index,
+            get_cargo_registry_index,
+        )
+
+        cargo_home = self.temp_dir / "cargo-home"
+        src = cargo_home / "registry" / "src" / "index.crates.io-6f17d22bba15001f"
+        cache = cargo_home / "registry" / "cache" / "index.crates.io-6f17d22bba15001f"
+        for name, size in [
+            ("serde-1.0.100", 10),
+            ("serde-1.0.190", 20),
+            ("serde_json-1.0.108", 30),
+            ("wasm-bindgen-0.2.87", 40),
+        ]:
+            (src / name).mkdir(parents=True)
+            (src / name / "lib.rs").write_bytes(b"x" * size)
+        cache.mkdir(parents=True)
+        (cache / "serde-1.0.190.crate").write_bytes(b"x" * 5)
+
+        project_dir = self.temp_dir / "app"
+        project_dir.mkdir()
+        (project_dir / "Cargo.toml").write_text(
+            '[package]\nname = "app"\n\n[dependencies]\n'
+            'serde = "1.0"\nserde_json = "1.0"\nwasm-bindgen = "0.2"\n'
+            'tokio = "1"\n'
+        )
+        (project_dir / "Cargo.lock").write_text(
+            '[[package]]\nname = "serde"\nversion = "1.0.190"\n\n'
+            '[[package]]\nname = "serde_json"\nversion = "1.0.999"\n'
+        )
+
+        with patch.dict(os.environ, {"CARGO_HOME": str(cargo_home)}):
+            clear_cargo_registry_index()
+            project = self.parser.parse_project(project_dir)
+            self.parser.parse_project(project_dir)
+            self.assertEqual(get_cargo_registry_index().builds, 1)
+
+        deps = {dep.name: dep for dep in project.dependencies}
+        # 锁定版本对应的目录加上 .crate 归档
+        self.assertEqual(deps["serde"].install_path, src / "serde-1.0.190")
+        self.assertEqual(deps["serde"].size_bytes, 25)
+        # 锁定的版本不在注册表中
+        self.assertIsNone(deps["serde_json"].install_path)
+        self.assertEqual(deps["serde_json"].size_bytes, 0)
+        # 没有锁定版本时取最新版本，名称中的连字符不影响解析
+        self.assertEqual(
+            deps["wasm-bindgen"].install_path, src / "wasm-bindgen-0.2.87"
+        )
+        self.assertIsNone(deps["tokio"].install_path)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -2,7 +2,10 @@
 项目扫描器测试
 """
 
+import logging
+import os
 import pytest
+import shutil
 import tempfile
 import json
 from pathlib import Path
@@ -107,3 +110,525 @@ class TestProjectScanner:
         """测试获取支持的项目类型"""
         types = self.scanner.get_supported_project_types()
         assert ProjectType.NODEJS in types
+
+    def test_snapshot_detection_matches_can_parse(self):
+        """测试目录快照识别结果与 can_parse 一致"""
+        from depx.utils.file_utils import read_directory_snapshot
+
+        layouts = {
+            "go-src": ["main.go"],
+            "php-src": ["index.php"],
+            "dotnet": ["App.csproj"],
+            "rust": ["Cargo.toml"],
+            "lock-only": ["Cargo.lock", "go.sum", "composer.lock"],
+            "plain": ["README.md"],
+        }
+
+        for dir_name, files in layouts.items():
+            project_dir = self.temp_dir / dir_name
+            project_dir.mkdir()
+            for file_name in files:
+                (project_dir / file_name).write_text("")
+
+            snapshot = read_directory_snapshot(project_dir)
+            for parser in self.scanner._parsers.values():
+                assert parser.can_parse_snapshot(snapshot) == parser.can_parse(
+                    project_dir
+                ), (dir_name, parser.project_type)
+
+    def test_scan_go_project_by_source_file(self):
+        """测试通过源文件扩展名识别项目"""
+        project_dir = self.temp_dir / "tool"
+        project_dir.mkdir()
+        (project_dir / "main.go").write_text("package main\n")
+
+        projects = self.scanner.scan_directory(self.temp_dir)
+
+        assert len(projects) == 1
+        assert projects[0].project_type == ProjectType.GO
+
+    def test_scan_traversal_orders(self):
+        """测试不同遍历顺序发现相同的项目"""
+        for name in ["a/b/c/deep", "shallow", "x/mid"]:
+            project_dir = self.temp_dir / name
+            project_dir.mkdir(parents=True)
+            with open(project_dir / "package.json", "w") as f:
+                json.dump({"name": Path(name).name}, f)
+
+        for order in ["depth", "breadth", "size"]:
+            candidates = list(
+                self.scanner._find_project_candidates(self.temp_dir, 5, order)
+            )
+            names = [snapshot.path.name for snapshot in candidates]
+            assert sorted(names) == ["deep", "mid", "shallow"]
+            if order == "breadth":
+                assert names[0] == "shallow" and names[-1] == "deep"
+
+    def test_walker_respects_max_depth(self):
+        """测试遍历器遵守最大深度"""
+        project_dir = self.temp_dir / "a" / "b" / "c"
+        project_dir.mkdir(parents=True)
+        (project_dir / "package.json").write_text("{}")
+
+        assert list(self.scanner._find_project_candidates(self.temp_dir, 2)) == []
+        assert len(list(self.scanner._find_project_candidates(self.temp_dir, 3))) == 1
+
+    def test_walker_bounds_pending_directories(self):
+        """测试待访问目录数不超过 max_pending，且结果与不限制时相同"""
+        from depx.core.walker import DirectoryWalker, TraversalOrder
+
+        for i in range(30):
+            for j in range(4):
+                project_dir = self.temp_dir / f"d{i}" / f"p{j}"
+                project_dir.mkdir(parents=True)
+                (project_dir / "package.json").write_text("{}")
+
+        def is_match(snapshot):
+            return "package.json" in snapshot.file_names
+
+        for order in TraversalOrder:
+            unbounded = DirectoryWalker(order=order)
+            expected = sorted(s.path for s in unbounded.walk(self.temp_dir, is_match))
+
+            walker = DirectoryWalker(order=order, max_pending=5)
+            found = [s.path for s in walker.walk(self.temp_dir, is_match)]
+
+            assert sorted(found) == expected and len(expected) == 120
+            assert walker.peak_pending <= 5
+            if order == TraversalOrder.DEPTH_FIRST:
+                assert found == [s.path for s in unbounded.walk(self.temp_dir, is_match)]
+
+    def test_walker_stats_only_root_directory(self):
+        """测试遍历时子目录身份取自目录列表，只有根目录（或 -x 时）需要 stat"""
+        from unittest.mock import patch
+
+        from depx.core import walker as walker_module
+        from depx.core.walker import DirectoryWalker
+
+        for i in range(5):
+            (self.temp_dir / f"d{i}" / "sub").mkdir(parents=True)
+
+        def walk_stats(**kwargs):
+            with patch.object(
+                walker_module.os, "stat", wraps=walker_module.os.stat
+            ) as stat:
+                list(DirectoryWalker(**kwargs).walk(self.temp_dir, lambda s: False))
+            return stat.call_count
+
+        assert walk_stats() == 1
+        assert walk_stats(one_file_system=True) == 11
+
+    def test_size_order_uses_own_entry_count(self):
+        """测试大小优先按目录自身的条目数排序，而不是父目录的条目数"""
+        from depx.core.walker import DirectoryWalker, TraversalOrder
+
+        # a 只有一个条目，但其中的 big 很大；z 很大，但其中的 small 很小
+        big = self.temp_dir / "a" / "big"
+        small = self.temp_dir / "z" / "small"
+        for project_dir in [big, small]:
+            project_dir.mkdir(parents=True)
+            (project_dir / "package.json").write_text("{}")
+        for i in range(30):
+            (big / f"f{i}.js").write_text("x")
+            (self.temp_dir / "z" / f"f{i}.txt").write_text("x")
+
+        walker = DirectoryWalker(order=TraversalOrder.SIZE_FIRST)
+        found = walker.walk(
+            self.temp_dir, lambda snapshot: "package.json" in snapshot.file_names
+        )
+        assert [snapshot.path.name for snapshot in found] == ["small", "big"]
+
+    def test_incremental_scan_reuses_index(self):
+        """测试增量扫描复用未变化的项目"""
+        import os
+        from unittest.mock import patch
+
+        from depx.core.scan_index import ScanIndex
+        from depx.parsers.nodejs import NodeJSParser
+
+        project_dir = self.temp_dir / "tree" / "app"
+        project_dir.mkdir(parents=True)
+        package_json = project_dir / "package.json"
+        package_json.write_text(json.dumps({"name": "app", "dependencies": {"a": "1"}}))
+
+        index = ScanIndex(self.temp_dir / "cache" / "index.sqlite3", project_ttl=3600)
+        scanner = ProjectScanner(index=index)
+        tree = self.temp_dir / "tree"
+
+        first = scanner.scan_directory(tree)
+        assert [p.name for p in first] == ["app"]
+
+        node_parser = scanner._parsers[ProjectType.NODEJS]
+        with patch.object(
+            NodeJSParser, "parse_project", wraps=node_parser.parse_project
+        ) as parse_mock:
+            second = scanner.scan_directory(tree)
+            assert parse_mock.call_count == 0
+            assert second[0].name == "app"
+            assert second[0].dependencies[0].name == "a"
+
+            package_json.write_text(json.dumps({"name": "app2"}))
+            stat = package_json.stat()
+            os.utime(package_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            third = scanner.scan_directory(tree)
+            assert parse_mock.call_count == 1
+            assert third[0].name == "app2"
+
+        index.close()
+
+    def test_index_without_project_ttl_remeasures_sizes(self):
+        """测试默认不复用项目记录，依赖目录内部的修改反映在大小中"""
+        from depx.core.scan_index import ScanIndex
+
+        project_dir = self.temp_dir / "tree" / "app"
+        express = project_dir / "node_modules" / "express"
+        (express / "lib").mkdir(parents=True)
+        (express / "package.json").write_text('{"version": "4.18.2"}')
+        (project_dir / "package.json").write_text(
+            json.dumps({"name": "app", "dependencies": {"express": "^4.18.0"}})
+        )
+
+        index = ScanIndex(self.temp_dir / "cache" / "index.sqlite3")
+        scanner = ProjectScanner(index=index)
+        tree = self.temp_dir / "tree"
+        before = scanner.scan_directory(tree)[0].total_size_bytes
+
+        # 深层写入不改变项目指纹
+        (express / "lib" / "big.js").write_bytes(b"x" * 800_000)
+        after = scanner.scan_directory(tree)[0].total_size_bytes
+
+        assert after >= before + 800_000
+        index.close()
+
+    def test_index_deletes_only_removed_subtrees(self):
+        """测试删除目录记录时不误删大小写不同或含 _ 的相邻目录"""
+        from depx.core.scan_index import ScanIndex
+        from depx.utils.file_utils import read_directory_snapshot
+
+        names = ["proj", "Proj", "my_x", "myAx"]
+        for name in names:
+            (self.temp_dir / "tree" / name / "sub").mkdir(parents=True, exist_ok=True)
+        if len(os.listdir(self.temp_dir / "tree")) < len(names):
+            pytest.skip("requires a case-sensitive filesystem")
+
+        index = ScanIndex(self.temp_dir / "cache" / "index.sqlite3")
+        tree = self.temp_dir / "tree"
+        for directory in [tree] + [tree / name / "sub" for name in names]:
+            index.store_directory(
+                read_directory_snapshot(directory), os.stat(directory)
+            )
+
+        for name in ["proj", "my_x"]:
+            shutil.rmtree(tree / name)
+        index.store_directory(read_directory_snapshot(tree), os.stat(tree))
+
+        for name in names:
+            sub = tree / name / "sub"
+            cached = sub.exists() and index.lookup_directory(sub, os.stat(sub))
+            assert bool(cached) == (name in ["Proj", "myAx"]), name
+        index.close()
+
+    def test_parse_with_fixed_and_adaptive_workers(self):
+        """测试固定线程数和自适应线程数都能解析全部项目"""
+        for i in range(6):
+            project_dir = self.temp_dir / f"p{i}"
+            project_dir.mkdir()
+            (project_dir / "package.json").write_text(json.dumps({"name": f"p{i}"}))
+
+        for workers in [1, 3, 0]:
+            projects = self.scanner.scan_directory(self.temp_dir, workers=workers)
+            assert sorted(p.name for p in projects) == [f"p{i}" for i in range(6)]
+
+    def test_parse_with_process_executor(self):
+        """测试进程池后端与线程后端解析结果一致"""
+        for i in range(4):
+            project_dir = self.temp_dir / f"p{i}"
+            project_dir.mkdir()
+            (project_dir / "package.json").write_text(
+                json.dumps({"name": f"p{i}", "dependencies": {"lodash": "^4.0.0"}})
+            )
+
+        threaded = self.scanner.scan_directory(self.temp_dir, executor="thread")
+        processed = self.scanner.scan_directory(
+            self.temp_dir, workers=2, executor="process"
+        )
+
+        assert sorted(p.name for p in processed) == sorted(p.name for p in threaded)
+        for project in processed:
+            assert project.project_type == ProjectType.NODEJS
+            assert [d.name for d in project.dependencies] == ["lodash"]
+
+    def test_estimate_mode_measures_top_projects_exactly(self):
+        """测试估计模式下最大的项目被精确统计，估计结果不写入索引"""
+        from depx.core.scan_index import ScanIndex
+        from depx.utils.file_utils import get_directory_size
+
+        for i, packages in enumerate([30, 20, 10]):
+            project_dir = self.temp_dir / "tree" / f"p{i}"
+            lodash = project_dir / "node_modules" / "lodash"
+            for j in range(packages):
+                module = lodash / f"m{j}"
+                module.mkdir(parents=True)
+                for k in range(40):
+                    size = 50 + (j * 31 + k * 17) % 700
+                    (module / f"f{k}.js").write_bytes(b"x" * size)
+            (project_dir / "package.json").write_text(
+                json.dumps({"name": f"p{i}", "dependencies": {"lodash": "^4.0.0"}})
+            )
+
+        index = ScanIndex(self.temp_dir / "cache" / "index.sqlite3")
+        scanner = ProjectScanner(index=index)
+        tree = self.temp_dir / "tree"
+        projects = scanner.scan_directory(tree, estimate_top=1)
+        by_name = {p.name: p for p in projects}
+
+        largest = by_name["p0"]
+        assert largest.size_error_bytes == 0
+        assert largest.total_size_bytes == get_directory_size(
+            tree / "p0" / "node_modules" / "lodash"
+        )
+        assert by_name["p1"].size_error_bytes > 0
+        assert by_name["p1"].dependencies[0].size_error_bytes > 0
+
+        # 估计结果没有写入索引，随后的精确扫描得到精确值
+        exact = {p.name: p for p in scanner.scan_directory(tree)}
+        assert exact["p1"].size_error_bytes == 0
+        index.close()
+
+    def test_estimate_mode_logs_refined_count(self, caplog):
+        """测试日志中只统计实际重新精确统计的项目"""
+        big = self.temp_dir / "big"
+        for j in range(30):
+            module = big / "node_modules" / "lodash" / f"m{j}"
+            module.mkdir(parents=True)
+            for k in range(40):
+                (module / f"f{k}.js").write_bytes(b"x" * (50 + (j * 31 + k * 17) % 700))
+        (self.temp_dir / "small" / "node_modules" / "ms").mkdir(parents=True)
+        for name in ["big", "small"]:
+            (self.temp_dir / name / "package.json").write_text(
+                json.dumps({"name": name, "dependencies": {"lodash": "^4.0.0"}})
+            )
+
+        with caplog.at_level(logging.INFO, logger="depx.core.scanner"):
+            projects = self.scanner.scan_directory(self.temp_dir, estimate_top=5)
+
+        assert all(p.size_error_bytes == 0 for p in projects)
+        # small 的估计本来就是精确值，不需要重新统计
+        assert "已精确统计 1 个最大的项目" in caplog.text
+
+    def test_scan_expands_cargo_workspace(self):
+        """测试扫描时展开 Cargo 工作区成员，成员不写入索引"""
+        from depx.core.scan_index import ScanIndex
+
+        workspace = self.temp_dir / "tree" / "ws"
+        (workspace / "crates" / "a").mkdir(parents=True)
+        (workspace / "Cargo.toml").write_text('[workspace]\nmembers = ["crates/*"]\n')
+        (workspace / "crates" / "a" / "Cargo.toml").write_text(
+            '[package]\nname = "a"\nversion = "0.1.0"\n'
+        )
+        (self.temp_dir / "tree" / "web").mkdir()
+        (self.temp_dir / "tree" / "web" / "package.json").write_text('{"name": "web"}')
+
+        index = ScanIndex(self.temp_dir / "cache" / "index.sqlite3")
+        scanner = ProjectScanner(index=index)
+        for executor in ["thread", "process"]:
+            projects = scanner.scan_directory(
+                self.temp_dir / "tree", executor=executor
+            )
+            assert sorted(p.name for p in projects) == ["a", "web", "ws"]
+
+        streamed = list(scanner.iter_scan(self.temp_dir / "tree", parallel=False))
+        assert sorted(p.name for p in streamed) == ["a", "web", "ws"]
+        index.close()
+
+    def test_iter_scan_streams_projects(self):
+        """测试流式扫描产出全部项目，且可以提前停止"""
+        for i in range(8):
+            project_dir = self.temp_dir / f"p{i}"
+            project_dir.mkdir()
+            (project_dir / "package.json").write_text(json.dumps({"name": f"p{i}"}))
+
+        expected = [f"p{i}" for i in range(8)]
+        for parallel in [True, False]:
+            projects = list(
+                self.scanner.iter_scan(self.temp_dir, parallel=parallel, queue_size=2)
+            )
+            assert sorted(p.name for p in projects) == expected
+
+        stream = self.scanner.iter_scan(self.temp_dir, queue_size=1)
+        first = next(stream)
+        stream.close()
+        assert first.name in expected
+
+    def test_iter_scan_auto_switches_to_processes(self):
+        """测试流式扫描的 auto 后端在项目数达到阈值后改用进程池"""
+        from unittest.mock import patch
+
+        from depx.core import scanner as scanner_module
+
+        for i in range(8):
+            project_dir = self.temp_dir / f"p{i}"
+            project_dir.mkdir()
+            (project_dir / "package.json").write_text(json.dumps({"name": f"p{i}"}))
+
+        expected = [f"p{i}" for i in range(8)]
+        parse_in_processes = scanner_module.ProjectScanner._iter_parse_in_processes
+        with patch.object(scanner_module, "PROCESS_POOL_THRESHOLD", 3), patch.object(
+            scanner_module.os, "cpu_count", return_value=2
+        ), patch.object(
+            scanner_module.ProjectScanner,
+            "_iter_parse_in_processes",
+            autospec=True,
+            side_effect=parse_in_processes,
+        ) as processes:
+            for executor in ["auto", "process"]:
+                projects = list(
+                    self.scanner.iter_scan(self.temp_dir, workers=2, executor=executor)
+                )
+                assert sorted(p.name for p in projects) == expected
+            assert processes.call_count == 2
+
+            threaded = list(self.scanner.iter_scan(self.temp_dir, executor="thread"))
+            assert sorted(p.name for p in threaded) == expected
+            assert processes.call_count == 2
+
+        # 切换时解析线程和统计线程池已在运行，工作进程不能由 fork 创建
+        assert scanner_module._process_pool_context().get_start_method() != "fork"
+
+    def test_iter_scan_invalid_path(self):
+        """测试流式扫描无效路径"""
+        assert list(self.scanner.iter_scan(self.temp_dir / "missing")) == []
+
+    def test_scan_honors_include_exclude_and_symlinks(self):
+        """测试扫描遵循 include/exclude 模式、忽略目录和符号链接设置"""
+        from depx.config import DepxConfig
+
+        for rel in ["apps/web", "apps/legacy", "libs/core", "env/tool"]:
+            project_dir = self.temp_dir / rel
+            project_dir.mkdir(parents=True)
+            (project_dir / "package.json").write_text(
+                json.dumps({"name": rel.replace("/", "-")})
+            )
+        external_dir = self.temp_dir / "outside"
+        external_dir.mkdir()
+        (external_dir / "package.json").write_text(json.dumps({"name": "external"}))
+        (self.temp_dir / "link").symlink_to(external_dir)
+
+        config = DepxConfig()
+        config.scan.exclude_patterns = ["apps/legacy", "/outside"]
+        scanner = ProjectScanner(config)
+        names = sorted(p.name for p in scanner.scan_directory(self.temp_dir))
+        assert names == ["apps-web", "libs-core"]
+
+        config.scan.follow_symlinks = True
+        names = sorted(p.name for p in scanner.scan_directory(self.temp_dir))
+        assert names == ["apps-web", "external", "libs-core"]
+
+        config.scan.follow_symlinks = False
+        config.scan.include_patterns = ["apps/*"]
+        names = sorted(p.name for p in scanner.scan_directory(self.temp_dir))
+        assert names == ["apps-web"]
+
+    def test_walker_visits_each_directory_once(self):
+        """测试符号链接环和重复链接只访问一次"""
+        from depx.config import DepxConfig
+
+        project_dir = self.temp_dir / "libs" / "core"
+        project_dir.mkdir(parents=True)
+        (project_dir / "package.json").write_text(json.dumps({"name": "core"}))
+        (self.temp_dir / "libs" / "loop").symlink_to(self.temp_dir)
+        (self.temp_dir / "alias").symlink_to(project_dir)
+
+        config = DepxConfig()
+        config.scan.follow_symlinks = True
+        projects = ProjectScanner(config).scan_directory(self.temp_dir, max_depth=10)
+
+        assert [p.name for p in projects] == ["core"]
+
+    def test_one_file_system_skips_other_devices(self):
+        """测试 one_file_system 模式不跨越设备边界"""
+        import os
+        from unittest.mock import patch
+
+        for name in ["local", "mounted"]:
+            project_dir = self.temp_dir / name
+            project_dir.mkdir()
+            (project_dir / "package.json").write_text(json.dumps({"name": name}))
+
+        real_stat = os.stat
+        mounted = str(self.temp_dir / "mounted")
+
+        def fake_stat(path, *args, **kwargs):
+            result = real_stat(path, *args, **kwargs)
+            if str(path) == mounted:
+                values = list(result)
+                values[2] = result.st_dev + 1  # st_dev
+                return os.stat_result(values)
+            return result
+
+        with patch("depx.core.walker.os.stat", side_effect=fake_stat):
+            crossed = self.scanner.scan_directory(self.temp_dir, parallel=False)
+            local = self.scanner.scan_directory(
+                self.temp_dir, parallel=False, one_file_system=True
+            )
+
+        assert sorted(p.name for p in crossed) == ["local", "mounted"]
+        assert [p.name for p in local] == ["local"]
+
+    def test_adaptive_concurrency_scales_with_io_wait(self):
+        """测试自适应并发数随 IO 等待比例增加"""
+        from depx.utils.performance import AdaptiveConcurrency
+
+        concurrency = AdaptiveConcurrency(min_workers=1, max_workers=64)
+        cpu_bound = concurrency.record(wall_time=1.0, cpu_time=1.0)
+
+        concurrency = AdaptiveConcurrency(min_workers=1, max_workers=64)
+        io_bound = concurrency.record(wall_time=1.0, cpu_time=0.1)
+
+        assert cpu_bound == min(concurrency.cpu_count, 64)
+        assert io_bound > cpu_bound or io_bound == 64
+
+    def test_adaptive_concurrency_ignores_internal_waits_and_gil(self):
+        """测试等待统计线程池和 GIL 竞争不计为 IO 等待"""
+        import threading
+        import time
+
+        from depx.utils.performance import AdaptiveConcurrency, internal_wait
+
+        def spin(seconds):
+            end = time.thread_time() + seconds
+            while time.thread_time() < end:
+                pass
+
+        def wait_for_pool():
+            spin(0.02)
+            with internal_wait():
+                time.sleep(0.1)
+
+        baseline = AdaptiveConcurrency(min_workers=1, max_workers=64).limit
+
+        concurrency = AdaptiveConcurrency(min_workers=1, max_workers=64)
+        concurrency.measure(wait_for_pool)
+        assert concurrency.limit < baseline * 1.5
+
+        # 另一个线程同时执行 Python 代码，本线程的等待来自 GIL
+        stop = threading.Event()
+
+        def keep_spinning():
+            while not stop.is_set():
+                spin(0.01)
+
+        spinner = threading.Thread(target=keep_spinning)
+        concurrency = AdaptiveConcurrency(min_workers=1, max_workers=64)
+        spinner.start()
+        try:
+            concurrency.measure(spin, 0.1)
+        finally:
+            stop.set()
+            spinner.join()
+        assert concurrency.limit < baseline * 1.5
+
+        # 真正的阻塞仍然提高并发数
+        concurrency = AdaptiveConcurrency(min_workers=1, max_workers=64)
+        concurrency.measure(lambda: (spin(0.01), time.sleep(0.1)))
+        assert concurrency.limit > baseline